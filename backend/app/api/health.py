@@ -1,5 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
+from app.core.email_generator import EmailGenerator
+from app.core.cpu_pool import CPUPool
+from app.core.dependencies import get_cpu_pool, get_email_generator, get_job_queue, get_job_workers, get_resume_generator
+from app.core.job_queue import JobQueue, JobWorkerPool
+from app.core.resume_generator import ResumeGenerator
 
 router = APIRouter()
 
@@ -9,4 +14,48 @@ def health_check():
     Health check endpoint to verify the API is running.
     Returns a simple JSON response indicating the service is up.
     """
-    return JSONResponse(content={"status": "ok", "message": "API is running"}, status_code=200)
\ No newline at end of file
+    return JSONResponse(content={"status": "ok", "message": "API is running"}, status_code=200)
+
+@router.get("/health/browser-pool", tags=["Health Check"])
+def browser_pool_stats(email_gen: EmailGenerator = Depends(get_email_generator)):
+    """
+    Reports the Selenium browser pool metrics: wait times, utilisation,
+    and how many browsers were created, recycled or found unhealthy.
+    """
+    return JSONResponse(content=email_gen.scraper.browser_pool.stats(), status_code=200)
+
+
+@router.get("/health/cache", tags=["Health Check"])
+def cache_stats(email_gen: EmailGenerator = Depends(get_email_generator)):
+    """
+    Reports hit/miss counters for the in-memory and on-disk caches.
+    """
+    return JSONResponse(content=email_gen.cache_report(), status_code=200)
+
+
+@router.get("/health/jobs", tags=["Health Check"])
+def job_stats(queue: JobQueue = Depends(get_job_queue), workers: JobWorkerPool | None = Depends(get_job_workers)):
+    """
+    Reports job counts by status and, when workers run in this process,
+    how many jobs they completed or failed.
+    """
+    content = workers.stats() if workers is not None else {"workers": 0, "queue": queue.stats()}
+    return JSONResponse(content=content, status_code=200)
+
+
+@router.get("/health/cpu-pool", tags=["Health Check"])
+def cpu_pool_stats(pool: CPUPool = Depends(get_cpu_pool)):
+    """
+    Reports the CPU pool size, tasks in flight and how many requests were
+    turned away with a 429 because it was saturated.
+    """
+    return JSONResponse(content=pool.stats(), status_code=200)
+
+
+@router.get("/health/resume-generator", tags=["Health Check"])
+def resume_generator_stats(resume_gen: ResumeGenerator = Depends(get_resume_generator)):
+    """
+    Reports resume generations in flight and the LaTeX compiler's counters:
+    compiles, passes, cache hits, format builds and fallbacks.
+    """
+    return JSONResponse(content={"generation": resume_gen.stats(), "compiler": resume_gen.compiler.stats()}, status_code=200)
@@ -0,0 +1,30 @@
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.telemetry import HTTP_SECONDS, REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["Health Check"])
+def metrics():
+    """
+    Prometheus metrics: per-stage and per-route latency histograms, LLM call
+    latency and token counts, and cache hit rates.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+async def record_http_metrics(request: Request, call_next):
+    """Middleware timing every request by its route template (until the response headers are ready)."""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method, route=route, status=str(status))
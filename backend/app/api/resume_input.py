@@ -0,0 +1,22 @@
+from fastapi import HTTPException
+from loguru import logger
+
+from app.core.email_generator import EmailGenerator
+
+
+def resolve_resume_text(email_gen: EmailGenerator, resume_text: str | None, resume_id: str | None) -> str:
+    """
+    Returns the resume text sent with the request or, failing that, the
+    cached text for resume_id (as returned by /api/v1/resume).
+    """
+    if resume_text:
+        return resume_text
+    if resume_id:
+        text = email_gen.resume_text(resume_id)
+        if text is None:
+            logger.warning(f"Unknown or expired resume_id {resume_id}")
+            raise HTTPException(
+                status_code=404, detail="Unknown or expired resume_id. Upload the resume to /api/v1/resume again."
+            )
+        return text
+    raise HTTPException(status_code=400, detail="Either resume_text or resume_id must be provided.")
@@ -0,0 +1,48 @@
+import json
+from typing import Any, AsyncIterator, Tuple
+
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stops nginx and similar proxies from buffering the stream.
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Formats one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _encode(events: AsyncIterator[Tuple[str, Any]], label: str) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield sse_event(event, data)
+    except TimeoutError:
+        logger.error(f"Timed out streaming {label}.")
+        yield sse_event("error", {"status": 504, "detail": f"Timed out while generating {label}."})
+    except Exception as e:
+        logger.error(f"Error streaming {label}: {e}")
+        yield sse_event("error", {"status": 500, "detail": f"Internal server error while generating {label}."})
+
+
+def sse_response(events: AsyncIterator[Tuple[str, Any]], label: str) -> StreamingResponse:
+    """
+    Streams (event, data) pairs as text/event-stream. Once the stream has
+    started the status code is fixed, so failures are sent as an 'error' event.
+
+    Message events ('email', 'referral_message') are deltas: each carries
+    only the fields that changed since the previous one. A string is the
+    text to append to that field; any other value replaces it. E.g.
+
+        event: email
+        data: {"subject": "Backend role", "body": "Dear"}
+
+        event: email
+        data: {"body": " Ms. Rao,"}
+
+    leaves body as "Dear Ms. Rao,". 'done' carries the complete result.
+    """
+    return StreamingResponse(_encode(events, label), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,30 @@
+from typing import List
+
+from fastapi import HTTPException, UploadFile
+from loguru import logger
+
+from app.tools.resume_parser import RESUME_MAX_BYTES
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def read_pdf_upload(file: UploadFile, max_bytes: int = RESUME_MAX_BYTES) -> bytes:
+    """
+    Reads an uploaded PDF into memory in chunks. Rejects non-PDF uploads
+    with 400 and stops reading as soon as the upload exceeds max_bytes (413).
+    """
+    if not file.content_type or not file.content_type.startswith('application/pdf'):
+        logger.error("Invalid file type. Only PDF files are allowed.")
+        raise HTTPException(status_code=400, detail="Invalid file type. Only PDF files are allowed.")
+
+    chunks: List[bytes] = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            logger.error(f"Rejected resume upload larger than {max_bytes} bytes.")
+            raise HTTPException(status_code=413, detail=f"The resume exceeds the {max_bytes}-byte upload limit.")
+        chunks.append(chunk)
+    if not size:
+        raise HTTPException(status_code=400, detail="The uploaded file is empty.")
+    return b"".join(chunks)
@@ -1,37 +1,38 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from loguru import logger
 from pydantic import BaseModel
+from app.core.email_generator import EmailGenerator
+from app.core.dependencies import get_email_generator, require_cpu_capacity
 
 class JDURLRequest(BaseModel):
     url : str
+    bypass_cache: bool = False
 
 class JDTextRequest(BaseModel):
     jd_text: str
+    bypass_cache: bool = False
 
 router = APIRouter()
 
-@router.post('/jd-from-url', tags=['Job Description'])
-async def get_job_description(request: JDURLRequest):
+@router.post('/jd-from-url', tags=['Job Description'], dependencies=[Depends(require_cpu_capacity)])
+async def get_job_description(request: JDURLRequest, email_gen: EmailGenerator = Depends(get_email_generator)):
     """
     Endpoint to scrape a job descrption from a given URL.
     Expects a job URL as input.
     """
-    from app.tools.jd_scraper import Scraper
-    from app.tools.jd_to_json import JD2JSON
-
     url = request.url.strip()
     if not url:
         logger.error("Job URL is required")
         raise HTTPException(status_code=400, detail="Job URL is required")
-    scraper = Scraper()
-    scrape_res = scraper.scrape(url)
+    scrape_res = await email_gen.scraper.ascrape_entry(url, bypass_cache=request.bypass_cache)
     if not scrape_res:
         logger.error("Failed to scrape the job description")
         raise HTTPException(status_code=500, detail="Failed to scrape the job description")
     
-    jd2json = JD2JSON()
-    jd_json = jd2json.convert(scrape_res)
+    jd_json = await email_gen.jd2json.aconvert(
+        scrape_res.text, bypass_cache=request.bypass_cache, source_url=url, posting=scrape_res.posting
+    )
     if not jd_json:
         logger.error("Failed to convert job description to JSON")
         raise HTTPException(status_code=500, detail="Failed to convert job description to JSON")
@@ -39,19 +40,17 @@ async def get_job_description(request: JDURLRequest):
 
 
 @router.post('/jd-from-text', tags=['Job Description'])
-async def get_jd_json(request: JDTextRequest):
+async def get_jd_json(request: JDTextRequest, email_gen: EmailGenerator = Depends(get_email_generator)):
     """
     Endpoint to convert a job description text to JSON format.
     Expects job description text as input.
     """
-    from app.tools.jd_to_json import JD2JSON
     jd_text = request.jd_text.strip()
     if not jd_text:
         logger.error("Job description text is required")
         raise HTTPException(status_code=400, detail="Job description text is required")
 
-    jd2json = JD2JSON()
-    jd_json = jd2json.convert(jd_text)
+    jd_json = await email_gen.jd2json.aconvert(jd_text, bypass_cache=request.bypass_cache)
     
     if not jd_json:
         logger.error("Failed to convert job description to JSON")
@@ -0,0 +1,82 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from fastapi.responses import JSONResponse
+from app.api.sse import sse_response
+from app.api.uploads import read_pdf_upload
+from app.core.dependencies import get_job_queue, get_job_workers
+from app.core.generation_jobs import EMAIL_JOB, email_job_dedupe_key, email_job_payload, spool_resume
+from app.core.job_queue import JOB_POLL_INTERVAL, TERMINAL_STATES, JobQueue, JobWorkerPool
+
+router = APIRouter()
+
+
+@router.post('/jobs/generate-email', tags=['Jobs'])
+async def submit_generate_email(
+    file: UploadFile = File(...),
+    jd_url: Optional[str] = Form(None),
+    jd_text: Optional[str] = Form(None),
+    recruiter_url: Optional[str] = Form(None),
+    queue: JobQueue = Depends(get_job_queue),
+    workers: JobWorkerPool | None = Depends(get_job_workers),
+):
+    """
+    Queues the work of /api/v1/generate-email and returns a job id at once.
+    Poll GET /jobs/{job_id} or subscribe to GET /jobs/{job_id}/events for the
+    result. Submitting the same resume, JD and recruiter again returns the
+    existing job.
+    """
+    if not jd_url and not jd_text:
+        raise HTTPException(status_code=400, detail="Either jd_url or jd_text must be provided.")
+
+    contents = await read_pdf_upload(file)
+    resume_path = await asyncio.to_thread(spool_resume, contents)
+    payload = email_job_payload(resume_path, jd_url, jd_text, recruiter_url)
+    job, created = await asyncio.to_thread(queue.submit, EMAIL_JOB, payload, email_job_dedupe_key(payload))
+    if created and workers is not None:
+        workers.notify()
+
+    return JSONResponse(
+        content={'job_id': job.id, 'status': job.status, 'deduplicated': not created},
+        status_code=202,
+        headers={'Location': f"/api/v1/jobs/{job.id}"},
+    )
+
+
+@router.get('/jobs/{job_id}', tags=['Jobs'])
+async def get_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """
+    Returns the job status; 'result' is set once it has succeeded and
+    'error' once it has failed.
+    """
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return JSONResponse(content=job.public(), status_code=200)
+
+
+@router.get('/jobs/{job_id}/events', tags=['Jobs'])
+async def job_events(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """
+    Server-sent events for a job: a 'status' event on every status change,
+    ending with 'done' (carrying the job) once it has succeeded or failed.
+    """
+    job = await asyncio.to_thread(queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    async def events():
+        current = job
+        last_status = None
+        while True:
+            if current.status != last_status:
+                last_status = current.status
+                yield 'status', {'job_id': current.id, 'status': current.status}
+            if current.status in TERMINAL_STATES:
+                yield 'done', current.public()
+                return
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            current = await asyncio.to_thread(queue.get, job_id)
+
+    return sse_response(events(), "job")
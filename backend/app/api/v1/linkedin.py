@@ -1,24 +1,23 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from loguru import logger
+from app.core.email_generator import EmailGenerator
+from app.core.dependencies import get_email_generator
 
 router = APIRouter()
 
 @router.post('/linkedin', tags=["LinkedIn"])
-async def search_linkedin(recruiter_url: str):
+async def search_linkedin(recruiter_url: str, email_gen: EmailGenerator = Depends(get_email_generator)):
     """
     Endpoint to search for a recruiter on LinkedIn.
     Expects a recruiter URL as input.
     Returns the recruiter's information in JSON format.
     """
-    from app.tools.linkedin import LinkedIn
-
     if not recruiter_url:
         logger.error("Recruiter URL is required")
         raise HTTPException(status_code=400, detail="Recruiter URL is required")
 
-    linkedin = LinkedIn()
-    recruiter_info = linkedin.search(recruiter_url)
+    recruiter_info = await email_gen.linkedin.asearch(recruiter_url)
 
     if not recruiter_info:
         raise HTTPException(status_code=404, detail="Recruiter not found")
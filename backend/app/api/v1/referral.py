@@ -1,32 +1,68 @@
-from fastapi import APIRouter, HTTPException, Form
+from fastapi import APIRouter, HTTPException, Form, Depends
 from fastapi.responses import JSONResponse
 from loguru import logger
 
 from typing import Optional
 
 from app.core.email_generator import EmailGenerator
+from app.core.dependencies import get_email_generator
+from app.api.sse import sse_response
+from app.api.resume_input import resolve_resume_text
 
 router = APIRouter()
 
 @router.post("/generate-referral", tags=["referral"])
 async def generate_referral(
-    resume_text: str = Form(...),
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
     job_description: str = Form(...),
     recruiter_info: Optional[str] = Form(None),
-    message_type: Optional[str] = Form("linkedin message")
+    message_type: Optional[str] = Form("linkedin message"),
+    email_gen: EmailGenerator = Depends(get_email_generator)
 ):
-    email_gen = EmailGenerator()
-    if not resume_text or not job_description:
-        raise HTTPException(status_code=400, detail="Both resume_text and job_description must be provided.")
+    if not job_description:
+        raise HTTPException(status_code=400, detail="job_description must be provided.")
+    resume_text = resolve_resume_text(email_gen, resume_text, resume_id)
     
     try:
-        result = email_gen.craft_referral(
+        result = await email_gen.acraft_referral(
             resume_text=resume_text,
             job_description=job_description,
             recruiter_info=recruiter_info,
             message_type=message_type
         )
         return JSONResponse(content=result, status_code=200)
+    except TimeoutError:
+        logger.error("Timed out generating referral.")
+        raise HTTPException(status_code=504, detail="Timed out while generating referral.")
     except Exception as e:
         logger.error(f"Error generating email: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error while generating email.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error while generating email.")
+
+
+@router.post("/generate-referral/stream", tags=["referral"])
+async def generate_referral_stream(
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    job_description: str = Form(...),
+    recruiter_info: Optional[str] = Form(None),
+    message_type: Optional[str] = Form("linkedin message"),
+    email_gen: EmailGenerator = Depends(get_email_generator)
+):
+    """
+    Server-sent events version of /generate-referral: 'referral_message'
+    events carry the new text of each message field as it is written (see
+    app/api/sse.py), 'review' events follow, and
+    'done' carries the complete result.
+    """
+    if not job_description:
+        raise HTTPException(status_code=400, detail="job_description must be provided.")
+    resume_text = resolve_resume_text(email_gen, resume_text, resume_id)
+
+    events = email_gen.astream_referral(
+        resume_text=resume_text,
+        job_description=job_description,
+        recruiter_info=recruiter_info,
+        message_type=message_type
+    )
+    return sse_response(events, "referral")
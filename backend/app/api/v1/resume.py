@@ -1,24 +1,84 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+import os
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from fastapi.responses import FileResponse, JSONResponse
 from loguru import logger
-from app.tools.resume_parser import ResumeParser
+from pydantic import ValidationError
+from app.api.resume_input import resolve_resume_text
+from app.api.uploads import read_pdf_upload
+from app.core.email_generator import EmailGenerator
+from app.core.dependencies import get_email_generator, get_resume_generator, require_cpu_capacity, require_resume_capacity
+from app.core.models.email_models import StructuredReview
+from app.core.resume_generator import ResumeGenerator
 
 router = APIRouter()
 
-@router.post('/resume', tags=['Resume'])
-async def process_resume(file: UploadFile = File(...)):
+@router.post('/resume', tags=['Resume'], dependencies=[Depends(require_cpu_capacity)])
+async def process_resume(file: UploadFile = File(...), email_gen: EmailGenerator = Depends(get_email_generator)):
+    """
+    Extracts the text of a PDF resume. The returned resume_id can be sent to
+    the generation endpoints instead of resume_text while it stays cached.
+    """
+    contents = await read_pdf_upload(file)
     try:
-        contents = await file.read()
-        if not file.content_type or not file.content_type.startswith('application/pdf'):
-            logger.error("Invalid file type. Only PDF files are allowed.")
-            raise HTTPException(status_code=400, detail="Invalid file type. Only PDF files are allowed.")
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as f:
-            f.write(contents)
-        parser = ResumeParser()
-        resume_text = parser.parse(temp_path)
-        print(resume_text)
-        return JSONResponse(content={"resume_text": resume_text})
+        resume_id, resume_text = await email_gen.aparse_resume(contents)
+        return JSONResponse(content={"resume_text": resume_text, "resume_id": resume_id})
     except Exception as e:
         logger.error(f"Error parsing resume: {e}")
-        raise HTTPException(status_code=500, detail="Failed to parse resume")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to parse resume")
+
+
+def _pdf_response(path: str, pdf_id: str) -> FileResponse:
+    return FileResponse(path, media_type="application/pdf", filename="resume.pdf", headers={"X-Resume-Pdf-Id": pdf_id})
+
+
+@router.post('/generate-resume', tags=['Resume'], dependencies=[Depends(require_resume_capacity)])
+async def generate_resume(
+    review: str = Form(...),
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    delivery: str = Form("pdf"),
+    email_gen: EmailGenerator = Depends(get_email_generator),
+    resume_gen: ResumeGenerator = Depends(get_resume_generator),
+):
+    """
+    Rewrites the resume along the lines of a review (the StructuredReview
+    JSON returned with a generated email or referral) and compiles it to a
+    PDF. With delivery=pdf the PDF is the response; with delivery=link the
+    response carries a pdf_id and the URL to download it from.
+    """
+    if delivery not in ("pdf", "link"):
+        raise HTTPException(status_code=400, detail="delivery must be 'pdf' or 'link'.")
+    try:
+        structured_review = StructuredReview.model_validate_json(review)
+    except ValidationError as e:
+        errors = [{"loc": ["review", *err["loc"]], "msg": err["msg"]} for err in e.errors()]
+        raise HTTPException(status_code=422, detail=errors)
+    resume_text = resolve_resume_text(email_gen, resume_text, resume_id)
+
+    try:
+        result = await resume_gen.agenerate(resume_text, structured_review.model_dump())
+    except TimeoutError:
+        logger.error("Timed out generating resume.")
+        raise HTTPException(status_code=504, detail="Timed out while generating resume.")
+    except Exception as e:
+        logger.error(f"Error generating resume: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error while generating resume.")
+
+    if delivery == "link":
+        return JSONResponse(content={
+            "pdf_id": result.digest,
+            "download_url": f"/api/v1/generated-resumes/{result.digest}",
+            "cached": result.cached,
+        })
+    return _pdf_response(result.path, result.digest)
+
+
+@router.get('/generated-resumes/{pdf_id}', tags=['Resume'])
+async def download_resume(pdf_id: str, resume_gen: ResumeGenerator = Depends(get_resume_generator)):
+    """Downloads a PDF made by /generate-resume with delivery=link."""
+    path = resume_gen.compiler.artifact_path(pdf_id)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Unknown resume PDF.")
+    return _pdf_response(path, pdf_id)
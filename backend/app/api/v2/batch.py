@@ -0,0 +1,65 @@
+import os
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import JSONResponse
+from loguru import logger
+from pydantic import BaseModel, Field, model_validator
+
+from app.core.email_generator import EmailGenerator
+from app.core.dependencies import get_email_generator, require_cpu_capacity
+from app.api.resume_input import resolve_resume_text
+
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '50'))
+
+router = APIRouter()
+
+
+class BatchItem(BaseModel):
+    jd_url: Optional[str] = None
+    jd_text: Optional[str] = None
+    recruiter_url: Optional[str] = None
+    recruiter_info: Optional[str] = None
+    message_type: Optional[str] = None
+
+    @model_validator(mode='after')
+    def check_jd(self):
+        if not self.jd_url and not self.jd_text:
+            raise ValueError("Either jd_url or jd_text must be provided.")
+        return self
+
+
+class BatchRequest(BaseModel):
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None
+    kind: Literal['email', 'referral'] = 'email'
+    items: List[BatchItem] = Field(..., min_length=1)
+
+
+@router.post('/generate-batch', tags=['Email Generation'], dependencies=[Depends(require_cpu_capacity)])
+async def generate_batch(request: BatchRequest, email_gen: EmailGenerator = Depends(get_email_generator)):
+    """
+    Generates an email or referral message for each job against one resume.
+    JDs are scraped and converted concurrently and the LLM calls run with a
+    concurrency cap. Every item gets its own result or error; an item
+    that times out is reported as that item's error.
+    """
+    resume_text = resolve_resume_text(email_gen, request.resume_text, request.resume_id)
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"A batch can contain at most {BATCH_MAX_ITEMS} items.")
+
+    try:
+        results = await email_gen.abatch_generate(
+            resume_text=resume_text,
+            items=[item.model_dump() for item in request.items],
+            kind=request.kind,
+        )
+    except Exception as e:
+        logger.error(f"Error generating batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error while generating batch.")
+
+    succeeded = sum(1 for r in results if r['status'] == 'ok')
+    return JSONResponse(
+        content={'results': results, 'succeeded': succeeded, 'failed': len(results) - succeeded},
+        status_code=200,
+    )
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Form
+from fastapi import APIRouter, HTTPException, Form, Depends
 from fastapi.responses import JSONResponse
 from loguru import logger
 from app.core.email_generator import EmailGenerator
+from app.core.dependencies import get_email_generator
+from app.api.sse import sse_response
+from app.api.resume_input import resolve_resume_text
 from typing import Optional
 
 router = APIRouter()
@@ -9,22 +12,52 @@ router = APIRouter()
 
 @router.post('/generate-email', tags=['Email Generation'])
 async def generate_email(
-    resume_text: str = Form(...),
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
     job_description: str = Form(...),
-    recruiter_info: Optional[str] = Form(None)
+    recruiter_info: Optional[str] = Form(None),
+    email_gen: EmailGenerator = Depends(get_email_generator)
 ):
-    email_gen = EmailGenerator()
-    if not resume_text or not job_description:
-        raise HTTPException(status_code=400, detail="Both resume_text and job_description must be provided.")
+    if not job_description:
+        raise HTTPException(status_code=400, detail="job_description must be provided.")
+    resume_text = resolve_resume_text(email_gen, resume_text, resume_id)
     
     try:
-        content = email_gen.craft_email(
+        content = await email_gen.acraft_email(
             resume_text=resume_text,
             job_description=job_description,
             recruiter_info=recruiter_info
         )
         return JSONResponse(content=content, status_code=200)
+    except TimeoutError:
+        logger.error("Timed out generating email.")
+        raise HTTPException(status_code=504, detail="Timed out while generating email.")
     except Exception as e:
         logger.error(f"Error generating email: {e}")
         raise HTTPException(status_code=500, detail="Internal server error while generating email.")
-    
\ No newline at end of file
+    
+
+@router.post('/generate-email/stream', tags=['Email Generation'])
+async def generate_email_stream(
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    job_description: str = Form(...),
+    recruiter_info: Optional[str] = Form(None),
+    email_gen: EmailGenerator = Depends(get_email_generator)
+):
+    """
+    Server-sent events version of /generate-email: 'email' events carry the
+    new text of each email field as it is written (see app/api/sse.py),
+    'review' events follow, and 'done' carries the
+    same JSON the non-streaming endpoint returns.
+    """
+    if not job_description:
+        raise HTTPException(status_code=400, detail="job_description must be provided.")
+    resume_text = resolve_resume_text(email_gen, resume_text, resume_id)
+
+    events = email_gen.astream_email(
+        resume_text=resume_text,
+        job_description=job_description,
+        recruiter_info=recruiter_info
+    )
+    return sse_response(events, "email")
@@ -0,0 +1,299 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from loguru import logger
+
+_MISSING = object()
+
+
+def content_hash(*parts: Any) -> str:
+    """SHA-256 over the given parts; non-string parts are JSON-encoded with sorted keys."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode("utf-8")
+        else:
+            data = json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        stats = asdict(self)
+        lookups = self.hits + self.misses
+        stats["hit_rate"] = self.hits / lookups if lookups else 0.0
+        return stats
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU with an optional per-entry TTL.
+    """
+    def __init__(self, maxsize: int = 256, ttl: float | None = None) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.__data: "OrderedDict[Hashable, Tuple[Any, float | None]]" = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            entry = self.__data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.stats.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self.__data[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            self.__data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self.__lock:
+            self.__data[key] = (value, expires_at)
+            self.__data.move_to_end(key)
+            self.stats.sets += 1
+            while len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self.__lock:
+            self.__data.pop(key, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__data.clear()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+
+class SQLiteCache:
+    """
+    On-disk key/value cache with TTL. Values must be JSON-serialisable.
+    """
+    def __init__(self, path: str, ttl: float | None = None, table: str = "cache") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self.stats = CacheStats()
+        self.__lock = Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        with self.__lock, self.__conn:
+            self.__conn.execute("PRAGMA journal_mode=WAL")
+            self.__conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.__lock:
+            row = self.__conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return default
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                with self.__conn:
+                    self.__conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            self.stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        payload = json.dumps(value)
+        with self.__lock, self.__conn:
+            self.__conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+            self.stats.sets += 1
+
+    def delete(self, key: str) -> None:
+        with self.__lock, self.__conn:
+            self.__conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        with self.__lock, self.__conn:
+            cursor = self.__conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+            self.stats.expirations += cursor.rowcount
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__conn.close()
+
+
+class TieredCache:
+    """
+    A bounded in-memory LRU in front of an optional SQLite tier.
+    Disk hits are promoted into memory.
+    """
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None, enabled: bool = True) -> None:
+        self.memory = memory
+        self.disk = disk
+        self.enabled = enabled
+        self.stats = CacheStats()
+
+    @classmethod
+    def from_env(cls, prefix: str, maxsize: int = 256, ttl: float | None = None) -> "TieredCache":
+        """
+        Builds a cache configured through <PREFIX>_CACHE_ENABLED, <PREFIX>_CACHE_SIZE,
+        <PREFIX>_CACHE_TTL and <PREFIX>_CACHE_DB (SQLite path; unset disables the disk tier).
+        """
+        enabled = os.getenv(f"{prefix}_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+        maxsize = int(os.getenv(f"{prefix}_CACHE_SIZE", str(maxsize)))
+        ttl_env = os.getenv(f"{prefix}_CACHE_TTL")
+        ttl = float(ttl_env) if ttl_env else ttl
+        db_path = os.getenv(f"{prefix}_CACHE_DB")
+        disk = None
+        if db_path:
+            try:
+                disk = SQLiteCache(db_path, ttl=ttl, table=f"{prefix.lower()}_cache")
+            except sqlite3.Error as e:
+                logger.error(f"Could not open {prefix} cache database at {db_path}: {e}")
+        return cls(LRUCache(maxsize=maxsize, ttl=ttl), disk=disk, enabled=enabled)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if not self.enabled:
+            return default
+        value = self.memory.get(key, _MISSING)
+        if value is _MISSING and self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+        if value is _MISSING:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        if not self.enabled:
+            return
+        self.memory.set(key, value, ttl=ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, ttl=ttl)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Failed to write cache entry to disk: {e}")
+        self.stats.sets += 1
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def report(self) -> Dict[str, Any]:
+        """Hit/miss counters for the cache as a whole and for each tier."""
+        report = {"enabled": self.enabled, "size": len(self.memory), **self.stats.as_dict()}
+        report["memory"] = self.memory.stats.as_dict()
+        if self.disk is not None:
+            report["disk"] = self.disk.stats.as_dict()
+        return report
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one execution (threads).
+    Callers that arrive while a call is in flight wait for and share its result.
+    """
+    def __init__(self) -> None:
+        self.__lock = Lock()
+        self.__calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.__calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight. The shared task is shielded, so one
+    caller being cancelled does not cancel the fetch for the others.
+    """
+    def __init__(self) -> None:
+        self.__tasks: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self.__tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self.__tasks[key] = task
+            task.add_done_callback(lambda _: self.__tasks.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
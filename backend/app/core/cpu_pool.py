@@ -0,0 +1,150 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Any, Callable, Dict
+
+from loguru import logger
+
+# Worker processes for CPU-bound stages (PDF parsing, HTML extraction, LaTeX
+# rendering). 0 keeps the previous behaviour of running them in threads.
+CPU_POOL_WORKERS = int(os.getenv('CPU_POOL_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Tasks allowed in flight (running + queued) before new requests get a 429.
+CPU_POOL_MAX_PENDING = int(os.getenv('CPU_POOL_MAX_PENDING', str(max(1, CPU_POOL_WORKERS) * 4)))
+
+
+class CPUPoolSaturated(Exception):
+    """Raised by CPUPool.check_capacity when the pool's queue is full."""
+
+
+def _warm_worker() -> None:
+    # Import the heavy modules once per worker instead of on its first task.
+    import pypdf  # noqa: F401
+    import app.tools.html_text  # noqa: F401
+    import app.tools.resume_parser  # noqa: F401
+    import app.core.resume_generator  # noqa: F401
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+class CPUPool:
+    """
+    A process pool for pure-CPU functions, so a large PDF or job page does
+    not hold the GIL of the API worker. Functions and arguments must be
+    picklable (module-level functions, plain data).
+
+    Admission is bounded: check_capacity() raises CPUPoolSaturated once
+    max_pending tasks are in flight, and the API turns that into a 429
+    before any work is started. Tasks submitted anyway (e.g. by background
+    jobs) simply wait their turn.
+    """
+    def __init__(self, workers: int = CPU_POOL_WORKERS, max_pending: int = CPU_POOL_MAX_PENDING) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.__lock = Lock()
+        self.__executor: ProcessPoolExecutor | None = None
+        self.__pending = 0
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "peak_pending": 0, "restarts": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                # 'spawn' avoids forking a process that already runs threads (uvicorn, Selenium, httpx).
+                self.__executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker,
+                )
+            return self.__executor
+
+    def warm(self) -> None:
+        """Starts every worker process now rather than on the first request."""
+        if not self.enabled:
+            return
+        executor = self._get_executor()
+        pids = {f.result() for f in [executor.submit(_noop) for _ in range(self.workers * 2)]}
+        logger.info(f"CPU pool warmed with {len(pids)} worker processes.")
+
+    def saturated(self) -> bool:
+        return self.__pending >= self.max_pending
+
+    def check_capacity(self) -> None:
+        if self.saturated():
+            self.counters["rejected"] += 1
+            raise CPUPoolSaturated(f"CPU pool is saturated ({self.__pending} tasks pending).")
+
+    def __enter_task(self) -> None:
+        with self.__lock:
+            self.__pending += 1
+            self.counters["submitted"] += 1
+            self.counters["peak_pending"] = max(self.counters["peak_pending"], self.__pending)
+
+    def __exit_task(self, ok: bool) -> None:
+        with self.__lock:
+            self.__pending -= 1
+            self.counters["completed" if ok else "failed"] += 1
+
+    def __restart(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Drops the executor a failed task was submitted to. Tasks that broke
+        together all report the same executor; only the first one replaces
+        it, so later ones do not shut down the fresh pool other requests use.
+        """
+        with self.__lock:
+            if self.__executor is not broken:
+                return
+            self.__executor = None
+            self.counters["restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("A CPU pool worker died; the pool was restarted.")
+
+    def call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Runs fn(*args) in a worker process and blocks for the result."""
+        if not self.enabled:
+            return fn(*args)
+        self.__enter_task()
+        ok = False
+        executor = self._get_executor()
+        try:
+            result = executor.submit(fn, *args).result()
+            ok = True
+            return result
+        except BrokenProcessPool:
+            self.__restart(executor)
+            raise
+        finally:
+            self.__exit_task(ok)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Async counterpart of call(); without workers fn runs in a thread."""
+        if not self.enabled:
+            return await asyncio.to_thread(fn, *args)
+        self.__enter_task()
+        ok = False
+        executor = self._get_executor()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            ok = True
+            return result
+        except BrokenProcessPool:
+            self.__restart(executor)
+            raise
+        finally:
+            self.__exit_task(ok)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "max_pending": self.max_pending, "pending": self.__pending, **self.counters}
+
+    def close(self) -> None:
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
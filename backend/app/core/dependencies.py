@@ -0,0 +1,53 @@
+from fastapi import Depends, HTTPException, Request
+
+from app.core.cpu_pool import CPUPool, CPUPoolSaturated
+from app.core.email_generator import EmailGenerator
+from app.core.job_queue import JobQueue, JobWorkerPool
+from app.core.resume_generator import ResumeGenerationSaturated, ResumeGenerator
+
+
+def get_email_generator(request: Request) -> EmailGenerator:
+    """Returns the process-wide EmailGenerator created in the app lifespan."""
+    return request.app.state.email_generator
+
+
+def get_resume_generator(request: Request) -> ResumeGenerator:
+    """Returns the process-wide ResumeGenerator created in the app lifespan."""
+    return request.app.state.resume_generator
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Returns the job queue opened in the app lifespan."""
+    return request.app.state.job_queue
+
+
+def get_job_workers(request: Request) -> JobWorkerPool | None:
+    """Returns the in-process job workers, or None when jobs run in separate worker processes."""
+    return request.app.state.job_workers
+
+
+def get_cpu_pool(request: Request) -> CPUPool:
+    """Returns the process pool for CPU-bound stages created in the app lifespan."""
+    return request.app.state.email_generator.cpu_pool
+
+
+def require_cpu_capacity(request: Request) -> None:
+    """
+    Rejects the request with a 429 before any work starts when the CPU pool
+    already has as many tasks in flight as it is allowed to queue.
+    """
+    try:
+        get_cpu_pool(request).check_capacity()
+    except CPUPoolSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
+
+def require_resume_capacity(resume_gen: ResumeGenerator = Depends(get_resume_generator)) -> None:
+    """
+    Rejects the request with a 429 before the LLM is called when resume
+    generation or the LaTeX compiler already has as much work as it may queue.
+    """
+    try:
+        resume_gen.check_capacity()
+    except ResumeGenerationSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
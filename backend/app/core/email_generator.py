@@ -1,52 +1,440 @@
+import asyncio
+import copy
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+import os
+from loguru import logger
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda, RunnableParallel
 from langchain_core.output_parsers import JsonOutputParser
 
 from app.tools.jd_scraper import Scraper
 from app.tools.jd_to_json import JD2JSON
 from app.tools.linkedin import LinkedIn
-from app.tools.resume_parser import ResumeParser
+from app.tools.resume_cache import ResumeCache, resume_id_for
+from app.tools.resume_parser import ResumeParser, ResumeSource, extract_pdf_text
 
-from app.core.models.email_models import EmailAndReview, ReferralAndReview
+from app.core.cpu_pool import CPUPool
+from app.core.llm_providers import create_llm
+from app.core.telemetry import instrument_llm, span, traced
+from app.core.cache import AsyncSingleFlight, SingleFlight, TieredCache, content_hash
+from app.core.models.email_models import EmailDraft, ReferralDraft, StructuredReview
+from app.core.prompts import format_instructions
 
-from typing import Optional, Dict, List
-from threading import Thread
+from typing import Optional, Dict, List, Callable, Any, AsyncIterator, Awaitable, Tuple
+from threading import Thread, Lock
+
+# Per-stage timeouts (seconds) for the async pipeline.
+JD_STAGE_TIMEOUT = float(os.getenv('JD_STAGE_TIMEOUT', '60'))
+RESUME_STAGE_TIMEOUT = float(os.getenv('RESUME_STAGE_TIMEOUT', '30'))
+LINKEDIN_STAGE_TIMEOUT = float(os.getenv('LINKEDIN_STAGE_TIMEOUT', '30'))
+LLM_STAGE_TIMEOUT = float(os.getenv('LLM_STAGE_TIMEOUT', '90'))
+
+# Batch generation: JDs prepared (scraped/converted) at once, and items in
+# flight through the LLM chains at once.
+BATCH_PREP_CONCURRENCY = int(os.getenv('BATCH_PREP_CONCURRENCY', '8'))
+BATCH_LLM_CONCURRENCY = int(os.getenv('BATCH_LLM_CONCURRENCY', '8'))
+
+REVIEW_SYSTEM_MESSAGE = (
+    "You are an expert resume reviewer. "
+    "Given the job description and resume, review the resume and provide actionable suggestions to improve it for this job, "
+    "including missing skills, keywords, or experiences that should be highlighted. "
+    "You must follow the provided JSON format instructions."
+)
+
+EMAIL_SYSTEM_MESSAGE = (
+    "You are an expert career assistant. "
+    "Given the job description, recruiter profile (if any), and resume, "
+    "curate a professional and concise email to the recruiter, highlighting the candidate's relevant experience and expressing genuine interest in the role. "
+    "You must follow the provided JSON format instructions."
+)
+
+REFERRAL_SYSTEM_MESSAGE = (
+    "You are an expert career assistant helping a job applicant. "
+    "Your task is to generate a **referral request** based on the provided documents.\n\n"
+
+    "⚠️ IMPORTANT CLARIFICATION:\n"
+    "- You are **not writing a recommendation letter.**\n"
+    "- You are writing a **referral request written BY the applicant, in the first person** (e.g., 'I am reaching out to ask...').\n"
+    "- The applicant is politely asking someone else for help with a referral.\n\n"
+
+    "**Draft {display_message_type} on behalf of the applicant to send.** "
+    "This message MUST be written strictly in the **first person**. "
+    "It should be professional, concise, and sound like the applicant is requesting help. "
+    "Adhere to the correct format for the message type; for example, an 'email' requires a subject line.\n\n"
+
+    "✅ Example (Correct - first person referral request):\n"
+    "  'Hi [Name], I hope you're doing well. I came across a role at [Company] that strongly aligns with my background, "
+    "and I wanted to ask if you’d be open to referring me.'\n\n"
+
+    "❌ Example (Incorrect - third person recommendation):\n"
+    "  'I am writing to recommend Jai for this position...' (DO NOT write like this.)\n\n"
+
+    "You must strictly follow the provided JSON format instructions."
+)
+
+# The prompts are compiled once per process, with the format instructions
+# (the serialised response schema) bound as partials.
+REVIEW_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", REVIEW_SYSTEM_MESSAGE),
+    ("human",
+     "{format_instructions}\n\n"
+     "Job Description JSON:\n{jd_json}\n\n"
+     "Resume:\n{resume_text}"
+     )
+]).partial(format_instructions=format_instructions(StructuredReview))
+
+_MESSAGE_HUMAN = (
+    "{format_instructions}\n\n"
+    "Job Description JSON:\n{jd_json}\n\n"
+    "Resume:\n{resume_text}\n\n"
+    "{recruiter_block}"
+)
+EMAIL_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", EMAIL_SYSTEM_MESSAGE),
+    ("human", _MESSAGE_HUMAN),
+]).partial(format_instructions=format_instructions(EmailDraft))
+# {display_message_type} in the system message is filled per request.
+REFERRAL_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", REFERRAL_SYSTEM_MESSAGE),
+    ("human", _MESSAGE_HUMAN),
+]).partial(format_instructions=format_instructions(ReferralDraft))
+
+
+def _field_delta(sent: Dict[str, Any], value: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The fields of a partial section that changed since the last event:
+    the new suffix of a growing string, any other value whole. Records
+    what was sent in `sent`.
+    """
+    delta = {}
+    for name, current in value.items():
+        previous = sent.get(name)
+        if current in (None, "") or current == previous:
+            continue
+        if isinstance(current, str) and isinstance(previous, str) and current.startswith(previous):
+            delta[name] = current[len(previous):]
+        else:
+            delta[name] = current
+        sent[name] = current
+    return delta
 
 
 class EmailGenerator:
-    def __init__(self):
-        self.scraper = Scraper()
-        self.jd2json = JD2JSON()
-        self.linkedin = LinkedIn()
-        self.resume_parser = ResumeParser()
-        self.llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
-        self.__email_parser = JsonOutputParser(pydantic_object=EmailAndReview)
-        self.__referral_parser = JsonOutputParser(pydantic_object=ReferralAndReview)
+    """
+    Orchestrates scraping, parsing and LLM calls for email/referral generation.
 
+    A single instance is meant to be shared for the lifetime of the app. The
+    heavy collaborators (scraper, JD converter, LinkedIn wrapper, LLM client)
+    are only constructed the first time they are used and then reused.
+    """
+    def __init__(
+        self,
+        llm: BaseChatModel | None = None,
+        review_cache: TieredCache | None = None,
+        resume_cache: ResumeCache | None = None,
+        cpu_pool: CPUPool | None = None,
+    ):
+        self.__lock = Lock()
+        self.__tools: Dict[str, Any] = {}
+        if llm is not None:
+            self.__tools['llm'] = instrument_llm(llm)
+        self.__email_parser = JsonOutputParser(pydantic_object=EmailDraft)
+        self.__referral_parser = JsonOutputParser(pydantic_object=ReferralDraft)
+        self.__review_parser = JsonOutputParser(pydantic_object=StructuredReview)
+        # The review depends only on the resume and the JD, so it is cached
+        # separately from the message and shared across recruiters and
+        # message types.
+        self.review_cache = review_cache or TieredCache.from_env('REVIEW', maxsize=256, ttl=7 * 24 * 3600)
+        self.__review_namespace = content_hash(REVIEW_SYSTEM_MESSAGE, StructuredReview.model_json_schema())
+        self.__review_flight = SingleFlight()
+        self.__areview_flight = AsyncSingleFlight()
+        self.resume_cache = resume_cache or ResumeCache()
+        self.__resume_flight = SingleFlight()
+        self.__aresume_flight = AsyncSingleFlight()
+        # Without a pool, PDF and HTML extraction run in threads as before.
+        self.cpu_pool = cpu_pool or CPUPool(workers=0)
+
+    def _get_or_create(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Returns the named collaborator, building it once on first access."""
+        tool = self.__tools.get(name)
+        if tool is None:
+            with self.__lock:
+                tool = self.__tools.get(name)
+                if tool is None:
+                    tool = factory()
+                    self.__tools[name] = tool
+        return tool
+
+    def close(self) -> None:
+        """Releases resources held by collaborators that were built."""
+        scraper = self.__tools.get('scraper')
+        if scraper is not None:
+            scraper.close()
+        jd2json = self.__tools.get('jd2json')
+        if jd2json is not None:
+            jd2json.cache.close()
+        linkedin = self.__tools.get('linkedin')
+        if linkedin is not None:
+            linkedin.close()
+        self.review_cache.close()
+        self.resume_cache.close()
+
+    async def aclose(self) -> None:
+        """Async counterpart of close() that also shuts down async HTTP clients."""
+        scraper = self.__tools.get('scraper')
+        if scraper is not None:
+            await scraper.aclose()
+        linkedin = self.__tools.get('linkedin')
+        if linkedin is not None:
+            await linkedin.aclose()
+        self.close()
+
+    def cache_report(self) -> Dict[str, Any]:
+        """Hit/miss statistics for the caches of collaborators that were built."""
+        report = {}
+        scraper = self.__tools.get('scraper')
+        if scraper is not None:
+            report['scrape'] = scraper.cache_report()
+            report['scrape_http'] = scraper.http.stats()
+        jd2json = self.__tools.get('jd2json')
+        if jd2json is not None:
+            report['jd_json'] = jd2json.cache.report()
+            report['jd_condense'] = dict(jd2json.condense_totals)
+            report['jd_extract'] = jd2json.extract_report()
+        linkedin = self.__tools.get('linkedin')
+        if linkedin is not None:
+            report['linkedin'] = linkedin.cache.report()
+        report['review'] = {
+            **self.review_cache.report(),
+            'coalesced': self.__review_flight.coalesced + self.__areview_flight.coalesced,
+        }
+        report['resume'] = self.resume_cache.report()
+        return report
+
+    @property
+    def scraper(self) -> Scraper:
+        return self._get_or_create('scraper', lambda: Scraper(cpu_pool=self.cpu_pool))
+
+    @property
+    def jd2json(self) -> JD2JSON:
+        # Shares an injected LLM (e.g. a fake in benchmarks) with the JD converter.
+        return self._get_or_create('jd2json', lambda: JD2JSON(llm=self.__tools.get('llm')))
+
+    @property
+    def linkedin(self) -> LinkedIn:
+        return self._get_or_create('linkedin', LinkedIn)
+
+    @property
+    def resume_parser(self) -> ResumeParser:
+        return self._get_or_create('resume_parser', ResumeParser)
+
+    @property
+    def llm(self) -> BaseChatModel:
+        return self._get_or_create('llm', lambda: instrument_llm(create_llm('gemini-2.0-flash')))
+
+    @traced("generate.jd_json")
     def _get_jd_json(self, jd_url: Optional[str], jd_text: Optional[str], result_holder: dict):
         """Processes either a JD URL or raw text to get JSON."""
-        jd_content = None
+        jd_content, posting = None, None
         if jd_url:
-            jd_content = self.scraper.scrape(jd_url)
+            entry = self.scraper.scrape_entry(jd_url)
+            jd_content, posting = (entry.text, entry.posting) if entry else (None, None)
         elif jd_text:
             jd_content = jd_text
         
         if jd_content:
-            result_holder['jd_json'] = self.jd2json.convert(jd_content)
+            result_holder['jd_json'] = self.jd2json.convert(jd_content, source_url=jd_url, posting=posting)
         else:
             result_holder['jd_json'] = {}
 
+    @traced("generate.recruiter_info")
     def _scrape_linkedin(self, recruiter_url: str, result_holder: dict):
         """Scrapes LinkedIn profile."""
         recruiter_info = self.linkedin.search(recruiter_url)
         result_holder['recruiter_info'] = recruiter_info if recruiter_info else {}
 
-    def _parse_resume(self, resume_path: str, result_holder: dict):
-        """Parses the resume file."""
-        resume_text = self.resume_parser.parse(resume_path)
+    def _cache_parsed(self, resume_id: str, text: str) -> str:
+        self.resume_cache.counters["parses"] += 1
+        self.resume_cache.put(resume_id, text)
+        return text
+
+    @traced("resume.parse")
+    def _parse_and_cache(self, resume_id: str, contents: bytes) -> str:
+        return self._cache_parsed(resume_id, self.cpu_pool.call(extract_pdf_text, contents) or "")
+
+    @traced("resume.parse")
+    async def _aparse_and_cache(self, resume_id: str, contents: bytes) -> str:
+        return self._cache_parsed(resume_id, await self.cpu_pool.run(extract_pdf_text, contents) or "")
+
+    def parse_resume(self, contents: bytes) -> Tuple[str, str]:
+        """
+        Returns (resume_id, text) for an uploaded PDF, parsing it only when
+        the same bytes have not been parsed before.
+        """
+        resume_id = resume_id_for(contents)
+        text = self.resume_cache.get(resume_id)
+        if text is None:
+            text = self.__resume_flight.do(resume_id, lambda: self._parse_and_cache(resume_id, contents))
+        return resume_id, text
+
+    async def aparse_resume(self, contents: bytes) -> Tuple[str, str]:
+        """Async counterpart of parse_resume; parsing runs in the CPU pool."""
+        resume_id = resume_id_for(contents)
+        text = self.resume_cache.get(resume_id)
+        if text is None:
+            text = await self.__aresume_flight.do(resume_id, lambda: self._aparse_and_cache(resume_id, contents))
+        return resume_id, text
+
+    def resume_text(self, resume_id: str) -> str | None:
+        """The cached text of a previously uploaded resume, or None if unknown or expired."""
+        return self.resume_cache.get(resume_id)
+
+    @traced("generate.resume_text")
+    def _parse_resume(self, resume: ResumeSource, result_holder: dict):
+        """Parses the resume (a path or the PDF bytes)."""
+        if isinstance(resume, (bytes, bytearray, memoryview)):
+            resume_text = self.parse_resume(bytes(resume))[1]
+        elif isinstance(resume, str):
+            resume_text = self.cpu_pool.call(extract_pdf_text, resume) if resume else None
+        else:
+            resume_text = self.resume_parser.parse(resume)
         result_holder['resume_text'] = resume_text if resume_text else ""
 
+    @traced("generate.jd_json")
+    async def _aget_jd_json(self, jd_url: Optional[str], jd_text: Optional[str]) -> Dict:
+        """Async counterpart of _get_jd_json."""
+        jd_content, posting = None, None
+        if jd_url:
+            entry = await self.scraper.ascrape_entry(jd_url)
+            jd_content, posting = (entry.text, entry.posting) if entry else (None, None)
+        elif jd_text:
+            jd_content = jd_text
+        return await self.jd2json.aconvert(jd_content, source_url=jd_url, posting=posting) if jd_content else {}
+
+    @traced("generate.recruiter_info")
+    async def _ascrape_linkedin(self, recruiter_url: str) -> Dict:
+        """Async counterpart of _scrape_linkedin."""
+        return await self.linkedin.asearch(recruiter_url) or {}
+
+    @traced("generate.resume_text")
+    async def _aparse_resume(self, resume: ResumeSource) -> str:
+        """Async counterpart of _parse_resume."""
+        if isinstance(resume, (bytes, bytearray, memoryview)):
+            return (await self.aparse_resume(bytes(resume)))[1]
+        if isinstance(resume, str):
+            return await self.cpu_pool.run(extract_pdf_text, resume) if resume else ""
+        return await asyncio.to_thread(self.resume_parser.parse, resume) or ""
+
+    @staticmethod
+    async def _run_stages(
+        stages: Dict[str, Tuple[Awaitable, float, Any]], errors: Dict[str, BaseException] | None = None
+    ) -> Dict[str, Any]:
+        """
+        Runs the stages concurrently, each under its own timeout.
+        A stage that fails or times out is logged and replaced by its default;
+        its exception is also recorded in errors, when given.
+        If the caller is cancelled, every pending stage is cancelled with it.
+        """
+        names = list(stages)
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(stages[name][0], timeout=stages[name][1]) for name in names),
+            return_exceptions=True,
+        )
+        results = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                if isinstance(outcome, asyncio.CancelledError):
+                    raise outcome
+                logger.error(f"Stage '{name}' failed: {outcome!r}")
+                if errors is not None:
+                    errors[name] = outcome
+                outcome = stages[name][2]
+            results[name] = outcome
+        return results
+
+    def review_key(self, resume_text: str, job_description: Any) -> str:
+        return content_hash(
+            self.__review_namespace, getattr(self.llm, 'model', None),
+            content_hash(resume_text), content_hash(job_description),
+        )
+
+    def _chain(self, name: str, prompt: ChatPromptTemplate, parser: JsonOutputParser):
+        """prompt | llm | parser, composed once per instance and reused by every call."""
+        llm = self.llm
+        return self._get_or_create(f'{name}_chain', lambda: prompt | llm | parser)
+
+    def _reviewed(self, name: str, chain):
+        """_with_review(chain) for the named message chain, also wrapped only once."""
+        return self._get_or_create(f'{name}_reviewed', lambda: self._with_review(chain))
+
+    def _prepare_review(self, resume_text: str, job_description: Any):
+        """The resume review chain and its input."""
+        input_data = {
+            "jd_json": job_description,
+            "resume_text": resume_text,
+        }
+        return self._chain('review', REVIEW_PROMPT, self.__review_parser), input_data
+
+    def _review(self, resume_text: str, job_description: Any) -> Dict:
+        """Reviews the resume against the JD, reusing a cached review for the same pair."""
+        key = self.review_key(resume_text, job_description)
+        cached = self.review_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        def run() -> Dict:
+            chain, input_data = self._prepare_review(resume_text, job_description)
+            with span("llm.review"):
+                review = chain.invoke(input_data)
+            if review:
+                self.review_cache.set(key, review)
+            return review
+        return copy.deepcopy(self.__review_flight.do(key, run))
+
+    async def _areview(self, resume_text: str, job_description: Any) -> Dict:
+        """Async counterpart of _review."""
+        key = self.review_key(resume_text, job_description)
+        cached = self.review_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        async def run() -> Dict:
+            chain, input_data = self._prepare_review(resume_text, job_description)
+            with span("llm.review"):
+                review = await chain.ainvoke(input_data)
+            if review:
+                self.review_cache.set(key, review)
+            return review
+        return copy.deepcopy(await self.__areview_flight.do(key, run))
+
+    def _with_review(self, chain):
+        """
+        Wraps a message chain so the (cached) review for the same resume/JD
+        runs alongside it, and merges both into the response schema.
+        """
+        async def areview(input_data: Dict) -> Dict:
+            return await self._areview(input_data['resume_text'], input_data['jd_json'])
+
+        review = RunnableLambda(lambda input_data: self._review(input_data['resume_text'], input_data['jd_json']), afunc=areview)
+        merge = RunnableLambda(lambda result: {**result['draft'], 'review': result['review']})
+        return RunnableParallel(draft=chain, review=review) | merge
+
+    def _prepare_email(
+        self,
+        resume_text: str,
+        job_description: str,
+        recruiter_info: Optional[str] = None
+    ):
+        """The email chain and its input for craft_email/acraft_email."""
+        input_data = {
+            "jd_json": job_description,
+            "resume_text": resume_text,
+            "recruiter_block": f"Recruiter Info:\n{recruiter_info}" if recruiter_info else "",
+        }
+        return self._chain('email', EMAIL_PROMPT, self.__email_parser), input_data
+
+    @traced("craft.email")
     def craft_email(
         self,   
         resume_text: str,
@@ -54,35 +442,87 @@ class EmailGenerator:
         recruiter_info: Optional[str] = None
     ) -> Dict: # Return a dictionary for easier processing
         """Crafts a professional email and reviews the resume based on the job description."""
+        chain, input_data = self._prepare_email(resume_text, job_description, recruiter_info)
+        return self._reviewed('email', chain).invoke(input_data)
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", 
-             "You are an expert career assistant and resume reviewer. "
-             "Given the job description, recruiter profile (if any), and resume, "
-             "1. Curate a professional and concise email to the recruiter, highlighting the candidate's relevant experience and expressing genuine interest in the role. "
-             "2. Review the resume and provide actionable suggestions to improve it for this job, including missing skills, keywords, or experiences that should be highlighted."
-             "You must follow the provided JSON format instructions."
-             ),
-            ("human", 
-             "{format_instructions}\n\n"
-             "Job Description JSON:\n{jd_json}\n\n"
-             "Resume:\n{resume_text}\n\n"
-             "{recruiter_block}"
-             )
-        ])
-        
+    @traced("craft.email")
+    async def acraft_email(
+        self,
+        resume_text: str,
+        job_description: str,
+        recruiter_info: Optional[str] = None
+    ) -> Dict:
+        """Async counterpart of craft_email; raises TimeoutError after LLM_STAGE_TIMEOUT."""
+        chain, input_data = self._prepare_email(resume_text, job_description, recruiter_info)
+        return await asyncio.wait_for(self._reviewed('email', chain).ainvoke(input_data), timeout=LLM_STAGE_TIMEOUT)
+
+    async def astream_email(
+        self,
+        resume_text: str,
+        job_description: str,
+        recruiter_info: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """Streaming counterpart of acraft_email; see _astream_sections."""
+        chain, input_data = self._prepare_email(resume_text, job_description, recruiter_info)
+        async for event in self._astream_sections(chain, input_data, self._areview(resume_text, job_description)):
+            yield event
+
+    @staticmethod
+    async def _astream_sections(chain, input_data: Dict, review: Awaitable[Dict]) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streams the message chain's partial JSON while the review runs
+        alongside. Yields (section, delta) each time the message section
+        ('email' or 'referral_message') grows, where delta holds only what is
+        new (see app/api/sse.py), then ('review', review) and ('done', result)
+        with the merged object.
+        Raises TimeoutError if the whole stream takes longer than LLM_STAGE_TIMEOUT.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LLM_STAGE_TIMEOUT
+        review_task = asyncio.ensure_future(review)
+        stream = chain.astream(input_data).__aiter__()
+        sent: Dict[str, Dict[str, Any]] = {}
+        result = None
+        try:
+            while True:
+                try:
+                    partial = await asyncio.wait_for(stream.__anext__(), timeout=max(0.0, deadline - loop.time()))
+                except StopAsyncIteration:
+                    break
+                if not isinstance(partial, dict):
+                    continue
+                result = partial
+                for section, value in partial.items():
+                    if isinstance(value, dict) and (delta := _field_delta(sent.setdefault(section, {}), value)):
+                        yield section, delta
+            if not result:
+                raise ValueError("The model returned no parseable JSON.")
+            review_result = await asyncio.wait_for(review_task, timeout=max(0.0, deadline - loop.time()))
+        finally:
+            review_task.cancel()
+            await stream.aclose()
+        yield 'review', review_result
+        yield 'done', {**result, 'review': review_result}
+
+    def _prepare_referral(
+        self,
+        resume_text: str,
+        job_description: str,
+        recruiter_info: Optional[str] = None,
+        message_type: str = "linkedin message",
+    ):
+        """The referral chain and its input for craft_referral/acraft_referral."""
+        # (Optional but good practice) Add a helper for grammar
+        display_message_type = "an email" if "email" in message_type.lower() else "a LinkedIn message"
         input_data = {
             "jd_json": job_description,
             "resume_text": resume_text,
-            "recruiter_block": f"Recruiter Info:\n{recruiter_info}" if recruiter_info else "",
-            "format_instructions": self.__email_parser.get_format_instructions()
+            "recruiter_block": f"Contact Info (for referral):\n{recruiter_info}" if recruiter_info else "",
+            "display_message_type": display_message_type,
         }
+        return self._chain('referral', REFERRAL_PROMPT, self.__referral_parser), input_data
 
-        chain = prompt | self.llm | self.__email_parser
-        result = chain.invoke(input_data)
-        
-        return result
-
+    @traced("craft.referral")
     def craft_referral(
         self,
         resume_text: str,
@@ -91,57 +531,36 @@ class EmailGenerator:
         message_type: str = "linkedin message", # or "email"
     ) -> Dict:
         """Crafts a linkedin referral message or email based on the job description and resume, and optionally recruiter info or employee info."""
-        
-        # (Optional but good practice) Add a helper for grammar
-        display_message_type = "an email" if "email" in message_type.lower() else "a LinkedIn message"
+        chain, input_data = self._prepare_referral(resume_text, job_description, recruiter_info, message_type)
+        return self._reviewed('referral', chain).invoke(input_data)
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system",
-            "You are an expert career assistant helping a job applicant. "
-            "Your task is to generate a **referral request** and a resume review based on the provided documents.\n\n"
-            
-            "⚠️ IMPORTANT CLARIFICATION:\n"
-            "- You are **not writing a recommendation letter.**\n"
-            "- You are writing a **referral request written BY the applicant, in the first person** (e.g., 'I am reaching out to ask...').\n"
-            "- The applicant is politely asking someone else for help with a referral.\n\n"
-
-            "1. **Draft {display_message_type} on behalf of the applicant to send.** "
-            "This message MUST be written strictly in the **first person**. "
-            "It should be professional, concise, and sound like the applicant is requesting help. "
-            "Adhere to the correct format for the message type; for example, an 'email' requires a subject line.\n\n"
-
-            "✅ Example (Correct - first person referral request):\n"
-            "  'Hi [Name], I hope you're doing well. I came across a role at [Company] that strongly aligns with my background, "
-            "and I wanted to ask if you’d be open to referring me.'\n\n"
-
-            "❌ Example (Incorrect - third person recommendation):\n"
-            "  'I am writing to recommend Jai for this position...' (DO NOT write like this.)\n\n"
-
-            "2. **Review the applicant's resume.** Provide detailed, actionable suggestions to better tailor it for this job.\n\n"
-            "You must strictly follow the provided JSON format instructions."
-            ),
-            ("human",
-            "{format_instructions}\n\n"
-            "Job Description JSON:\n{jd_json}\n\n"
-            "Resume:\n{resume_text}\n\n"
-            "{recruiter_block}"
-            )
-        ])
-        input_data = {
-            "jd_json": job_description,
-            "resume_text": resume_text,
-            "recruiter_block": f"Contact Info (for referral):\n{recruiter_info}" if recruiter_info else "",
-            "format_instructions": self.__referral_parser.get_format_instructions(),
-            "display_message_type": display_message_type 
-        }
+    @traced("craft.referral")
+    async def acraft_referral(
+        self,
+        resume_text: str,
+        job_description: str,
+        recruiter_info: Optional[str] = None,
+        message_type: str = "linkedin message",
+    ) -> Dict:
+        """Async counterpart of craft_referral; raises TimeoutError after LLM_STAGE_TIMEOUT."""
+        chain, input_data = self._prepare_referral(resume_text, job_description, recruiter_info, message_type)
+        return await asyncio.wait_for(self._reviewed('referral', chain).ainvoke(input_data), timeout=LLM_STAGE_TIMEOUT)
 
-        chain = prompt | self.llm | self.__referral_parser
-        result = chain.invoke(input_data)
-        return result
+    async def astream_referral(
+        self,
+        resume_text: str,
+        job_description: str,
+        recruiter_info: Optional[str] = None,
+        message_type: str = "linkedin message",
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """Streaming counterpart of acraft_referral; see _astream_sections."""
+        chain, input_data = self._prepare_referral(resume_text, job_description, recruiter_info, message_type)
+        async for event in self._astream_sections(chain, input_data, self._areview(resume_text, job_description)):
+            yield event
 
     def generate(
         self,
-        resume_path: str,
+        resume: ResumeSource,
         jd_url: Optional[str] = None,
         jd_text: Optional[str] = None,
         recruiter_url: Optional[str] = None
@@ -156,7 +575,7 @@ class EmailGenerator:
         jd_thread = Thread(target=self._get_jd_json, args=(jd_url, jd_text, results))
         threads.append(jd_thread)
 
-        resume_thread = Thread(target=self._parse_resume, args=(resume_path, results))
+        resume_thread = Thread(target=self._parse_resume, args=(resume, results))
         threads.append(resume_thread)
 
         if recruiter_url:
@@ -180,6 +599,145 @@ class EmailGenerator:
             recruiter_info=recruiter_info
         )
 
+    async def agenerate(
+        self,
+        resume: ResumeSource,
+        jd_url: Optional[str] = None,
+        jd_text: Optional[str] = None,
+        recruiter_url: Optional[str] = None
+    ) -> Dict:
+        """
+        Async counterpart of generate: JD scraping/conversion, resume parsing
+        and the LinkedIn lookup run concurrently on the event loop.
+        """
+        if not jd_url and not jd_text:
+            raise ValueError("Either a job description URL or text must be provided.")
+
+        stages = {
+            'jd_json': (self._aget_jd_json(jd_url, jd_text), JD_STAGE_TIMEOUT, {}),
+            'resume_text': (self._aparse_resume(resume), RESUME_STAGE_TIMEOUT, ""),
+        }
+        if recruiter_url:
+            stages['recruiter_info'] = (self._ascrape_linkedin(recruiter_url), LINKEDIN_STAGE_TIMEOUT, {})
+
+        results = await self._run_stages(stages)
+
+        return await self.acraft_referral(
+            resume_text=results['resume_text'],
+            job_description=results['jd_json'],
+            recruiter_info=results.get('recruiter_info', {})
+        )
+
+    async def _aprepare_batch_item(self, item: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Gets the JD JSON and recruiter info for one batch item."""
+        async with semaphore:
+            stages = {'jd_json': (self._aget_jd_json(item.get('jd_url'), item.get('jd_text')), JD_STAGE_TIMEOUT, {})}
+            if item.get('recruiter_url') and not item.get('recruiter_info'):
+                stages['recruiter_info'] = (self._ascrape_linkedin(item['recruiter_url']), LINKEDIN_STAGE_TIMEOUT, {})
+            errors: Dict[str, BaseException] = {}
+            results = await self._run_stages(stages, errors)
+        if not results['jd_json']:
+            cause = errors.get('jd_json')
+            if isinstance(cause, TimeoutError):
+                reason = f"timed out after {JD_STAGE_TIMEOUT:g}s"
+            elif cause is not None:
+                reason = str(cause) or type(cause).__name__
+            elif item.get('jd_url'):
+                reason = f"no job description text was found at {item['jd_url']}"
+            else:
+                reason = "the job description text is empty"
+            raise ValueError(f"Could not get the job description: {reason}.") from cause
+        return {'jd_json': results['jd_json'], 'recruiter_info': item.get('recruiter_info') or results.get('recruiter_info', {})}
+
+    async def _aprefetch_recruiters(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Looks up every recruiter profile the batch needs in one dataset
+        request and fills them in as recruiter_info. Items whose lookup
+        fails are left as they were.
+        """
+        urls = [item['recruiter_url'] for item in items if item.get('recruiter_url') and not item.get('recruiter_info')]
+        if not urls:
+            return items
+        try:
+            profiles = await asyncio.wait_for(self.linkedin.asearch_many(urls), LINKEDIN_STAGE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Batched recruiter lookup failed: {e!r}")
+            return items
+        return [
+            {**item, 'recruiter_info': profiles[item['recruiter_url']]}
+            if profiles.get(item.get('recruiter_url')) and not item.get('recruiter_info') else item
+            for item in items
+        ]
+
+    async def abatch_generate(
+        self,
+        resume_text: str,
+        items: List[Dict[str, Any]],
+        kind: str = "email",
+        max_concurrency: int = BATCH_LLM_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generates an email (or referral message) and review for each item
+        against one resume. Items are dicts with jd_url or jd_text and
+        optionally recruiter_url, recruiter_info and message_type.
+
+        JDs are scraped/converted with at most BATCH_PREP_CONCURRENCY in
+        flight, then the chains run with at most max_concurrency in flight,
+        each under its own LLM_STAGE_TIMEOUT. Returns one {'status': 'ok', 'result': ...} or
+        {'status': 'error', 'error': ...} per item, in input order.
+
+        The chains deliberately run as separate ainvoke calls behind a
+        semaphore rather than one Runnable.abatch(max_concurrency=...):
+        abatch has no per-item timeout, so one slow item would hold up the
+        whole batch, and a timeout around the batch fails every item
+        instead of reporting which one timed out.
+        """
+        items = await self._aprefetch_recruiters(items)
+        semaphore = asyncio.Semaphore(BATCH_PREP_CONCURRENCY)
+        prepared = await asyncio.gather(
+            *(self._aprepare_batch_item(item, semaphore) for item in items), return_exceptions=True
+        )
+        outcomes: List[Any] = list(prepared)
+        ready = [i for i, p in enumerate(prepared) if not isinstance(p, BaseException)]
+
+        if ready:
+            chain, inputs = None, []
+            for i in ready:
+                if kind == "referral":
+                    chain, input_data = self._prepare_referral(
+                        resume_text, prepared[i]['jd_json'], prepared[i]['recruiter_info'],
+                        items[i].get('message_type') or "linkedin message",
+                    )
+                else:
+                    chain, input_data = self._prepare_email(resume_text, prepared[i]['jd_json'], prepared[i]['recruiter_info'])
+                inputs.append(input_data)
+            # Every item shares the same prompt, so one chain serves the whole batch.
+            reviewed = self._reviewed("referral" if kind == "referral" else "email", chain)
+            llm_slots = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def run(input_data: Dict[str, Any]) -> Dict[str, Any]:
+                # The deadline is per item, so one slow item fails alone.
+                async with llm_slots:
+                    try:
+                        return await asyncio.wait_for(reviewed.ainvoke(input_data), timeout=LLM_STAGE_TIMEOUT)
+                    except TimeoutError:
+                        raise TimeoutError(f"Timed out after {LLM_STAGE_TIMEOUT:g}s while generating.") from None
+
+            results = await asyncio.gather(*(run(input_data) for input_data in inputs), return_exceptions=True)
+            for i, result in zip(ready, results):
+                outcomes[i] = result
+
+        report = []
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                logger.error(f"Batch item {i} failed: {outcome!r}")
+                report.append({'index': i, 'status': 'error', 'error': str(outcome) or type(outcome).__name__})
+            else:
+                report.append({'index': i, 'status': 'ok', 'result': outcome})
+        return report
+
 # Example usage:
 if __name__ == "__main__":
     eg = EmailGenerator()
@@ -196,7 +754,7 @@ if __name__ == "__main__":
     Key Qualifications: Proficiency in Python, Django/FastAPI, and PostgreSQL.
     """
     structured_output = eg.generate(
-        resume_path=resume_path,
+        resume=resume_path,
         jd_text=job_description_text
     )
     
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.core.cache import content_hash
+
+# JsonOutputParser.get_format_instructions() ends with the schema in a fenced block.
+_SCHEMA_BLOCK = re.compile(r"Here is the output schema:\s*```\s*(\{.*?\})\s*```", re.DOTALL)
+
+_WORDS = (
+    "built scalable backend services python fastapi postgresql team delivered reliable "
+    "customers product data pipelines cloud reduced latency improved experience design "
+    "engineering review tested deployed role company skills impact collaborated"
+).split()
+
+# Roughly four characters per token, as for the estimates elsewhere in the app.
+CHARS_PER_TOKEN = 4
+
+
+def find_schema(prompt: str) -> Dict[str, Any] | None:
+    """The last JSON schema embedded in the prompt by a JsonOutputParser, if any."""
+    blocks = _SCHEMA_BLOCK.findall(prompt)
+    if not blocks:
+        return None
+    try:
+        return json.loads(blocks[-1])
+    except json.JSONDecodeError:
+        return None
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _string(schema: Dict[str, Any], name: str, rng: random.Random) -> str:
+    fmt = schema.get("format")
+    if fmt == "email":
+        return "jane.doe@example.com"
+    if fmt == "uri":
+        return f"https://example.com/{name or 'link'}"
+    if fmt == "date":
+        return "2025-01-01"
+    if name in ("body", "description", "overall_summary", "summary"):
+        value = "\n".join(_text(rng, 18) for _ in range(3))
+    else:
+        value = _text(rng, rng.randint(3, 8))
+    if "maxLength" in schema:
+        value = value[:schema["maxLength"]]
+    return value.ljust(schema.get("minLength", 0), "x")
+
+
+def sample(schema: Dict[str, Any], defs: Dict[str, Any], rng: random.Random, name: str = "") -> Any:
+    """A value that validates against the (pydantic-generated) JSON schema."""
+    if "$ref" in schema:
+        return sample(defs[schema["$ref"].split("/")[-1]], defs, rng, name)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [o for o in schema[key] if o.get("type") != "null"] or schema[key]
+            return sample(options[0], defs, rng, name)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if kind == "object":
+        properties = schema.get("properties")
+        if properties:
+            return {key: sample(value, defs, rng, key) for key, value in properties.items()}
+        values = schema.get("additionalProperties")
+        if isinstance(values, dict):
+            return {rng.choice(_WORDS).capitalize(): sample(values, defs, rng, name) for _ in range(2)}
+        return {}
+    if kind == "array":
+        count = max(schema.get("minItems", 0), min(3, schema.get("maxItems", 3)))
+        return [sample(schema.get("items", {}), defs, rng, name) for _ in range(count)]
+    if kind == "integer":
+        return rng.randint(int(schema.get("minimum", 0)), int(schema.get("maximum", 100)))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0), schema.get("maximum", 100)), 1)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+    return _string(schema, name, rng)
+
+
+class SchemaFakeChatModel(BaseChatModel):
+    """
+    A local stand-in for the chat model. It answers every prompt that carries
+    JsonOutputParser format instructions with a JSON object valid for that
+    schema, so the chains, parsers and caches run unchanged.
+
+    Output depends only on the prompt and the seed. Latency is simulated:
+    `latency` (plus up to `jitter`) seconds before the first token, then
+    `tokens_per_second` for the rest; 0 means instant.
+    """
+    model: str = "fake"
+    latency: float = 0.0
+    jitter: float = 0.0
+    tokens_per_second: float = 0.0
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "schema-fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "seed": self.seed}
+
+    def respond(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        schema = find_schema(prompt)
+        if schema is None:
+            return "{}"
+        rng = random.Random(content_hash(self.seed, prompt))
+        return json.dumps(sample(schema, schema.get("$defs", {}), rng))
+
+    def _first_token_delay(self) -> float:
+        return self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    @staticmethod
+    def _tokens(text: str) -> List[str]:
+        return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+    def _result(self, messages: List[BaseMessage], text: str) -> ChatResult:
+        input_tokens = sum(len(str(m.content)) for m in messages) // CHARS_PER_TOKEN
+        output_tokens = len(self._tokens(text))
+        message = AIMessage(content=text, usage_metadata={
+            "input_tokens": input_tokens, "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = self.respond(messages)
+        time.sleep(self._first_token_delay() + self._token_delay() * max(0, len(self._tokens(text)) - 1))
+        return self._result(messages, text)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = self.respond(messages)
+        await asyncio.sleep(self._first_token_delay() + self._token_delay() * max(0, len(self._tokens(text)) - 1))
+        return self._result(messages, text)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self._first_token_delay())
+        for i, token in enumerate(self._tokens(self.respond(messages))):
+            if i:
+                time.sleep(self._token_delay())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._first_token_delay())
+        for i, token in enumerate(self._tokens(self.respond(messages))):
+            if i:
+                await asyncio.sleep(self._token_delay())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
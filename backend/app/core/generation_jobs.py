@@ -0,0 +1,93 @@
+import hashlib
+import os
+import time
+from typing import Any, Dict
+
+from loguru import logger
+
+from app.core.cache import content_hash
+from app.core.email_generator import EmailGenerator
+from app.core.job_queue import JOB_SPOOL_DIR, JOB_SPOOL_GRACE, JOB_WORKERS, JobQueue, JobWorkerPool
+from app.tools.scrape_cache import canonicalize_url
+
+EMAIL_JOB = 'generate-email'
+
+
+def spool_resume(contents: bytes, spool_dir: str = JOB_SPOOL_DIR) -> str:
+    """
+    Stores an uploaded resume under its SHA-256 so queued jobs survive
+    restarts and identical uploads share one file. Returns the path.
+    """
+    os.makedirs(spool_dir, exist_ok=True)
+    path = os.path.join(spool_dir, hashlib.sha256(contents).hexdigest() + '.pdf')
+    try:
+        # A reused file counts as fresh, so purge_spool leaves it to the job about to be submitted.
+        os.utime(path)
+    except FileNotFoundError:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(contents)
+        os.replace(tmp_path, path)
+    return path
+
+
+def purge_spool(queue: JobQueue, spool_dir: str = JOB_SPOOL_DIR, grace: float = JOB_SPOOL_GRACE) -> int:
+    """
+    Deletes the spooled resumes (personal data) that no stored job refers
+    to any more, once they are older than grace. Returns how many.
+    """
+    referenced = {os.path.basename(path) for path in queue.payload_values('resume_path')}
+    try:
+        names = os.listdir(spool_dir)
+    except FileNotFoundError:
+        return 0
+    cutoff = time.time() - grace
+    removed = 0
+    for name in names:
+        if name in referenced:
+            continue
+        path = os.path.join(spool_dir, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def purge_finished_jobs(queue: JobQueue, spool_dir: str = JOB_SPOOL_DIR) -> None:
+    """Deletes finished jobs past JOB_RESULT_TTL, then the inputs only they used."""
+    jobs = queue.purge_finished()
+    files = purge_spool(queue, spool_dir)
+    if jobs or files:
+        logger.info(f"Purged {jobs} finished jobs and {files} spooled resumes.")
+
+
+def email_job_payload(resume_path: str, jd_url: str | None, jd_text: str | None,
+                      recruiter_url: str | None) -> Dict[str, Any]:
+    return {'resume_path': resume_path, 'jd_url': jd_url, 'jd_text': jd_text, 'recruiter_url': recruiter_url}
+
+
+def email_job_dedupe_key(payload: Dict[str, Any]) -> str:
+    """Identical resume, JD and recruiter submissions map to the same job."""
+    jd_url = canonicalize_url(payload['jd_url']) if payload.get('jd_url') else None
+    jd_text = ' '.join(payload['jd_text'].split()) if payload.get('jd_text') else None
+    return content_hash(EMAIL_JOB, os.path.basename(payload['resume_path']), jd_url, jd_text, payload.get('recruiter_url'))
+
+
+def create_worker_pool(queue: JobQueue, generator: EmailGenerator, concurrency: int = JOB_WORKERS) -> JobWorkerPool:
+    async def generate_email(payload: Dict[str, Any]) -> Dict[str, Any]:
+        email = await generator.agenerate(
+            resume=payload['resume_path'],
+            jd_url=payload.get('jd_url'),
+            jd_text=payload.get('jd_text'),
+            recruiter_url=payload.get('recruiter_url'),
+        )
+        # Same shape as the synchronous /api/v1/generate-email response.
+        return {'email': email}
+
+    return JobWorkerPool(
+        queue, {EMAIL_JOB: generate_email}, concurrency=concurrency,
+        housekeeping=lambda: purge_finished_jobs(queue),
+    )
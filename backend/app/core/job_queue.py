@@ -0,0 +1,323 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+JOB_QUEUE_DB = os.getenv('JOB_QUEUE_DB', './data/jobs.sqlite3')
+JOB_SPOOL_DIR = os.getenv('JOB_SPOOL_DIR', './data/job_inputs')
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+# A running job whose lease is not renewed within this window is assumed to
+# belong to a dead worker and is handed to another one.
+JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', '120'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+JOB_TIMEOUT = float(os.getenv('JOB_TIMEOUT', '300'))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1'))
+# Finished jobs are kept (and served to duplicate submissions) this long.
+JOB_RESULT_TTL = float(os.getenv('JOB_RESULT_TTL', str(24 * 3600)))
+# How often the workers purge expired jobs and the inputs only they used.
+JOB_PURGE_INTERVAL = float(os.getenv('JOB_PURGE_INTERVAL', '600'))
+# Spooled inputs younger than this are kept even when no job refers to them
+# yet (the upload is written before its job is submitted).
+JOB_SPOOL_GRACE = float(os.getenv('JOB_SPOOL_GRACE', '600'))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+TERMINAL_STATES = (SUCCEEDED, FAILED)
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str
+    payload: Dict[str, Any]
+    dedupe_key: Optional[str] = None
+    result: Any = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def public(self) -> Dict[str, Any]:
+        """The job as returned by the API (without its internal payload)."""
+        data = asdict(self)
+        del data['payload'], data['dedupe_key']
+        return data
+
+
+class JobQueue:
+    """
+    Durable job queue in a local SQLite database (WAL mode), safe to share
+    between API and worker processes on the same host.
+
+    Workers claim a job with a time-limited lease and renew it while they
+    work; jobs whose lease lapses (the worker died or was restarted) are
+    claimed again, up to JOB_MAX_ATTEMPTS times.
+    """
+    _COLUMNS = (
+        "id, kind, status, payload, dedupe_key, result, error, attempts, created_at, started_at, finished_at"
+    )
+
+    def __init__(self, path: str = JOB_QUEUE_DB, lease_seconds: float = JOB_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.__lock = Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        with self.__lock:
+            self.__conn.execute("PRAGMA journal_mode=WAL")
+            self.__conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, payload TEXT NOT NULL, "
+                "dedupe_key TEXT, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL, lease_expires_at REAL)"
+            )
+            self.__conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            self.__conn.execute("CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key)")
+
+    def _row_to_job(self, row: Tuple) -> Job:
+        (job_id, kind, status, payload, dedupe_key, result, error, attempts,
+         created_at, started_at, finished_at) = row
+        return Job(
+            id=job_id, kind=kind, status=status, payload=json.loads(payload), dedupe_key=dedupe_key,
+            result=json.loads(result) if result is not None else None, error=error, attempts=attempts,
+            created_at=created_at, started_at=started_at, finished_at=finished_at,
+        )
+
+    def submit(self, kind: str, payload: Dict[str, Any], dedupe_key: str | None = None) -> Tuple[Job, bool]:
+        """
+        Enqueues a job and returns (job, created). When dedupe_key matches a
+        job that is queued, running or succeeded within JOB_RESULT_TTL, that
+        job is returned instead and created is False.
+        """
+        now = time.time()
+        with self.__lock:
+            self.__conn.execute("BEGIN IMMEDIATE")
+            try:
+                if dedupe_key:
+                    row = self.__conn.execute(
+                        f"SELECT {self._COLUMNS} FROM jobs WHERE dedupe_key = ? "
+                        "AND (status IN (?, ?) OR (status = ? AND finished_at > ?)) "
+                        "ORDER BY created_at DESC LIMIT 1",
+                        (dedupe_key, QUEUED, RUNNING, SUCCEEDED, now - JOB_RESULT_TTL),
+                    ).fetchone()
+                    if row is not None:
+                        self.__conn.execute("COMMIT")
+                        return self._row_to_job(row), False
+                job = Job(id=uuid.uuid4().hex, kind=kind, status=QUEUED, payload=payload,
+                          dedupe_key=dedupe_key, created_at=now)
+                self.__conn.execute(
+                    "INSERT INTO jobs (id, kind, status, payload, dedupe_key, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job.id, kind, QUEUED, json.dumps(payload), dedupe_key, now),
+                )
+                self.__conn.execute("COMMIT")
+                return job, True
+            except BaseException:
+                self.__conn.execute("ROLLBACK")
+                raise
+
+    def get(self, job_id: str) -> Job | None:
+        with self.__lock:
+            row = self.__conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, kinds: List[str]) -> Job | None:
+        """Leases the oldest runnable job of the given kinds, or returns None."""
+        now = time.time()
+        placeholders = ", ".join("?" for _ in kinds)
+        with self.__lock:
+            self.__conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs abandoned by a dead worker too many times are failed for good.
+                self.__conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                    "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                    (FAILED, "Job was abandoned by its worker too many times.", now, RUNNING, now, self.max_attempts),
+                )
+                row = self.__conn.execute(
+                    f"SELECT {self._COLUMNS} FROM jobs WHERE kind IN ({placeholders}) "
+                    "AND (status = ? OR (status = ? AND lease_expires_at < ?)) "
+                    "ORDER BY created_at LIMIT 1",
+                    (*kinds, QUEUED, RUNNING, now),
+                ).fetchone()
+                if row is None:
+                    self.__conn.execute("COMMIT")
+                    return None
+                job = self._row_to_job(row)
+                if job.status == RUNNING:
+                    logger.warning(f"Reclaiming job {job.id} after its lease expired.")
+                job.status, job.attempts, job.started_at = RUNNING, job.attempts + 1, now
+                self.__conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = ?, started_at = ?, lease_expires_at = ? WHERE id = ?",
+                    (RUNNING, job.attempts, now, now + self.lease_seconds, job.id),
+                )
+                self.__conn.execute("COMMIT")
+                return job
+            except BaseException:
+                self.__conn.execute("ROLLBACK")
+                raise
+
+    def renew(self, job_id: str) -> None:
+        with self.__lock:
+            self.__conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ?",
+                (time.time() + self.lease_seconds, job_id, RUNNING),
+            )
+
+    def complete(self, job_id: str, result: Any) -> None:
+        with self.__lock:
+            self.__conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                (SUCCEEDED, json.dumps(result), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self.__lock:
+            self.__conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                (FAILED, error, time.time(), job_id),
+            )
+
+    def release(self, job_id: str) -> None:
+        """Puts a running job back in the queue (e.g. on shutdown) without counting the attempt."""
+        with self.__lock:
+            self.__conn.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), lease_expires_at = NULL "
+                "WHERE id = ? AND status = ?",
+                (QUEUED, job_id, RUNNING),
+            )
+
+    def purge_finished(self, older_than: float = JOB_RESULT_TTL) -> int:
+        with self.__lock:
+            cursor = self.__conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (*TERMINAL_STATES, time.time() - older_than),
+            )
+            return cursor.rowcount
+
+    def payload_values(self, field: str) -> Set[Any]:
+        """The distinct values of a payload field across the stored jobs."""
+        with self.__lock:
+            rows = self.__conn.execute(
+                "SELECT DISTINCT json_extract(payload, ?) FROM jobs", (f"$.{field}",)
+            ).fetchall()
+        return {value for (value,) in rows if value is not None}
+
+    def stats(self) -> Dict[str, int]:
+        with self.__lock:
+            rows = self.__conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__conn.close()
+
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class JobWorkerPool:
+    """
+    Runs queued jobs on `concurrency` asyncio workers. Handlers map a job
+    kind to a coroutine taking the job payload and returning a
+    JSON-serialisable result. notify() wakes idle workers right away after
+    an in-process submit; jobs submitted by other processes are picked up
+    within JOB_POLL_INTERVAL. housekeeping, if given, runs in a thread from
+    the poll loop at most once per housekeeping_interval (e.g. to purge
+    expired jobs).
+    """
+    def __init__(self, queue: JobQueue, handlers: Dict[str, JobHandler], concurrency: int = JOB_WORKERS,
+                 poll_interval: float = JOB_POLL_INTERVAL, timeout: float = JOB_TIMEOUT,
+                 housekeeping: Callable[[], Any] | None = None,
+                 housekeeping_interval: float = JOB_PURGE_INTERVAL) -> None:
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.housekeeping = housekeeping
+        self.housekeeping_interval = housekeeping_interval
+        self.__next_housekeeping = 0.0
+        self.counters = {"completed": 0, "failed": 0, "housekeeping_runs": 0}
+        self.__wake = asyncio.Event()
+        self.__tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self.__tasks:
+            return
+        self.__tasks = [asyncio.create_task(self._work(i)) for i in range(self.concurrency)]
+        logger.info(f"Started {self.concurrency} job workers.")
+
+    def notify(self) -> None:
+        self.__wake.set()
+
+    async def stop(self) -> None:
+        """Cancels the workers; jobs they were running go back to the queue."""
+        for task in self.__tasks:
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__tasks = []
+
+    async def _work(self, worker: int) -> None:
+        kinds = list(self.handlers)
+        while True:
+            await self._housekeep()
+            job = await asyncio.to_thread(self.queue.claim, kinds)
+            if job is None:
+                self.__wake.clear()
+                try:
+                    await asyncio.wait_for(self.__wake.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+                continue
+            await self._run(worker, job)
+
+    async def _run(self, worker: int, job: Job) -> None:
+        logger.info(f"Worker {worker} running job {job.id} ({job.kind}, attempt {job.attempts}).")
+        # Like claim, every queue write goes through a thread: with worker
+        # processes sharing the database it can wait on SQLite's busy timeout.
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            result = await asyncio.wait_for(self.handlers[job.kind](job.payload), timeout=self.timeout)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.queue.release, job.id)
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e!r}")
+            await asyncio.to_thread(self.queue.fail, job.id, str(e) or type(e).__name__)
+            self.counters["failed"] += 1
+        else:
+            await asyncio.to_thread(self.queue.complete, job.id, result)
+            self.counters["completed"] += 1
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            await asyncio.to_thread(self.queue.renew, job_id)
+
+    async def _housekeep(self) -> None:
+        """Runs housekeeping if it is due; only one worker picks up each run."""
+        if self.housekeeping is None or time.monotonic() < self.__next_housekeeping:
+            return
+        self.__next_housekeeping = time.monotonic() + self.housekeeping_interval
+        try:
+            await asyncio.to_thread(self.housekeeping)
+            self.counters["housekeeping_runs"] += 1
+        except Exception as e:
+            logger.error(f"Job housekeeping failed: {e!r}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": len(self.__tasks), **self.counters, "queue": self.queue.stats()}
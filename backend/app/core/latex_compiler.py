@@ -0,0 +1,393 @@
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List
+
+from loguru import logger
+
+from app.core.cache import SingleFlight, TieredCache
+from app.core.telemetry import span
+
+LATEX_ENGINE = os.getenv('LATEX_ENGINE', 'pdflatex')
+# Concurrent compiles; each one is a pdflatex process of its own.
+LATEX_WORKERS = int(os.getenv('LATEX_WORKERS', str(min(2, os.cpu_count() or 1))))
+# Compiles allowed in flight (running + queued) before check_capacity() refuses more.
+LATEX_MAX_PENDING = int(os.getenv('LATEX_MAX_PENDING', str(max(1, LATEX_WORKERS) * 4)))
+LATEX_TIMEOUT = float(os.getenv('LATEX_TIMEOUT', '60'))
+# Per-job scratch directories; tmpfs keeps the .aux/.log/.pdf churn off the disk.
+LATEX_WORK_DIR = os.getenv('LATEX_WORK_DIR') or ('/dev/shm' if os.access('/dev/shm', os.W_OK) else None)
+# Finished PDFs, named by the hash of the .tex they were compiled from.
+LATEX_OUTPUT_DIR = os.getenv('LATEX_OUTPUT_DIR', './data/resumes')
+# PDFs (and the sources of failed compiles) not used for this long are
+# deleted, and compile results expire from the cache after the same time.
+LATEX_ARTIFACT_TTL = float(os.getenv('LATEX_ARTIFACT_TTL', str(24 * 3600)))
+LATEX_PURGE_INTERVAL = float(os.getenv('LATEX_PURGE_INTERVAL', '600'))
+LATEX_FORMAT_DIR = os.getenv('LATEX_FORMAT_DIR', './data/latex_formats')
+# Preamble format files are off until checked against the TeX install in use.
+LATEX_PRECOMPILE = os.getenv('LATEX_PRECOMPILE', 'false').lower() in ('1', 'true', 'yes')
+LATEX_MAX_PASSES = int(os.getenv('LATEX_MAX_PASSES', '3'))
+
+_BEGIN_DOCUMENT = '\\begin{document}'
+# Commands whose output depends on the .aux file of an earlier pass.
+_CROSS_REFERENCES = re.compile(
+    r'\\(?:label|ref|pageref|eqref|autoref|cref|Cref|nameref|cite|nocite|tableofcontents|listoffigures|listoftables)\b'
+)
+_DIGEST = re.compile(r'[0-9a-f]{64}')
+_RERUN = re.compile(r'Rerun to get|Label\(s\) may have changed|There were undefined references')
+
+
+class LatexCompilerSaturated(Exception):
+    """Raised by LatexCompiler.check_capacity when too many compiles are in flight."""
+
+
+@dataclass
+class CompileResult:
+    digest: str
+    path: str
+    passes: int = 0
+    seconds: float = 0.0
+    precompiled: bool = False
+    cached: bool = False
+
+
+def tex_digest(tex: str, engine: str = LATEX_ENGINE) -> str:
+    return hashlib.sha256(f"{engine}\0{tex}".encode('utf-8')).hexdigest()
+
+
+def split_preamble(tex: str) -> tuple[str, str] | None:
+    """(preamble, body) around the first \\begin{document}; None if there is none."""
+    index = tex.find(_BEGIN_DOCUMENT)
+    if index < 0:
+        return None
+    return tex[:index], tex[index:]
+
+
+def needs_rerun(tex: str, log: str = "") -> bool:
+    """
+    True if another pass is required: the source uses cross-references, or
+    the last pass's log asks for a rerun. A resume has neither, so it is
+    compiled once.
+    """
+    return bool(_CROSS_REFERENCES.search(tex) or _RERUN.search(log))
+
+
+def _log_tail(log_path: str, lines: int = 30) -> str:
+    try:
+        with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+            return "".join(f.readlines()[-lines:])
+    except OSError:
+        return ""
+
+
+class LatexCompiler:
+    """
+    Turns filled .tex sources into PDFs.
+
+    - The preamble (everything before \\begin{document}) is compiled once
+      into a format file; later jobs load that format and only typeset the
+      body. A format that fails to build or load is dropped and those jobs
+      compile the full source instead.
+    - A job runs one pass, and more only when needs_rerun() says so.
+    - Jobs run in their own scratch directory under work_dir, on `workers`
+      threads; jobs waiting for a thread count towards max_pending.
+    - Output is written to output_dir/<sha256 of the .tex>.pdf, so equal
+      sources share one file and concurrent jobs never overwrite each other.
+      Results are cached by that hash, and identical concurrent jobs run once.
+      Files in output_dir unused for artifact_ttl are deleted.
+    """
+    def __init__(
+        self,
+        engine: str = LATEX_ENGINE,
+        workers: int = LATEX_WORKERS,
+        max_pending: int = LATEX_MAX_PENDING,
+        work_dir: str | None = LATEX_WORK_DIR,
+        output_dir: str = LATEX_OUTPUT_DIR,
+        format_dir: str = LATEX_FORMAT_DIR,
+        precompile: bool = LATEX_PRECOMPILE,
+        timeout: float = LATEX_TIMEOUT,
+        cache: TieredCache | None = None,
+        artifact_ttl: float = LATEX_ARTIFACT_TTL,
+        purge_interval: float = LATEX_PURGE_INTERVAL,
+    ) -> None:
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.work_dir = work_dir
+        self.output_dir = os.path.abspath(output_dir)
+        self.format_dir = os.path.abspath(format_dir)
+        self.precompile = precompile
+        self.timeout = timeout
+        self.cache = cache or TieredCache.from_env('LATEX', maxsize=512, ttl=artifact_ttl)
+        self.artifact_ttl = artifact_ttl
+        self.purge_interval = purge_interval
+        self.__next_purge = 0.0
+        self.__lock = threading.Lock()
+        self.__format_locks: Dict[str, threading.Lock] = {}
+        self.__broken_formats: set[str] = set()
+        self.__inflight = SingleFlight()
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__pending = 0
+        self.counters = {
+            "compiles": 0, "passes": 0, "cache_hits": 0, "artifact_hits": 0, "failures": 0,
+            "format_builds": 0, "format_fallbacks": 0, "rejected": 0, "peak_pending": 0, "artifacts_purged": 0,
+        }
+
+    # --- admission ---
+
+    def saturated(self) -> bool:
+        return self.__pending >= self.max_pending
+
+    def check_capacity(self) -> None:
+        if self.saturated():
+            self.counters["rejected"] += 1
+            raise LatexCompilerSaturated(f"LaTeX compiler is saturated ({self.__pending} compiles pending).")
+
+    def __enter_task(self) -> None:
+        with self.__lock:
+            self.__pending += 1
+            self.counters["peak_pending"] = max(self.counters["peak_pending"], self.__pending)
+
+    def __exit_task(self) -> None:
+        with self.__lock:
+            self.__pending -= 1
+
+    # --- format files ---
+
+    def _format_name(self, preamble: str) -> str:
+        return "resume-" + hashlib.sha256(f"{self.engine}\0{preamble}".encode('utf-8')).hexdigest()[:16]
+
+    def _run(self, args: List[str], cwd: str, env: Dict[str, str] | None = None) -> subprocess.CompletedProcess:
+        try:
+            return subprocess.run(
+                [self.engine, *args], cwd=cwd, env=env, timeout=self.timeout,
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='replace',
+            )
+        except FileNotFoundError:
+            raise RuntimeError(f"{self.engine} is not installed.") from None
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"{self.engine} did not finish within {self.timeout:.0f}s.") from None
+
+    def _format_for(self, preamble: str) -> str | None:
+        """Name of a format file holding `preamble`, building it on first use; None if unavailable."""
+        if not self.precompile:
+            return None
+        name = self._format_name(preamble)
+        if name in self.__broken_formats:
+            return None
+        path = os.path.join(self.format_dir, f"{name}.fmt")
+        if os.path.exists(path):
+            return name
+        with self.__lock:
+            lock = self.__format_locks.setdefault(name, threading.Lock())
+        with lock:
+            if os.path.exists(path):
+                return name
+            os.makedirs(self.format_dir, exist_ok=True)
+            with span("latex.format"), tempfile.TemporaryDirectory(prefix="latex-fmt-", dir=self.work_dir) as tmpdir:
+                with open(os.path.join(tmpdir, f"{name}.tex"), "w", encoding="utf-8") as f:
+                    f.write(preamble + "\n\\dump\n")
+                try:
+                    proc = self._run(
+                        ["-ini", "-interaction=nonstopmode", "-halt-on-error", f"-jobname={name}", f"&{self.engine}", f"{name}.tex"],
+                        cwd=tmpdir,
+                    )
+                except RuntimeError as e:
+                    proc = None
+                    logger.warning(f"Could not build the LaTeX format {name}: {e}")
+                built = os.path.join(tmpdir, f"{name}.fmt")
+                if proc is None or proc.returncode != 0 or not os.path.exists(built):
+                    if proc is not None:
+                        logger.warning(f"Could not build the LaTeX format {name}; compiling full sources.\n{proc.stdout[-2000:]}")
+                    self.__broken_formats.add(name)
+                    return None
+                shutil.copyfile(built, path + ".tmp")
+                os.replace(path + ".tmp", path)
+        self.counters["format_builds"] += 1
+        logger.info(f"Built LaTeX format {name} for a {len(preamble)}-character preamble.")
+        return name
+
+    # --- compiling ---
+
+    def _passes(self, tmpdir: str, source: str, args: List[str], env: Dict[str, str] | None) -> tuple[subprocess.CompletedProcess, int]:
+        passes = 0
+        while True:
+            proc = self._run([*args, "-interaction=nonstopmode", "-halt-on-error", "-jobname=resume", "resume.tex"], cwd=tmpdir, env=env)
+            passes += 1
+            if proc.returncode != 0 or passes >= LATEX_MAX_PASSES:
+                return proc, passes
+            if not needs_rerun(source, _log_tail(os.path.join(tmpdir, "resume.log"), lines=200)):
+                return proc, passes
+
+    def __compile_in(self, tmpdir: str, tex: str) -> tuple[subprocess.CompletedProcess, int, bool]:
+        parts = split_preamble(tex)
+        fmt = self._format_for(parts[0]) if parts else None
+        if fmt is not None:
+            with open(os.path.join(tmpdir, "resume.tex"), "w", encoding="utf-8") as f:
+                f.write(parts[1])
+            # The trailing separator keeps kpathsea's default format search path.
+            env = {**os.environ, "TEXFORMATS": self.format_dir + os.pathsep}
+            proc, passes = self._passes(tmpdir, tex, [f"-fmt={fmt}"], env)
+            if proc.returncode == 0:
+                return proc, passes, True
+            # Fails the same way with the full source if the body is at fault; that run decides.
+            self.counters["format_fallbacks"] += 1
+            logger.warning(f"Compiling with the LaTeX format {fmt} failed; retrying with the full source.")
+            for name in os.listdir(tmpdir):
+                os.remove(os.path.join(tmpdir, name))
+        with open(os.path.join(tmpdir, "resume.tex"), "w", encoding="utf-8") as f:
+            f.write(tex)
+        proc, passes = self._passes(tmpdir, tex, [], None)
+        if proc.returncode == 0 and fmt is not None:
+            # The body is fine, so the format is what broke (e.g. after a TeX Live update).
+            self.__broken_formats.add(fmt)
+        return proc, passes, False
+
+    def artifact_path(self, digest: str) -> str | None:
+        """Where the PDF for a digest is stored; None if the digest is malformed."""
+        if not _DIGEST.fullmatch(digest):
+            return None
+        return os.path.join(self.output_dir, f"{digest}.pdf")
+
+    def __compile(self, tex: str, digest: str) -> CompileResult:
+        path = self.artifact_path(digest)
+        if self.__touch(path):
+            # Compiled by an earlier process, or evicted from the cache.
+            self.counters["artifact_hits"] += 1
+            return CompileResult(digest=digest, path=path, cached=True)
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="latex-", dir=self.work_dir) as tmpdir:
+            proc, passes, precompiled = self.__compile_in(tmpdir, tex)
+            self.counters["compiles"] += 1
+            self.counters["passes"] += passes
+            pdf_path = os.path.join(tmpdir, "resume.pdf")
+            if proc.returncode != 0 or not os.path.exists(pdf_path):
+                self.counters["failures"] += 1
+                os.makedirs(self.output_dir, exist_ok=True)
+                failed_path = os.path.join(self.output_dir, f"failed-{digest}.tex")
+                with open(failed_path, "w", encoding="utf-8") as f:
+                    f.write(tex)
+                logger.error(f"LaTeX compilation failed; source saved to {failed_path}.\n{proc.stdout[-3000:]}")
+                if proc.returncode != 0:
+                    raise RuntimeError("PDF generation failed due to a LaTeX error.")
+                raise RuntimeError("PDF file was not generated by LaTeX.")
+            os.makedirs(self.output_dir, exist_ok=True)
+            # Copy next to the target first: tmpfs and the output directory are different filesystems.
+            partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(pdf_path, partial)
+            os.replace(partial, path)
+        return CompileResult(
+            digest=digest, path=path, passes=passes,
+            seconds=time.perf_counter() - start, precompiled=precompiled,
+        )
+
+    @staticmethod
+    def __touch(path: str) -> bool:
+        """Marks the file as used now (so purge_artifacts keeps it); False if it is gone."""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def __run(self, tex: str, digest: str) -> CompileResult:
+        """One compile job, on a compiler thread: a cache hit, or a (shared) compile."""
+        self.__maybe_purge()
+        cached = self.cache.get(digest)
+        if cached and self.__touch(cached["path"]):
+            self.counters["cache_hits"] += 1
+            return CompileResult(**{**cached, "cached": True})
+        result = self.__inflight.do(digest, lambda: self.__compile(tex, digest))
+        self.cache.set(digest, {**asdict(result), "cached": False})
+        return result
+
+    def compile(self, tex: str) -> CompileResult:
+        """Compiles tex (or reuses an earlier result) and returns where the PDF is. Raises RuntimeError on failure."""
+        digest = tex_digest(tex, self.engine)
+        self.__enter_task()
+        try:
+            return self._get_executor().submit(self.__run, tex, digest).result()
+        finally:
+            self.__exit_task()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="latex")
+            return self.__executor
+
+    async def acompile(self, tex: str) -> CompileResult:
+        """Async counterpart of compile(); the job runs on the compiler's own threads."""
+        digest = tex_digest(tex, self.engine)
+        # Counted from here, not from when a thread picks it up, so queued jobs hit max_pending.
+        self.__enter_task()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.__run, tex, digest)
+        finally:
+            self.__exit_task()
+
+    # --- cleanup ---
+
+    def purge_artifacts(self, older_than: float | None = None) -> int:
+        """
+        Deletes PDFs, failed-*.tex sources and leftover partial copies in
+        output_dir that were not used for older_than (default artifact_ttl)
+        seconds. Returns how many.
+        """
+        cutoff = time.time() - (self.artifact_ttl if older_than is None else older_than)
+        try:
+            names = os.listdir(self.output_dir)
+        except FileNotFoundError:
+            return 0
+        removed = 0
+        for name in names:
+            if not name.endswith((".pdf", ".tex", ".tmp")):
+                continue
+            path = os.path.join(self.output_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        self.counters["artifacts_purged"] += removed
+        if removed:
+            logger.info(f"Deleted {removed} LaTeX artifacts unused for {self.artifact_ttl:.0f}s.")
+        return removed
+
+    def __maybe_purge(self) -> None:
+        with self.__lock:
+            now = time.monotonic()
+            if now < self.__next_purge:
+                return
+            self.__next_purge = now + self.purge_interval
+        try:
+            self.purge_artifacts()
+        except OSError as e:
+            logger.warning(f"Could not purge LaTeX artifacts: {e}")
+
+    def warm(self, tex_template: str) -> None:
+        """Builds the format for a template's preamble now rather than on the first compile."""
+        parts = split_preamble(tex_template)
+        if parts and shutil.which(self.engine):
+            self._format_for(parts[0])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers, "max_pending": self.max_pending, "pending": self.__pending,
+            "precompile": self.precompile, **self.counters, "cache": self.cache.report(),
+        }
+
+    def close(self) -> None:
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.cache.close()
@@ -0,0 +1,60 @@
+import os
+from typing import Callable, Dict
+
+from langchain_core.language_models import BaseChatModel
+
+# Which registered provider builds the chat models. 'fake' answers locally
+# with schema-valid JSON, for benchmarks and load tests without network calls.
+LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'google')
+# Overrides the model each component asks for, e.g. to pin one Gemini version everywhere.
+LLM_MODEL = os.getenv('LLM_MODEL')
+
+FAKE_LLM_LATENCY = float(os.getenv('FAKE_LLM_LATENCY', '0'))
+FAKE_LLM_JITTER = float(os.getenv('FAKE_LLM_JITTER', '0'))
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv('FAKE_LLM_TOKENS_PER_SECOND', '0'))
+FAKE_LLM_SEED = int(os.getenv('FAKE_LLM_SEED', '0'))
+
+ProviderFactory = Callable[[str], BaseChatModel]
+
+_PROVIDERS: Dict[str, ProviderFactory] = {}
+
+
+def register_provider(name: str, factory: ProviderFactory) -> None:
+    """Makes a provider selectable with LLM_PROVIDER=<name>. The factory gets the model name."""
+    _PROVIDERS[name] = factory
+
+
+def available_providers() -> list:
+    return sorted(_PROVIDERS)
+
+
+def create_llm(default_model: str, provider: str | None = None) -> BaseChatModel:
+    """
+    Builds the chat model for a component. default_model is what the
+    component would use on Gemini; LLM_MODEL replaces it when set.
+    """
+    name = provider or LLM_PROVIDER
+    factory = _PROVIDERS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown LLM provider '{name}'. Available: {', '.join(available_providers())}")
+    return factory(LLM_MODEL or default_model)
+
+
+def _google(model: str) -> BaseChatModel:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(model=model, google_api_key=os.getenv('GOOGLE_API_KEY'))
+
+
+def _fake(model: str) -> BaseChatModel:
+    from app.core.fake_llm import SchemaFakeChatModel
+    return SchemaFakeChatModel(
+        model=f"fake:{model}",
+        latency=FAKE_LLM_LATENCY,
+        jitter=FAKE_LLM_JITTER,
+        tokens_per_second=FAKE_LLM_TOKENS_PER_SECOND,
+        seed=FAKE_LLM_SEED,
+    )
+
+
+register_provider('google', _google)
+register_provider('fake', _fake)
@@ -55,3 +55,17 @@ class ReferralAndReview(BaseModel):
     )
     review: StructuredReview = Field(description="A structured review of the resume with actionable suggestions to improve it for the job description.")
 
+
+# --- Per-call Schemas ---
+# The message and the review are generated by separate LLM calls and merged
+# into EmailAndReview / ReferralAndReview.
+
+class EmailDraft(BaseModel):
+    """The JSON output of the email drafting call."""
+    email: StructuredEmail = Field(description="The crafted professional email, broken down into its components.")
+
+class ReferralDraft(BaseModel):
+    """The JSON output of the referral drafting call."""
+    referral_message: Union[StructuredEmail, StructuredLinkedInMessage] = Field(
+        description="The crafted professional referral message. Use StructuredEmail for 'email' requests and StructuredLinkedInMessage for 'linkedin message' requests."
+    )
@@ -0,0 +1,19 @@
+from functools import lru_cache
+
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def format_instructions(schema: type[BaseModel]) -> str:
+    """
+    JsonOutputParser's format instructions for schema. Serialising the JSON
+    schema is the costly part of building a prompt, so it is done once per
+    model class (i.e. once per schema version in a process).
+    """
+    return JsonOutputParser(pydantic_object=schema).get_format_instructions()
+
+
+def escape_braces(text: str) -> str:
+    """Makes text a literal inside a prompt template."""
+    return text.replace("{", "{{").replace("}", "}}")
@@ -1,42 +1,80 @@
-import subprocess
-import tempfile
+import asyncio
 import os
 import json
 import re
-import shutil
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Iterable, List
 from app.core.models.resume import Resume
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.language_models import BaseChatModel
+from app.core.cpu_pool import CPUPool
+from app.core.latex_compiler import CompileResult, LatexCompiler
+from app.core.llm_providers import create_llm
+from app.core.prompts import format_instructions
+from app.core.telemetry import instrument_llm, span, traced
 from dotenv import load_dotenv
 
+RESUME_TEMPLATE_PATH = os.getenv('RESUME_TEMPLATE_PATH', os.path.join(os.path.dirname(__file__), 'resume_template.tex'))
+# Rewriting a whole resume takes the LLM longer than an email.
+RESUME_LLM_TIMEOUT = float(os.getenv('RESUME_LLM_TIMEOUT', '120'))
+# Generations in flight (LLM + compile) before /generate-resume answers 429.
+RESUME_GENERATION_MAX_PENDING = int(os.getenv('RESUME_GENERATION_MAX_PENDING', '8'))
+
+
+# Compiled once per process, with the Resume schema's format instructions bound.
+RESUME_PROMPT = ChatPromptTemplate.from_messages([
+    (
+        "system",
+        "You are an expert career assistant and resume builder. "
+        "Given the resume text and resume review JSON, "
+        "create a new refined resume structured in the required format. "
+        # MODIFIED PROMPT: Instruct the LLM to provide raw text to prevent double-escaping
+        "IMPORTANT: Provide all text content as plain, raw strings without any LaTeX escaping. The system will handle all escaping."
+    ),
+    (
+        "human",
+        "{format_instructions}\n\n"
+        "resume text : \n{resume_text}\n\n"
+        "review json : \n{review}"
+    )
+]).partial(format_instructions=format_instructions(Resume))
+
+# Every special character maps to its LaTeX form in one pass, so the
+# backslashes a replacement inserts are never escaped again.
+_LATEX_ESCAPES = {
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+    "\\": r"\textbackslash{}",
+    "–": r"--",  # en dash
+    "—": r"---",  # em dash
+}
+_LATEX_SPECIALS = re.compile("[" + re.escape("".join(_LATEX_ESCAPES)) + "]")
+
+# The template's <KEY> placeholders, filled from render_resume().
+PLACEHOLDERS = (
+    "NAME", "PHONE", "EMAIL", "GITHUB", "LINKEDIN", "LEETCODE",
+    "SUMMARY", "SKILLS", "EXPERIENCE", "PROJECTS", "EDUCATION",
+)
+
+
+def _escaped(match: re.Match) -> str:
+    return _LATEX_ESCAPES[match.group()]
+
 
 def escape_latex(text: str) -> str:
     """Escape special LaTeX characters in text."""
     if not text:
         return ""
-    replacements = {
-        "&": r"\&",
-        "%": r"\%",
-        "$": r"\$",
-        "#": r"\#",
-        "_": r"\_",
-        "{": r"\{",
-        "}": r"\}",
-        "~": r"\textasciitilde{}",
-        "^": r"\textasciicircum{}",
-        "\\": r"\textbackslash{}",
-        "–": r"--",  # en dash
-        "—": r"---",  # em dash
-    }
-    # Important: Only apply replacements if the text isn't already escaped
-    # This is a simple check; the prompt fix is more robust.
-    for old, new in replacements.items():
-        # Avoid double-escaping backslashes
-        if old == "\\" and new in text:
-            continue
-        text = text.replace(old, new)
-    return text
+    return _LATEX_SPECIALS.sub(_escaped, text)
 
 
 def render_resume(resume: Resume) -> dict:
@@ -66,21 +104,24 @@ def render_resume(resume: Resume) -> dict:
         "\n\\resumeItemListEnd"
     )
 
-    experience_block = ""
+    experience_parts = []
     for exp in resume.experience:
-        experience_block += f"\\resumeSubheading{{{escape_latex(exp.role)}}}{{{escape_latex(exp.date)}}}{{{escape_latex(exp.company)}}}{{}}\n"
-        experience_block += "\\resumeItemListStart\n" + "\n".join([f"\\item {escape_latex(b)}" for b in exp.bullets]) + "\n\\resumeItemListEnd\n"
+        experience_parts.append(f"\\resumeSubheading{{{escape_latex(exp.role)}}}{{{escape_latex(exp.date)}}}{{{escape_latex(exp.company)}}}{{}}\n")
+        experience_parts.append("\\resumeItemListStart\n" + "\n".join([f"\\item {escape_latex(b)}" for b in exp.bullets]) + "\n\\resumeItemListEnd\n")
+    experience_block = "".join(experience_parts)
 
-    project_block = ""
+    project_parts = []
     for p in resume.projects:
         project_title = f"{escape_latex(p.title)} -- {escape_latex(p.subtitle)}"
-        project_block += f"\\resumeSubheading{{{project_title}}}{{{escape_latex(p.date)}}}{{}}{{}}\n"
-        project_block += "\\resumeItemListStart\n" + "\n".join([f"\\item {escape_latex(b)}" for b in p.bullets]) + "\n\\resumeItemListEnd\n"
-        
-    education_block = ""
+        project_parts.append(f"\\resumeSubheading{{{project_title}}}{{{escape_latex(p.date)}}}{{}}{{}}\n")
+        project_parts.append("\\resumeItemListStart\n" + "\n".join([f"\\item {escape_latex(b)}" for b in p.bullets]) + "\n\\resumeItemListEnd\n")
+    project_block = "".join(project_parts)
+
+    education_parts = []
     for e in resume.education:
         degree_line = f"{escape_latex(e.degree)} | CGPA: {escape_latex(e.grade)}"
-        education_block += f"\\resumeSubheading{{{escape_latex(e.institution)}}}{{{escape_latex(e.date)}}}{{{degree_line}}}{{}}\n"
+        education_parts.append(f"\\resumeSubheading{{{escape_latex(e.institution)}}}{{{escape_latex(e.date)}}}{{{degree_line}}}{{}}\n")
+    education_block = "".join(education_parts)
 
     return {
         "NAME": escape_latex(resume.name),
@@ -95,118 +136,175 @@ def render_resume(resume: Resume) -> dict:
         "PROJECTS": project_block,
         "EDUCATION": education_block,
     }
+
+
+class LatexTemplate:
+    """
+    A .tex template parsed once into literal chunks and <KEY> slots.
+    render() is a single join, and inserted values are never scanned for
+    placeholders again. Slots missing from the values are left as they are.
+    """
+    def __init__(self, text: str, keys: Iterable[str] = PLACEHOLDERS):
+        pattern = re.compile("<(" + "|".join(re.escape(key) for key in keys) + ")>")
+        parts = pattern.split(text)
+        self.chunks: List[str] = parts[0::2]
+        self.slots: List[str] = parts[1::2]
+
+    def render(self, values: Dict[str, str]) -> str:
+        out = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            out.append(values[slot] or "" if slot in values else f"<{slot}>")
+            out.append(chunk)
+        return "".join(out)
+
+
+@lru_cache(maxsize=8)
+def parse_template(tex_template: str) -> LatexTemplate:
+    return LatexTemplate(tex_template)
+
+
+def fill_template(tex_template: str, resume: Resume) -> str:
+    """Renders the resume into the template's <KEY> placeholders (pure CPU, safe to run in a worker process)."""
+    return parse_template(tex_template).render(render_resume(resume))
+
+
+class ResumeGenerationSaturated(Exception):
+    """Raised by ResumeGenerator.check_capacity when too many generations are in flight."""
+
+
 class ResumeGenerator:
-    def __init__(self, template_path: str):
+    """
+    Restructures a resume with the LLM and compiles it into a PDF.
+
+    One instance is shared by the app; the LLM client is built on first
+    use. Filling the template runs in the CPU pool. Admission is bounded
+    like the pool's: check_capacity() raises ResumeGenerationSaturated once
+    max_pending generations are in flight or the CPU pool's or the LaTeX
+    compiler's queue is full.
+    """
+    def __init__(
+        self,
+        template_path: str = RESUME_TEMPLATE_PATH,
+        llm: BaseChatModel | None = None,
+        compiler: LatexCompiler | None = None,
+        max_pending: int = RESUME_GENERATION_MAX_PENDING,
+        cpu_pool: CPUPool | None = None,
+    ):
         load_dotenv()
         if not os.path.exists(template_path):
             raise FileNotFoundError(f"Template file not found at: {template_path}")
         self.template_path = template_path
+        with open(template_path, "r", encoding="utf-8") as f:
+            self.template = f.read()
+        self.compiler = compiler or LatexCompiler()
+        self.max_pending = max_pending
+        # Without a pool, rendering runs in a thread.
+        self.cpu_pool = cpu_pool or CPUPool(workers=0)
         self.__resume_parser = JsonOutputParser(pydantic_object=Resume)
-        self.__llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
+        self.__llm = instrument_llm(llm) if llm is not None else None
+        self.__chain = None
+        self.__lock = Lock()
+        self.__pending = 0
+        self.counters = {"requests": 0, "completed": 0, "failed": 0, "rejected": 0, "peak_pending": 0}
 
-    def get_data(self, resume_text: str, review: dict) -> Resume:
-        """Generate structured Resume object from raw text and review."""
-        prompt = ChatPromptTemplate.from_messages([
-            (
-                "system",
-                "You are an expert career assistant and resume builder. "
-                "Given the resume text and resume review JSON, "
-                "create a new refined resume structured in the required format. "
-                # MODIFIED PROMPT: Instruct the LLM to provide raw text to prevent double-escaping
-                "IMPORTANT: Provide all text content as plain, raw strings without any LaTeX escaping. The system will handle all escaping."
-            ),
-            (
-                "human",
-                "{format_instructions}\n\n"
-                "resume text : \n{resume_text}\n\n"
-                "review json : \n{review}"
-            )
-        ])
+    @property
+    def llm(self) -> BaseChatModel:
+        if self.__llm is None:
+            with self.__lock:
+                if self.__llm is None:
+                    self.__llm = instrument_llm(create_llm("gemini-1.5-flash"))
+        return self.__llm
 
+    def saturated(self) -> bool:
+        return self.__pending >= self.max_pending or self.cpu_pool.saturated() or self.compiler.saturated()
+
+    def check_capacity(self) -> None:
+        if self.saturated():
+            self.counters["rejected"] += 1
+            raise ResumeGenerationSaturated(f"Resume generation is saturated ({self.__pending} requests in flight).")
+
+    @property
+    def chain(self):
+        """RESUME_PROMPT | llm | parser, composed on first use and then reused."""
+        if self.__chain is None:
+            llm = self.llm
+            with self.__lock:
+                if self.__chain is None:
+                    self.__chain = RESUME_PROMPT | llm | self.__resume_parser
+        return self.__chain
+
+    def _prepare_data(self, resume_text: str, review: dict):
+        """The resume restructuring chain and its input."""
         input_data = {
             "resume_text": resume_text,
             "review": review,
-            "format_instructions": self.__resume_parser.get_format_instructions(),
         }
+        return self.chain, input_data
 
-        chain = prompt | self.__llm | self.__resume_parser
+    @traced("resume.llm")
+    def get_data(self, resume_text: str, review: dict) -> Resume:
+        """Generate structured Resume object from raw text and review."""
+        chain, input_data = self._prepare_data(resume_text, review)
         result = chain.invoke(input_data)
         return Resume(**result)
 
+    @traced("resume.llm")
+    async def aget_data(self, resume_text: str, review: dict) -> Resume:
+        """Async counterpart of get_data()."""
+        chain, input_data = self._prepare_data(resume_text, review)
+        result = await chain.ainvoke(input_data)
+        return Resume(**result)
+
+    @traced("resume.generate")
     def generate_resume(self, resume: Resume) -> str:
         """Fill LaTeX template with user data and return PDF path."""
-        # This is just a placeholder template for the code to run.
-        # The actual template is loaded from the file path.
-        tex_template = """
-        \\documentclass[a4paper,11pt]{article}
-        % ... Your full template preamble here ...
-        \\begin{document}
-        \\begin{tabularx}{\\linewidth}{@{}L r@{}}
-          \\textbf{\\huge <NAME>} &
-          \\footnotesize{<PHONE> \\quad|\\quad <EMAIL> \\quad|\\quad <GITHUB> \\quad|\\quad <LINKEDIN> \\quad|\\quad <LEETCODE>}
-        \\end{tabularx}
-        
-        \\section{Summary}
-        <SUMMARY>
+        return self.compile_resume(resume).path
 
-        \\section{Technical Skills}
-        <SKILLS>
+    def compile_resume(self, resume: Resume) -> CompileResult:
+        """Fill LaTeX template with user data and compile it (cached by the filled source)."""
+        with span("resume.render"):
+            filled_tex = self.cpu_pool.call(fill_template, self.template, resume)
 
-        \\section{Experience}
-        \\resumeSubHeadingListStart
-        <EXPERIENCE>
-        \\resumeSubHeadingListEnd
+        with span("resume.compile"):
+            return self.compiler.compile(filled_tex)
 
-        \\section{Projects}
-        \\resumeSubHeadingListStart
-        <PROJECTS>
-        \\resumeSubHeadingListEnd
+    def __enter_task(self) -> None:
+        with self.__lock:
+            self.__pending += 1
+            self.counters["requests"] += 1
+            self.counters["peak_pending"] = max(self.counters["peak_pending"], self.__pending)
 
-        \\section{Education}
-        \\resumeSubHeadingListStart
-        <EDUCATION>
-        \\resumeSubHeadingListEnd
+    def __exit_task(self, ok: bool) -> None:
+        with self.__lock:
+            self.__pending -= 1
+            self.counters["completed" if ok else "failed"] += 1
 
-        \\end{document}
+    @traced("resume.generate")
+    async def agenerate(self, resume_text: str, review: dict) -> CompileResult:
         """
+        Restructures the resume and compiles it without blocking the event
+        loop: the LLM call is awaited (at most RESUME_LLM_TIMEOUT seconds),
+        the template is filled in the CPU pool and the compile runs on the
+        compiler's bounded threads.
+        """
+        self.__enter_task()
+        ok = False
+        try:
+            resume = await asyncio.wait_for(self.aget_data(resume_text, review), RESUME_LLM_TIMEOUT)
+            with span("resume.render"):
+                filled_tex = await self.cpu_pool.run(fill_template, self.template, resume)
+            with span("resume.compile"):
+                result = await self.compiler.acompile(filled_tex)
+            ok = True
+            return result
+        finally:
+            self.__exit_task(ok)
+
+    def stats(self) -> dict:
+        return {"pending": self.__pending, "max_pending": self.max_pending, **self.counters}
 
-        with open(self.template_path, "r", encoding="utf-8") as f:
-            tex_template = f.read()
-
-        latex_dict = render_resume(resume)
-
-        filled_tex = tex_template
-        for key, value in latex_dict.items():
-            # Use a more robust replacement to avoid replacing substrings
-            filled_tex = filled_tex.replace(f"<{key}>", value or "")
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tex_path = os.path.join(tmpdir, "resume.tex")
-            with open(tex_path, "w", encoding="utf-8") as f:
-                f.write(filled_tex)
-
-            for _ in range(2):
-                proc = subprocess.run(
-                    ["pdflatex", "-interaction=nonstopmode", tex_path],
-                    cwd=tmpdir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-                )
-
-            if proc.returncode != 0:
-                print("--- LaTeX Compilation Failed ---")
-                print("STDOUT:\n", proc.stdout)
-                print("\nSTDERR:\n", proc.stderr)
-                with open("failed_resume.tex", "w", encoding="utf-8") as f:
-                    f.write(filled_tex)
-                print("\nProblematic .tex file saved as 'failed_resume.tex'")
-                raise RuntimeError("PDF generation failed due to a LaTeX error.")
-
-            pdf_path = os.path.join(tmpdir, "resume.pdf")
-            if os.path.exists(pdf_path):
-                final_path = os.path.abspath("generated_resume.pdf")
-                shutil.move(pdf_path, final_path)
-                return final_path
-            else:
-                raise RuntimeError("PDF file was not generated by LaTeX.")
+    def close(self) -> None:
+        self.compiler.close()
 
 # --- Test Run ---
 if __name__ == "__main__":
@@ -325,8 +423,8 @@ B.Tech in Computer Science Engineering CGPA: 8.0/10
     cleaned_text = cleaned_text.replace('ὑ7', '') # Remove other artifacts
 
     # 2. Initialize the generator and get structured data
-    # Make sure the path to your .tex template is correct
-    generator = ResumeGenerator("C:\\Machine Learning\\my-email-generator\\backend\\app\\core\\resume_template.tex")
+    # Uses app/core/resume_template.tex unless RESUME_TEMPLATE_PATH is set
+    generator = ResumeGenerator()
     
     review_json = json.loads(reviewstr)['review']
     resume_data = generator.get_data(cleaned_text, review_json)
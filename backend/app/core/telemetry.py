@@ -0,0 +1,319 @@
+import asyncio
+import contextlib
+import functools
+import math
+import os
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import LLMResult
+from loguru import logger
+
+# Traces are exported only when a collector endpoint is configured and the
+# opentelemetry-sdk and OTLP exporter packages are installed.
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT')
+OTEL_SERVICE_NAME = os.getenv('OTEL_SERVICE_NAME', 'email-generator-api')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+Labels = Tuple[str, ...]
+# (metric name, type, help, [(labels, value), ...]) as produced by collectors at scrape time.
+GaugeFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, label_names: Labels = ()) -> None:
+        self.name, self.help, self.label_names = name, help, label_names
+        self.__values: Dict[Labels, float] = {}
+        self.__lock = Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        with self.__lock:
+            self.__values[key] = self.__values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self.__values.get(tuple(str(labels.get(n, "")) for n in self.label_names), 0.0)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self.__lock:
+            items = list(self.__values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(dict(zip(self.label_names, key)))} {_format_value(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, label_names: Labels = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.name, self.help, self.label_names = name, help, label_names
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., count, sum]
+        self.__values: Dict[Labels, List[float]] = {}
+        self.__lock = Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        with self.__lock:
+            series = self.__values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self.__values.get(tuple(str(labels.get(n, "")) for n in self.label_names))
+        return int(series[-2]) if series else 0
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self.__lock:
+            items = [(key, list(series)) for key, series in self.__values.items()]
+        for key, series in items:
+            labels = dict(zip(self.label_names, key))
+            for bound, count in zip(self.buckets, series):
+                yield f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {_format_value(count)}"
+            yield f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {_format_value(series[-2])}"
+            yield f"{self.name}_count{_format_labels(labels)} {_format_value(series[-2])}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(series[-1])}"
+
+
+class MetricsRegistry:
+    """
+    A minimal Prometheus registry: counters and histograms updated as work
+    happens, plus collectors that report gauges (cache hit rates, pool
+    sizes) when /metrics is scraped.
+    """
+    def __init__(self) -> None:
+        self.__metrics: List[Counter | Histogram] = []
+        self.__collectors: Dict[str, Callable[[], List[GaugeFamily]]] = {}
+
+    def counter(self, name: str, help: str, label_names: Labels = ()) -> Counter:
+        metric = Counter(name, help, label_names)
+        self.__metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, label_names: Labels = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, label_names, buckets)
+        self.__metrics.append(metric)
+        return metric
+
+    def register_collector(self, name: str, collector: Callable[[], List[GaugeFamily]]) -> None:
+        """Adds (or replaces) a named collector, so an app restarted in-process does not report twice."""
+        self.__collectors[name] = collector
+
+    def unregister_collector(self, name: str) -> None:
+        self.__collectors.pop(name, None)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.__metrics:
+            lines.extend(metric.render())
+        for name, collector in list(self.__collectors.items()):
+            try:
+                families = collector()
+            except Exception as e:
+                logger.error(f"Metrics collector '{name}' failed: {e}")
+                continue
+            for metric_name, kind, help, samples in families:
+                lines.append(f"# HELP {metric_name} {help}")
+                lines.append(f"# TYPE {metric_name} {kind}")
+                lines.extend(f"{metric_name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'emailgen_stage_duration_seconds', 'Time spent in each pipeline stage.', ('stage', 'outcome'),
+)
+LLM_SECONDS = REGISTRY.histogram(
+    'emailgen_llm_request_duration_seconds', 'Latency of chat model calls.', ('model', 'outcome'),
+)
+LLM_TOKENS = REGISTRY.counter(
+    'emailgen_llm_tokens_total', 'Tokens reported by the chat model.', ('model', 'type'),
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    'emailgen_http_request_duration_seconds', 'HTTP request latency by route.', ('method', 'route', 'status'),
+)
+
+_tracer = None
+
+
+def setup_tracing() -> bool:
+    """
+    Exports spans over OTLP/HTTP when OTEL_EXPORTER_OTLP_ENDPOINT is set.
+    Returns False (and spans only feed the Prometheus histograms) otherwise.
+    """
+    global _tracer
+    if _tracer is not None:
+        return True
+    if not OTEL_EXPORTER_OTLP_ENDPOINT:
+        return False
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-sdk / "
+            "opentelemetry-exporter-otlp-proto-http are not installed; traces are not exported."
+        )
+        return False
+    provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("app")
+    logger.info(f"Exporting traces to {OTEL_EXPORTER_OTLP_ENDPOINT}.")
+    return True
+
+
+def shutdown_tracing() -> None:
+    global _tracer
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, 'shutdown'):
+        provider.shutdown()
+    _tracer = None
+
+
+@contextlib.contextmanager
+def span(stage: str, **attributes: Any) -> Iterator[None]:
+    """
+    Times a pipeline stage into emailgen_stage_duration_seconds and, when
+    tracing is set up, records it as an OpenTelemetry span. Works around
+    awaits too, since OpenTelemetry keeps the current span in a contextvar.
+    """
+    otel_span = _tracer.start_as_current_span(stage, attributes=attributes) if _tracer is not None else contextlib.nullcontext()
+    outcome = "ok"
+    start = time.perf_counter()
+    with otel_span:
+        try:
+            yield
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage, outcome=outcome)
+
+
+def traced(stage: str) -> Callable:
+    """Decorator form of span() for plain and async functions."""
+    def decorator(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _model_name(serialized: Dict[str, Any] | None, kwargs: Dict[str, Any]) -> str:
+    params = kwargs.get('invocation_params') or {}
+    metadata = kwargs.get('metadata') or {}
+    return str(params.get('model') or params.get('model_name') or metadata.get('ls_model_name')
+               or (serialized or {}).get('name') or 'unknown')
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Records the latency and token usage of every chat model call."""
+    run_inline = True
+
+    def __init__(self) -> None:
+        self.__started: Dict[UUID, Tuple[float, str]] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self.__started[run_id] = (time.perf_counter(), _model_name(serialized, kwargs))
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self.__started[run_id] = (time.perf_counter(), _model_name(serialized, kwargs))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        start, model = self.__started.pop(run_id, (None, 'unknown'))
+        if start is not None:
+            LLM_SECONDS.observe(time.perf_counter() - start, model=model, outcome="ok")
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or {}
+                LLM_TOKENS.inc(usage.get('input_tokens', 0), model=model, type="input")
+                LLM_TOKENS.inc(usage.get('output_tokens', 0), model=model, type="output")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        start, model = self.__started.pop(run_id, (None, 'unknown'))
+        if start is not None:
+            LLM_SECONDS.observe(time.perf_counter() - start, model=model, outcome="error")
+
+
+LLM_CALLBACK = LLMMetricsCallback()
+
+
+def instrument_llm(llm: BaseChatModel) -> BaseChatModel:
+    """Attaches the metrics callback to a chat model (once)."""
+    callbacks = llm.callbacks
+    if callbacks is None:
+        llm.callbacks = [LLM_CALLBACK]
+    elif isinstance(callbacks, list) and LLM_CALLBACK not in callbacks:
+        llm.callbacks = [*callbacks, LLM_CALLBACK]
+    return llm
+
+
+def cache_gauges(report: Dict[str, Dict[str, Any]]) -> List[GaugeFamily]:
+    """Turns EmailGenerator.cache_report() into hit-rate and counter gauges."""
+    hit_rate, counters = [], []
+    for cache, stats in report.items():
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key == "hit_rate":
+                hit_rate.append(({"cache": cache}, value))
+            else:
+                counters.append(({"cache": cache, "stat": key}, value))
+    return [
+        ("emailgen_cache_hit_ratio", "gauge", "Share of cache lookups that were hits.", hit_rate),
+        ("emailgen_cache_stat", "gauge", "Cache counters (hits, misses, sets, size, ...).", counters),
+    ]
+
+
+def stats_gauges(name: str, help: str, stats: Dict[str, Any]) -> List[GaugeFamily]:
+    """Reports the numeric fields of a stats() dict as one labelled gauge."""
+    samples = [
+        ({"stat": key}, value) for key, value in stats.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    ]
+    return [(name, "gauge", help, samples)]
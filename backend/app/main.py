@@ -1,15 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
 from loguru import logger
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import all your routers
-from app.api import health
+from app.api import health, metrics
 from app.api.v1 import job_description, linkedin, resume, email, referral
 from app.api.v2 import email as email_v2
+from app.api.v2 import batch as batch_v2
+from app.api.v1 import jobs
+from app.core.cpu_pool import CPUPool
+from app.core.email_generator import EmailGenerator
+from app.core.generation_jobs import create_worker_pool
+from app.core.job_queue import JOB_WORKERS, JobQueue
+from app.core.resume_generator import ResumeGenerator
+from app.core.telemetry import REGISTRY, cache_gauges, setup_tracing, shutdown_tracing, stats_gauges
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One generator per process; its tools are built lazily on first use.
+    cpu_pool = CPUPool()
+    # Spawning the workers and importing pypdf in them takes a moment; do it before the first upload.
+    await asyncio.to_thread(cpu_pool.warm)
+    app.state.email_generator = EmailGenerator(cpu_pool=cpu_pool)
+    logger.info("Shared EmailGenerator registered.")
+    app.state.resume_generator = ResumeGenerator(cpu_pool=cpu_pool)
+    # Builds the preamble format file now when pdflatex is installed.
+    await asyncio.to_thread(app.state.resume_generator.compiler.warm, app.state.resume_generator.template)
+    app.state.job_queue = JobQueue()
+    setup_tracing()
+    REGISTRY.register_collector('cache', lambda: cache_gauges(app.state.email_generator.cache_report()))
+    REGISTRY.register_collector('cpu_pool', lambda: stats_gauges(
+        'emailgen_cpu_pool', "CPU pool workers, tasks in flight and totals.", cpu_pool.stats()))
+    REGISTRY.register_collector('resume', lambda: stats_gauges(
+        'emailgen_resume', "Resume generations in flight and totals.", app.state.resume_generator.stats()))
+    REGISTRY.register_collector('latex', lambda: stats_gauges(
+        'emailgen_latex', "LaTeX compiles, passes, cache hits and format builds.", app.state.resume_generator.compiler.stats()))
+    REGISTRY.register_collector('jobs', lambda: stats_gauges(
+        'emailgen_jobs', "Jobs in the queue by status.", app.state.job_queue.stats()))
+    # The workers purge finished jobs and their spooled resumes every JOB_PURGE_INTERVAL.
+    # With JOB_WORKERS=0 jobs are left to separate `python -m app.worker` processes.
+    app.state.job_workers = None
+    if JOB_WORKERS > 0:
+        app.state.job_workers = create_worker_pool(app.state.job_queue, app.state.email_generator)
+        app.state.job_workers.start()
+    yield
+    for name in ('cache', 'cpu_pool', 'resume', 'latex', 'jobs'):
+        REGISTRY.unregister_collector(name)
+    if app.state.job_workers is not None:
+        await app.state.job_workers.stop()
+    app.state.job_queue.close()
+    await app.state.email_generator.aclose()
+    await asyncio.to_thread(app.state.resume_generator.close)
+    await asyncio.to_thread(cpu_pool.close)
+    shutdown_tracing()
+
 
 def create_app():
-    app = FastAPI(title="Dynamic Email Generator API")
+    app = FastAPI(title="Dynamic Email Generator API", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -19,9 +70,12 @@ def create_app():
         allow_headers=["*"],
     )
 
+    app.middleware("http")(metrics.record_http_metrics)
+
     # --- Include all API routers ---
     # Health Check
     app.include_router(health.router, prefix="/api")
+    app.include_router(metrics.router, prefix="/api")
 
     # Core Email Generation
     app.include_router(email.router, prefix="/api/v1")
@@ -31,7 +85,9 @@ def create_app():
     app.include_router(linkedin.router, prefix="/api/v1")
     app.include_router(resume.router, prefix="/api/v1")
     app.include_router(email_v2.router, prefix="/api/v2")
+    app.include_router(batch_v2.router, prefix="/api/v2")
     app.include_router(referral.router, prefix='/api/v1')
+    app.include_router(jobs.router, prefix='/api/v1')
     
     logger.info("Application setup complete. All routers included.")
     return app
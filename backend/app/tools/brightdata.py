@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Sequence
+
+import httpx
+from loguru import logger
+
+# Overridable so the client can run against a local mock of the API.
+BRIGHT_DATA_API_URL = os.getenv('BRIGHT_DATA_API_URL', 'https://api.brightdata.com')
+BRIGHT_DATA_TIMEOUT = float(os.getenv('BRIGHT_DATA_TIMEOUT', '120'))
+BRIGHT_DATA_POLL_INTERVAL = float(os.getenv('BRIGHT_DATA_POLL_INTERVAL', '2'))
+LINKEDIN_PERSON_DATASET = os.getenv('BRIGHT_DATA_LINKEDIN_DATASET', 'gd_l1viktl72bvl7bjuj0')
+
+
+class BrightDataError(Exception):
+    pass
+
+
+def _records(payload: Any) -> List[Dict[str, Any]]:
+    """The scrape endpoint answers one input with an object and several with a list."""
+    if isinstance(payload, dict):
+        return [payload]
+    if isinstance(payload, list):
+        return [r for r in payload if isinstance(r, dict)]
+    return []
+
+
+def _parse(response: httpx.Response) -> List[Dict[str, Any]]:
+    text = response.text.strip()
+    if not text:
+        return []
+    try:
+        return _records(json.loads(text))
+    except json.JSONDecodeError:
+        # format=ndjson, or a JSON-lines snapshot.
+        return [r for line in text.splitlines() if line.strip() for r in _records(json.loads(line))]
+
+
+class BrightDataClient:
+    """
+    Minimal client for the Bright Data Dataset API. scrape() submits every
+    URL in one request; when the API hands back a snapshot instead of the
+    data (large or slow batches), it polls until the snapshot is ready.
+    """
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = BRIGHT_DATA_API_URL,
+        timeout: float = BRIGHT_DATA_TIMEOUT,
+        poll_interval: float = BRIGHT_DATA_POLL_INTERVAL,
+    ) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.__headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self.__client: httpx.Client | None = None
+        self.__async_client: httpx.AsyncClient | None = None
+        self.requests = 0
+
+    def _options(self) -> Dict[str, Any]:
+        return {"base_url": self.base_url, "headers": self.__headers, "timeout": self.timeout}
+
+    @staticmethod
+    def _checked(response: httpx.Response) -> httpx.Response:
+        if response.status_code not in (200, 202):
+            raise BrightDataError(f"Error {response.status_code}: {response.text[:300]}")
+        return response
+
+    @staticmethod
+    def _snapshot_id(response: httpx.Response) -> str | None:
+        if response.status_code != 202:
+            return None
+        snapshot_id = response.json().get('snapshot_id')
+        if not snapshot_id:
+            raise BrightDataError("Accepted without a snapshot_id")
+        return snapshot_id
+
+    def __request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        if self.__client is None:
+            self.__client = httpx.Client(**self._options())
+        self.requests += 1
+        return self._checked(self.__client.request(method, path, **kwargs))
+
+    async def __arequest(self, method: str, path: str, **kwargs) -> httpx.Response:
+        if self.__async_client is None:
+            self.__async_client = httpx.AsyncClient(**self._options())
+        self.requests += 1
+        return self._checked(await self.__async_client.request(method, path, **kwargs))
+
+    @staticmethod
+    def _scrape_args(dataset_id: str, urls: Sequence[str]) -> Dict[str, Any]:
+        return {
+            "params": {"dataset_id": dataset_id, "include_errors": "true", "format": "json"},
+            "json": [{"url": url} for url in urls],
+        }
+
+    def scrape(self, dataset_id: str, urls: Sequence[str]) -> List[Dict[str, Any]]:
+        """One record per URL (error records included), in no guaranteed order."""
+        response = self.__request("POST", "/datasets/v3/scrape", **self._scrape_args(dataset_id, urls))
+        snapshot_id = self._snapshot_id(response)
+        if snapshot_id is None:
+            return _parse(response)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            status = self.__request("GET", f"/datasets/v3/progress/{snapshot_id}").json().get('status')
+            if status == 'ready':
+                return _parse(self.__request("GET", f"/datasets/v3/snapshot/{snapshot_id}", params={"format": "json"}))
+            if status == 'failed' or time.monotonic() > deadline:
+                raise BrightDataError(f"Snapshot {snapshot_id} ended with status {status!r}")
+            time.sleep(self.poll_interval)
+
+    async def ascrape(self, dataset_id: str, urls: Sequence[str]) -> List[Dict[str, Any]]:
+        """Async counterpart of scrape()."""
+        response = await self.__arequest("POST", "/datasets/v3/scrape", **self._scrape_args(dataset_id, urls))
+        snapshot_id = self._snapshot_id(response)
+        if snapshot_id is None:
+            return _parse(response)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            status = (await self.__arequest("GET", f"/datasets/v3/progress/{snapshot_id}")).json().get('status')
+            if status == 'ready':
+                return _parse(await self.__arequest("GET", f"/datasets/v3/snapshot/{snapshot_id}", params={"format": "json"}))
+            if status == 'failed' or time.monotonic() > deadline:
+                raise BrightDataError(f"Snapshot {snapshot_id} ended with status {status!r}")
+            logger.debug(f"Snapshot {snapshot_id} is {status}; polling again.")
+            await asyncio.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        if self.__client is not None:
+            self.__client.close()
+            self.__client = None
+
+    async def aclose(self) -> None:
+        if self.__async_client is not None:
+            await self.__async_client.aclose()
+            self.__async_client = None
@@ -0,0 +1,216 @@
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Condition
+from typing import Callable, Deque, Dict, Iterator
+
+from loguru import logger
+
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '2'))
+BROWSER_POOL_MAX_PAGES = int(os.getenv('BROWSER_POOL_MAX_PAGES', '50'))
+BROWSER_POOL_ACQUIRE_TIMEOUT = float(os.getenv('BROWSER_POOL_ACQUIRE_TIMEOUT', '30'))
+
+
+@dataclass
+class _PooledBrowser:
+    driver: object
+    base_handle: str | None = None
+    pages_served: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class BrowserPool:
+    """
+    A bounded pool of warm headless browsers with lease/return semantics.
+
+    At most `size` drivers exist at once. Each lease gets a fresh tab with
+    cookies cleared, and a driver is recycled after `max_pages` leases or as
+    soon as it fails a health check.
+    """
+    def __init__(
+        self,
+        driver_factory: Callable[[], object],
+        size: int = BROWSER_POOL_SIZE,
+        max_pages: int = BROWSER_POOL_MAX_PAGES,
+        acquire_timeout: float = BROWSER_POOL_ACQUIRE_TIMEOUT,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Browser pool size must be at least 1.")
+        self.__driver_factory = driver_factory
+        self.size = size
+        self.max_pages = max_pages
+        self.acquire_timeout = acquire_timeout
+        self.__cond = Condition()
+        self.__idle: Deque[_PooledBrowser] = deque()
+        self.__live = 0
+        self.__in_use = 0
+        self.__closed = False
+        self.__stats = {
+            "leases": 0,
+            "created": 0,
+            "recycled": 0,
+            "unhealthy": 0,
+            "timeouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "busy_seconds_total": 0.0,
+        }
+        self.__started_at = time.monotonic()
+
+    def warm(self, count: int | None = None) -> None:
+        """Starts up to `count` browsers ahead of the first lease."""
+        count = self.size if count is None else min(count, self.size)
+        with self.__cond:
+            to_start = max(0, count - self.__live)
+            self.__live += to_start
+        for _ in range(to_start):
+            try:
+                browser = self.__start_browser()
+            except Exception as e:
+                logger.error(f"Failed to warm browser: {e}")
+                with self.__cond:
+                    self.__live -= 1
+                    self.__cond.notify()
+                continue
+            with self.__cond:
+                self.__idle.append(browser)
+                self.__cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[object]:
+        """Borrows a driver positioned on a fresh tab; returns it on exit."""
+        browser = self.__acquire(self.acquire_timeout if timeout is None else timeout)
+        leased_at = time.monotonic()
+        healthy = True
+        try:
+            self.__open_tab(browser)
+            yield browser.driver
+        except Exception:
+            healthy = self.__is_healthy(browser)
+            raise
+        finally:
+            self.__release(browser, healthy, time.monotonic() - leased_at)
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of pool metrics: wait times, utilisation and lifecycle counts."""
+        with self.__cond:
+            stats = dict(self.__stats)
+            stats.update(size=self.size, live=self.__live, in_use=self.__in_use, idle=len(self.__idle))
+            elapsed = time.monotonic() - self.__started_at
+        stats["utilisation"] = self.__in_use / self.size
+        stats["busy_ratio"] = stats["busy_seconds_total"] / (elapsed * self.size) if elapsed else 0.0
+        stats["wait_seconds_mean"] = stats["wait_seconds_total"] / stats["leases"] if stats["leases"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Quits idle browsers; leased ones are quit when they are returned."""
+        with self.__cond:
+            self.__closed = True
+            idle = list(self.__idle)
+            self.__idle.clear()
+            self.__live -= len(idle)
+            self.__cond.notify_all()
+        for browser in idle:
+            self.__quit(browser)
+
+    def __acquire(self, timeout: float) -> _PooledBrowser:
+        start = time.monotonic()
+        deadline = start + timeout
+        with self.__cond:
+            while True:
+                if self.__closed:
+                    raise RuntimeError("Browser pool is closed.")
+                if self.__idle:
+                    browser = self.__idle.popleft()
+                    break
+                if self.__live < self.size:
+                    self.__live += 1
+                    browser = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.__stats["timeouts"] += 1
+                    raise TimeoutError(f"No browser available after {timeout:.1f}s.")
+                self.__cond.wait(remaining)
+            self.__in_use += 1
+
+        try:
+            if browser is not None and not self.__is_healthy(browser):
+                with self.__cond:
+                    self.__stats["unhealthy"] += 1
+                self.__quit(browser)
+                browser = None
+            if browser is None:
+                browser = self.__start_browser()
+        except Exception:
+            with self.__cond:
+                self.__live -= 1
+                self.__in_use -= 1
+                self.__cond.notify()
+            raise
+
+        waited = time.monotonic() - start
+        with self.__cond:
+            self.__stats["leases"] += 1
+            self.__stats["wait_seconds_total"] += waited
+            self.__stats["wait_seconds_max"] = max(self.__stats["wait_seconds_max"], waited)
+        return browser
+
+    def __release(self, browser: _PooledBrowser, healthy: bool, busy: float) -> None:
+        browser.pages_served += 1
+        if healthy:
+            healthy = self.__close_tab(browser)
+        recycle = not healthy or browser.pages_served >= self.max_pages
+        with self.__cond:
+            self.__in_use -= 1
+            self.__stats["busy_seconds_total"] += busy
+            if recycle or self.__closed:
+                self.__live -= 1
+                if recycle:
+                    self.__stats["recycled" if healthy else "unhealthy"] += 1
+            else:
+                self.__idle.append(browser)
+            self.__cond.notify()
+        if recycle or self.__closed:
+            self.__quit(browser)
+
+    def __start_browser(self) -> _PooledBrowser:
+        driver = self.__driver_factory()
+        browser = _PooledBrowser(driver=driver, base_handle=driver.current_window_handle)
+        with self.__cond:
+            self.__stats["created"] += 1
+        return browser
+
+    @staticmethod
+    def __open_tab(browser: _PooledBrowser) -> None:
+        browser.driver.delete_all_cookies()
+        browser.driver.switch_to.new_window('tab')
+
+    @staticmethod
+    def __close_tab(browser: _PooledBrowser) -> bool:
+        """Closes the leased tab and returns to the base one; False if the driver is broken."""
+        try:
+            driver = browser.driver
+            if driver.current_window_handle != browser.base_handle:
+                driver.close()
+            driver.switch_to.window(browser.base_handle)
+            return True
+        except Exception as e:
+            logger.warning(f"Browser failed to reset after lease, recycling: {e}")
+            return False
+
+    @staticmethod
+    def __is_healthy(browser: _PooledBrowser) -> bool:
+        try:
+            return browser.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def __quit(browser: _PooledBrowser) -> None:
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error while quitting browser: {e}")
@@ -0,0 +1,122 @@
+import os
+import re
+from html.parser import HTMLParser
+from typing import List
+
+from loguru import logger
+
+# Subtrees whose text is never part of the job description.
+SKIP_TAGS = frozenset({'script', 'style', 'header', 'footer', 'nav'})
+
+HTML_EXTRACT_BACKEND = os.getenv('HTML_EXTRACT_BACKEND', 'auto')
+
+_BODY_TAG = re.compile(r'<body[\s/>]', re.IGNORECASE)
+
+try:
+    from lxml import etree as _lxml_etree
+    from lxml import html as _lxml_html
+except ImportError:  # lxml is optional; the stdlib parser is always available.
+    _lxml_etree = _lxml_html = None
+
+
+class _BodyTextParser(HTMLParser):
+    """
+    Streaming (SAX-style) collector for the visible text of <body>.
+    Keeps a counter of open skip tags instead of building a tree, so memory
+    stays flat and deeply nested markup cannot hit the recursion limit.
+    """
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.seen_body = False
+        self.__in_body = False
+        self.__skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self.seen_body = self.__in_body = True
+        elif tag in SKIP_TAGS and self.__in_body:
+            self.__skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags never open a subtree.
+        if tag == 'body':
+            self.seen_body = True
+
+    def handle_endtag(self, tag):
+        if tag == 'body':
+            self.__in_body = False
+            self.__skip_depth = 0
+        elif tag in SKIP_TAGS and self.__skip_depth:
+            self.__skip_depth -= 1
+
+    def handle_data(self, data):
+        if self.__in_body and not self.__skip_depth:
+            self.parts.append(data)
+
+
+def _extract_stdlib(html_content: str) -> str | None:
+    parser = _BodyTextParser()
+    parser.feed(html_content)
+    parser.close()
+    if not parser.seen_body:
+        return None
+    return ' '.join(' '.join(parser.parts).split())
+
+
+def _has_body_tag(html_content: str) -> bool:
+    """Whether the source has a <body> tag outside comments, as html.parser would see it."""
+    for match in _BODY_TAG.finditer(html_content):
+        if html_content.rfind('<!--', 0, match.start()) <= html_content.rfind('-->', 0, match.start()):
+            return True
+    return False
+
+
+def _extract_lxml(html_content: str) -> str | None:
+    # lxml adds a <body> to every document; pages without one get None as with html.parser.
+    if not _has_body_tag(html_content):
+        return None
+    root = _lxml_html.document_fromstring(html_content)
+    body = root.find('body')
+    if body is None:
+        return None
+    parts: List[str] = []
+    walker = _lxml_etree.iterwalk(body, events=('start', 'end', 'comment', 'pi'))
+    for event, element in walker:
+        if event == 'start':
+            if element.tag in SKIP_TAGS:
+                walker.skip_subtree()
+            elif element.text:
+                parts.append(element.text)
+        elif element is not body and element.tail:
+            # 'end', 'comment' and 'pi' all contribute the text that follows the node.
+            parts.append(element.tail)
+    return ' '.join(' '.join(parts).split())
+
+
+def lxml_available() -> bool:
+    return _lxml_html is not None
+
+
+def extract_text(html_content: str | None, backend: str = HTML_EXTRACT_BACKEND) -> str | None:
+    """
+    Returns the whitespace-normalised visible text of the page body, skipping
+    script/style/header/footer/nav subtrees, or None if there is no <body>.
+
+    backend is 'stdlib' (html.parser, streaming), 'lxml' (C parser with an
+    iterative walk) or 'auto' to use lxml when it is installed.
+    """
+    if not html_content:
+        return None
+    if backend == 'auto':
+        backend = 'lxml' if lxml_available() else 'stdlib'
+    if backend == 'lxml':
+        if not lxml_available():
+            raise ValueError("The 'lxml' extraction backend requires lxml to be installed.")
+        try:
+            return _extract_lxml(html_content)
+        except (ValueError, _lxml_etree.ParserError) as e:
+            logger.warning(f"lxml could not parse the page, falling back to html.parser: {e}")
+    elif backend != 'stdlib':
+        raise ValueError(f"Unknown HTML extraction backend: {backend}")
+    return _extract_stdlib(html_content)
@@ -0,0 +1,264 @@
+import asyncio
+import contextlib
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+try:
+    import h2  # noqa: F401  (httpx negotiates HTTP/2 only when h2 is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '50'))
+HTTP_MAX_KEEPALIVE = int(os.getenv('HTTP_MAX_KEEPALIVE', '20'))
+# Concurrent requests to one host; job boards throttle bursts from one client.
+HTTP_MAX_PER_HOST = int(os.getenv('HTTP_MAX_PER_HOST', '6'))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+HTTP_HTTP2 = os.getenv('HTTP_HTTP2', 'true').lower() in ('1', 'true', 'yes')
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+HTTP_BACKOFF_BASE = float(os.getenv('HTTP_BACKOFF_BASE', '0.5'))
+HTTP_BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', '8'))
+# Bodies are read as a stream and cut off here; job text sits near the top.
+HTTP_MAX_BYTES = int(os.getenv('HTTP_MAX_BYTES', str(5 * 1024 * 1024)))
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    text: str
+    http_version: str
+    truncated: bool = False
+    attempts: int = 1
+
+
+@dataclass
+class _HostSlot:
+    # threading.BoundedSemaphore or asyncio.Semaphore
+    semaphore: Any
+    # Requests holding or waiting for the semaphore; the slot is dropped at zero.
+    users: int = 0
+
+
+def backoff_delay(attempt: int, base: float = HTTP_BACKOFF_BASE, cap: float = HTTP_BACKOFF_MAX) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def retry_after(headers: httpx.Headers, cap: float = HTTP_BACKOFF_MAX) -> float | None:
+    """The server's Retry-After (seconds or an HTTP date), capped; None if absent."""
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(cap, max(0.0, seconds))
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{(parts.hostname or '').lower()}:{parts.port or ''}"
+
+
+class PooledHTTPClient:
+    """
+    One keep-alive connection pool for every page fetch, shared by the sync
+    and async scrape paths: HTTP/2 when the h2 package is installed,
+    gzip/deflate (plus brotli/zstd when their packages are installed),
+    retries with jittered backoff on 429/5xx and network errors, and
+    bodies streamed up to max_bytes instead of buffered whole.
+    """
+    def __init__(
+        self,
+        headers: Dict[str, str] | None = None,
+        timeout: float = HTTP_TIMEOUT,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        max_per_host: int = HTTP_MAX_PER_HOST,
+        http2: bool = HTTP_HTTP2,
+        retries: int = HTTP_RETRIES,
+        max_bytes: int = HTTP_MAX_BYTES,
+    ) -> None:
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        )
+        self.max_per_host = max_per_host
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.debug("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1.")
+        self.retries = retries
+        self.max_bytes = max_bytes
+        self.__client: httpx.Client | None = None
+        self.__async_client: httpx.AsyncClient | None = None
+        self.__lock = threading.Lock()
+        # Only hosts with requests in flight have a slot, so the maps stay
+        # as small as the current concurrency however many boards are scraped.
+        self.__host_slots: Dict[str, _HostSlot] = {}
+        self.__async_host_slots: Dict[str, _HostSlot] = {}
+        self.counters = {"requests": 0, "retries": 0, "failures": 0, "truncated": 0, "bytes": 0}
+
+    def _client_options(self) -> Dict[str, Any]:
+        return {
+            "headers": self.headers, "timeout": self.timeout, "limits": self.limits,
+            "http2": self.http2, "follow_redirects": True,
+        }
+
+    def _get_client(self) -> httpx.Client:
+        with self.__lock:
+            if self.__client is None:
+                self.__client = httpx.Client(**self._client_options())
+            return self.__client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self.__async_client is None:
+            self.__async_client = httpx.AsyncClient(**self._client_options())
+        return self.__async_client
+
+    @contextlib.contextmanager
+    def __slot(self, url: str) -> Iterator[None]:
+        """Holds one of the host's max_per_host request slots."""
+        host = _host(url)
+        with self.__lock:
+            slot = self.__host_slots.get(host)
+            if slot is None:
+                slot = self.__host_slots[host] = _HostSlot(threading.BoundedSemaphore(self.max_per_host))
+            slot.users += 1
+        try:
+            with slot.semaphore:
+                yield
+        finally:
+            with self.__lock:
+                slot.users -= 1
+                if not slot.users:
+                    del self.__host_slots[host]
+
+    @contextlib.asynccontextmanager
+    async def __async_slot(self, url: str) -> AsyncIterator[None]:
+        """Async counterpart of __slot."""
+        host = _host(url)
+        slot = self.__async_host_slots.get(host)
+        if slot is None:
+            slot = self.__async_host_slots[host] = _HostSlot(asyncio.Semaphore(self.max_per_host))
+        slot.users += 1
+        try:
+            async with slot.semaphore:
+                yield
+        finally:
+            slot.users -= 1
+            if not slot.users:
+                del self.__async_host_slots[host]
+
+    def _result(self, response: httpx.Response, chunks: Iterable[bytes], attempts: int) -> FetchResult:
+        body, truncated = bytearray(), False
+        for chunk in chunks:
+            body += chunk
+            if len(body) > self.max_bytes:
+                del body[self.max_bytes:]
+                truncated = True
+                break
+        if truncated:
+            self.counters["truncated"] += 1
+            logger.warning(f"Truncated {response.url} at {self.max_bytes} bytes.")
+        self.counters["bytes"] += len(body)
+        return FetchResult(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers=response.headers,
+            text=bytes(body).decode(response.encoding or 'utf-8', errors='replace'),
+            http_version=response.http_version,
+            truncated=truncated,
+            attempts=attempts,
+        )
+
+    def __wait_for(self, attempt: int, url: str, reason: str, headers: httpx.Headers | None = None) -> float:
+        delay = retry_after(headers) if headers is not None else None
+        delay = backoff_delay(attempt) if delay is None else delay
+        self.counters["retries"] += 1
+        logger.info(f"Retrying {url} in {delay:.2f}s after {reason} (attempt {attempt + 2}/{self.retries + 1}).")
+        return delay
+
+    def get(self, url: str, headers: Dict[str, str] | None = None) -> FetchResult:
+        """GETs url with retries. Raises the last httpx error if every attempt fails."""
+        client = self._get_client()
+        attempt = 0
+        with self.__slot(url):
+            while True:
+                self.counters["requests"] += 1
+                try:
+                    with client.stream("GET", url, headers=headers) as response:
+                        if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                            return self._result(response, response.iter_bytes(), attempt + 1)
+                        delay = self.__wait_for(attempt, url, f"HTTP {response.status_code}", response.headers)
+                except RETRY_ERRORS as e:
+                    if attempt == self.retries:
+                        self.counters["failures"] += 1
+                        raise
+                    delay = self.__wait_for(attempt, url, type(e).__name__)
+                time.sleep(delay)
+                attempt += 1
+
+    async def aget(self, url: str, headers: Dict[str, str] | None = None) -> FetchResult:
+        """Async counterpart of get()."""
+        client = self._get_async_client()
+        attempt = 0
+        async with self.__async_slot(url):
+            while True:
+                self.counters["requests"] += 1
+                try:
+                    async with client.stream("GET", url, headers=headers) as response:
+                        if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                            chunks = [chunk async for chunk in self.__limited(response)]
+                            return self._result(response, chunks, attempt + 1)
+                        delay = self.__wait_for(attempt, url, f"HTTP {response.status_code}", response.headers)
+                except RETRY_ERRORS as e:
+                    if attempt == self.retries:
+                        self.counters["failures"] += 1
+                        raise
+                    delay = self.__wait_for(attempt, url, type(e).__name__)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def __limited(self, response: httpx.Response):
+        """Yields decoded chunks until one past max_bytes, so the rest is never read."""
+        size = 0
+        async for chunk in response.aiter_bytes():
+            yield chunk
+            size += len(chunk)
+            if size > self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "http2": self.http2, "hosts_in_flight": len(self.__host_slots) + len(self.__async_host_slots)}
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__client is not None:
+                self.__client.close()
+                self.__client = None
+
+    async def aclose(self) -> None:
+        if self.__async_client is not None:
+            await self.__async_client.aclose()
+            self.__async_client = None
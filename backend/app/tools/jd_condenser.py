@@ -0,0 +1,187 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from urllib.parse import urlsplit
+
+# Bump when the rules change so cached JD conversions are recomputed.
+CONDENSER_VERSION = "3"
+
+# A cut marker only truncates when it appears after this fraction of the
+# text, so a posting that mentions "similar jobs" early is not cut short.
+MIN_KEEP_RATIO = 0.3
+# Below this many characters the condensed text is not trusted and the
+# original is used instead.
+MIN_CONDENSED_CHARS = 200
+# Word sequences of this length seen earlier in the text are dropped.
+SHINGLE_WORDS = 12
+
+
+@dataclass(frozen=True)
+class SiteRule:
+    name: str
+    hosts: Tuple[str, ...]
+    cut_markers: Tuple[str, ...] = ()
+    drop_patterns: Tuple[str, ...] = ()
+
+
+SITE_RULES = (
+    SiteRule(
+        name="linkedin",
+        hosts=("linkedin.com",),
+        cut_markers=(
+            "Referrals increase your chances", "Get notified when a new job is posted",
+            "Sign in to set job alerts", "Similar jobs", "People also viewed",
+            "Explore collaborative articles", "LinkedIn is better on the app",
+        ),
+        drop_patterns=(
+            r"Skip to main content", r"Apply Save Report this job", r"See who .{1,80}? has hired for this role",
+            r"Over \d+ applicants", r"\d+ (?:minutes?|hours?|days?|weeks?|months?) ago", r"Show more Show less",
+            r"Sign in (?:to see who you already know at .{1,80}? )?Welcome back.*?(?:Join now|Cookie Policy \.)",
+            r"By clicking Continue to join or sign in, you agree to .{1,40}? User Agreement , Privacy Policy , and Cookie Policy \.",
+            r"New to LinkedIn\? Join now",
+        ),
+    ),
+    SiteRule(
+        name="greenhouse",
+        hosts=("greenhouse.io",),
+        cut_markers=("Apply for this job", "Create a Job Alert"),
+        drop_patterns=(r"Back to jobs", r"Powered by Greenhouse", r"Read our Privacy Policy"),
+    ),
+    SiteRule(
+        name="lever",
+        hosts=("lever.co",),
+        # The footer reads "<Company> Home Page Jobs powered by Lever"; cutting
+        # at "Home Page" leaves at most the company name behind.
+        cut_markers=("Apply for this job", "Home Page Jobs powered by Lever", "Jobs powered by Lever"),
+        drop_patterns=(r"Apply for this job",),
+    ),
+    SiteRule(
+        name="workday",
+        hosts=("myworkdayjobs.com", "workday.com"),
+        cut_markers=("Similar Jobs", "Follow Us", "© 20"),
+        drop_patterns=(r"Skip to main content", r"Sign In", r"Search for Jobs", r"Apply Use My Last Application"),
+    ),
+)
+
+GENERIC_RULE = SiteRule(
+    name="generic",
+    hosts=(),
+    cut_markers=(
+        "Similar jobs", "People also viewed", "Related jobs", "Recommended jobs",
+        "Jobs you may be interested in", "More jobs like this", "Explore collaborative articles",
+    ),
+    drop_patterns=(
+        r"Skip to (?:main )?content",
+        r"(?:We|This (?:site|website)) uses? [Cc]ookies.{0,200}?\b(?:Accept(?: [Aa]ll)?(?: [Cc]ookies)?|Got it|OK)",
+        r"(?:Accept|Reject|Manage) (?:[Aa]ll )?[Cc]ookies",
+    ),
+)
+
+# Drop patterns are UI strings: they match case-sensitively and only as
+# whole words, so "Sign In" never matches inside "design initiatives".
+_COMPILED = {
+    rule.name: (
+        re.compile("|".join(re.escape(m) for m in rule.cut_markers), re.IGNORECASE) if rule.cut_markers else None,
+        [re.compile(rf"(?<!\w)(?:{p})(?!\w)") for p in rule.drop_patterns],
+    )
+    for rule in (*SITE_RULES, GENERIC_RULE)
+}
+# A block of 3 to 12 whole words repeated right after itself (LinkedIn
+# prints titles twice, "Software Engineer III Software Engineer III"). The
+# repeat must end the text or a sentence or be followed by a capitalised
+# word, so prose such as "Walla Walla" or "very very strong" is left alone.
+_IMMEDIATE_REPEAT = re.compile(r"(?<!\S)((?:\S+ ){2,11}\S+) \1(?=[.!?]?(?: [A-Z(]|$))")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class CondenseResult:
+    text: str
+    original_tokens: int
+    condensed_tokens: int
+    rules: List[str] = field(default_factory=list)
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.condensed_tokens
+
+    @property
+    def reduction_ratio(self) -> float:
+        return self.tokens_saved / self.original_tokens if self.original_tokens else 0.0
+
+
+def rule_for_url(url: str | None) -> SiteRule | None:
+    if not url:
+        return None
+    host = (urlsplit(url).hostname or "").lower()
+    for rule in SITE_RULES:
+        if any(host == h or host.endswith("." + h) for h in rule.hosts):
+            return rule
+    return None
+
+
+def _cut(text: str, rule: SiteRule) -> str:
+    pattern = _COMPILED[rule.name][0]
+    if pattern is None:
+        return text
+    match = pattern.search(text, int(len(text) * MIN_KEEP_RATIO))
+    return text[:match.start()] if match else text
+
+
+def _drop(text: str, rule: SiteRule) -> str:
+    for pattern in _COMPILED[rule.name][1]:
+        text = pattern.sub(" ", text)
+    return text
+
+
+def _drop_repeated_shingles(text: str) -> str:
+    """Removes any run of words that repeats a SHINGLE_WORDS-long sequence seen earlier."""
+    words = text.split()
+    if len(words) < SHINGLE_WORDS * 2:
+        return text
+    seen = set()
+    keep = [True] * len(words)
+    for i in range(len(words) - SHINGLE_WORDS + 1):
+        shingle = tuple(words[i:i + SHINGLE_WORDS])
+        if shingle in seen:
+            for j in range(i, i + SHINGLE_WORDS):
+                keep[j] = False
+        else:
+            seen.add(shingle)
+    return " ".join(w for w, k in zip(words, keep) if k)
+
+
+def condense(text: str, url: str | None = None) -> CondenseResult:
+    """
+    Deterministically strips navigation, sign-in and related-listing
+    boilerplate from scraped job text: site rules for the URL's host first,
+    then the generic rule, repeated passages and doubled phrases.
+    """
+    original = " ".join(text.split())
+    rules = []
+    condensed = original
+    site_rule = rule_for_url(url)
+    for rule in (site_rule, GENERIC_RULE):
+        if rule is None:
+            continue
+        before = condensed
+        condensed = _drop(_cut(condensed, rule), rule)
+        if condensed != before:
+            rules.append(rule.name)
+    before = " ".join(condensed.split())
+    condensed = " ".join(_IMMEDIATE_REPEAT.sub(r"\1", _drop_repeated_shingles(before)).split())
+    if condensed != before:
+        rules.append("dedupe")
+
+    if len(condensed) < MIN_CONDENSED_CHARS <= len(original):
+        condensed, rules = original, []
+    return CondenseResult(
+        text=condensed,
+        original_tokens=estimate_tokens(original),
+        condensed_tokens=estimate_tokens(condensed),
+        rules=rules,
+    )
@@ -0,0 +1,383 @@
+import json
+import re
+from dataclasses import dataclass
+from html import unescape
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+
+from app.tools.html_text import extract_text
+
+try:
+    import lxml  # noqa: F401
+    _SOUP_PARSER = 'lxml'
+except ImportError:  # lxml is optional; html.parser ships with Python.
+    _SOUP_PARSER = 'html.parser'
+
+# Fields of JobListing; the extractors fill what the page states outright.
+LISTING_FIELDS = (
+    'title', 'level', 'location', 'description',
+    'key_qualifications', 'preferred_qualifications', 'responsibilities', 'company',
+)
+# Everything but preferred_qualifications, which many postings simply omit.
+REQUIRED_FIELDS = tuple(f for f in LISTING_FIELDS if f != 'preferred_qualifications')
+# Fields copied verbatim from the page. The rest are split out of the
+# description or inferred (level), so they never override the LLM's answer.
+STATED_FIELDS = ('title', 'company', 'location')
+# Bump when extraction changes so postings cached with scraped pages are ignored.
+EXTRACTOR_VERSION = "2"
+
+_JSON_LD = re.compile(
+    r"<script[^>]+type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Section headings inside a description, checked in this order.
+_APOSTROPHE = "['’]"
+SECTION_PATTERNS = (
+    ('preferred_qualifications', re.compile(
+        r"nice[ -]to[ -]have|good[ -]to[ -]have|preferred|bonus|desired|pluses|extra credit", re.IGNORECASE)),
+    ('responsibilities', re.compile(
+        rf"responsibilit|duties|what you{_APOSTROPHE}?(ll| will) (do|work on)|your role|the role|in this role|day[ -]to[ -]day",
+        re.IGNORECASE)),
+    ('key_qualifications', re.compile(
+        rf"requirement|qualification|must[ -]have|what (we{_APOSTROPHE}re|we are) looking for|"
+        rf"what you{_APOSTROPHE}?(ll| will) (need|bring)|who you are|about you|skills|experience", re.IGNORECASE)),
+)
+_HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+_BLOCK_TAGS = _HEADING_TAGS | {'p', 'div', 'li', 'ul', 'ol', 'br', 'section', 'tr', 'dd', 'dt'}
+_EMPHASIS_TAGS = frozenset({'strong', 'b'})
+# A bold paragraph longer than this is prose, not a heading.
+_MAX_HEADING_CHARS = 80
+
+_SENIOR_TITLE = re.compile(r"\b(senior|sr\.?|staff|principal|lead|head|director|architect|manager)\b", re.IGNORECASE)
+_ENTRY_TITLE = re.compile(r"\b(junior|jr\.?|intern(ship)?|graduate|entry[ -]level|trainee|apprentice)\b", re.IGNORECASE)
+_YEARS = re.compile(r"(\d{1,2})\s*(?:\+|-\s*\d{1,2})?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+_SENIORITY_LEVELS = (
+    ('intern', 'Entry'), ('entry', 'Entry'), ('associate', 'Mid'), ('mid', 'Mid'),
+    ('senior', 'Senior'), ('director', 'Senior'), ('executive', 'Senior'),
+)
+
+
+def level_from_years(years: float) -> str:
+    if years < 2:
+        return 'Entry'
+    return 'Mid' if years < 5 else 'Senior'
+
+
+def infer_level(title: str, *texts: str, months: float | None = None, seniority: str | None = None) -> str | None:
+    """
+    The seniority from the title keywords, the stated experience or the
+    board's own seniority label, in that order; None when nothing says.
+    """
+    if _SENIOR_TITLE.search(title or ''):
+        return 'Senior'
+    if _ENTRY_TITLE.search(title or ''):
+        return 'Entry'
+    if months is not None:
+        return level_from_years(months / 12)
+    if seniority:
+        label = seniority.lower()
+        for keyword, level in _SENIORITY_LEVELS:
+            if keyword in label:
+                return level
+    years = [int(m.group(1)) for text in texts for m in _YEARS.finditer(text or '')]
+    return level_from_years(min(years)) if years else None
+
+
+@dataclass
+class _Block:
+    text: str
+    heading: bool
+
+
+class _BlockParser(HTMLParser):
+    """Splits description HTML into text blocks, marking those that read as headings."""
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[_Block] = []
+        self.__parts: List[str] = []
+        self.__emphasis: List[str] = []
+        self.__plain = False
+        self.__heading = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.flush()
+            self.__heading = tag in _HEADING_TAGS
+        elif tag in _EMPHASIS_TAGS:
+            self.__emphasis.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _BLOCK_TAGS:
+            self.flush()
+        elif tag in _EMPHASIS_TAGS and self.__emphasis:
+            self.__emphasis.pop()
+
+    def handle_data(self, data):
+        if not data.strip():
+            return
+        self.__parts.append(data)
+        if not self.__emphasis:
+            self.__plain = True
+
+    def flush(self) -> None:
+        text = ' '.join(''.join(self.__parts).split())
+        if text:
+            # A block that is bold from start to end ("<p><strong>Requirements</strong></p>") is a heading too.
+            emphasised = not self.__plain and len(text) <= _MAX_HEADING_CHARS
+            self.blocks.append(_Block(text, self.__heading or emphasised))
+        self.__parts, self.__plain, self.__heading = [], False, False
+
+
+def _section_for(heading: str) -> str:
+    for name, pattern in SECTION_PATTERNS:
+        if pattern.search(heading):
+            return name
+    return 'description'
+
+
+def _joined(items: List[str]) -> str:
+    return ' '.join(item if item[-1] in '.!?:;' else item + '.' for item in items)
+
+
+def split_sections(description_html: str) -> Dict[str, str]:
+    """
+    Maps a description's blocks to JobListing fields by their headings.
+    Text before the first heading and under unrecognised headings (company
+    overview, benefits, ...) becomes the description.
+    """
+    parser = _BlockParser()
+    parser.feed(description_html or '')
+    parser.close()
+    parser.flush()
+
+    sections: Dict[str, List[str]] = {}
+    current = 'description'
+    for block in parser.blocks:
+        if block.heading:
+            current = _section_for(block.text)
+            if current == 'description':
+                sections.setdefault(current, []).append(block.text.rstrip(':') + ':')
+            continue
+        sections.setdefault(current, []).append(block.text)
+    return {name: _joined(items) for name, items in sections.items() if items}
+
+
+def _clean(value: Any) -> str:
+    return ' '.join(str(value).split()) if value else ''
+
+
+def _json_ld_blocks(html: str) -> Iterator[Any]:
+    for match in _JSON_LD.finditer(html):
+        try:
+            yield json.loads(match.group(1).strip())
+        except json.JSONDecodeError:
+            continue
+
+
+def _find_job_posting(node: Any) -> Dict[str, Any] | None:
+    if isinstance(node, list):
+        for item in node:
+            if (found := _find_job_posting(item)) is not None:
+                return found
+        return None
+    if not isinstance(node, dict):
+        return None
+    kind = node.get('@type')
+    if kind == 'JobPosting' or (isinstance(kind, list) and 'JobPosting' in kind):
+        return node
+    return _find_job_posting(node.get('@graph'))
+
+
+def _named(value: Any) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        return _clean(value.get('name'))
+    return _clean(value)
+
+
+def _place(location: Any) -> str:
+    address = location.get('address', location) if isinstance(location, dict) else location
+    if isinstance(address, dict):
+        parts = [_named(address.get(k)) for k in ('addressLocality', 'addressRegion', 'addressCountry')]
+        return ', '.join(p for p in parts if p)
+    return _clean(address)
+
+
+def _location(posting: Dict[str, Any]) -> str:
+    locations = posting.get('jobLocation') or []
+    places = [p for p in (_place(loc) for loc in (locations if isinstance(locations, list) else [locations])) if p]
+    location = '; '.join(places[:3])
+    if 'TELECOMMUTE' in str(posting.get('jobLocationType', '')).upper():
+        region = _named(posting.get('applicantLocationRequirements'))
+        remote = f"Remote ({region})" if region else "Remote"
+        location = f"{remote}; {location}" if location else remote
+    return location
+
+
+def _months(posting: Dict[str, Any]) -> float | None:
+    requirement = posting.get('experienceRequirements')
+    if isinstance(requirement, dict) and requirement.get('monthsOfExperience') is not None:
+        try:
+            return float(requirement['monthsOfExperience'])
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def from_json_ld(html: str) -> Dict[str, str]:
+    """Fields of the page's schema.org JobPosting, if it embeds one."""
+    for block in _json_ld_blocks(html):
+        posting = _find_job_posting(block)
+        if posting is None:
+            continue
+        title = _clean(posting.get('title'))
+        description = str(posting.get('description') or '')
+        if '<' not in description:
+            # LinkedIn and Greenhouse entity-escape the markup ("&lt;p&gt;...").
+            description = unescape(description)
+        sections = split_sections(description)
+        fields = {
+            **sections,
+            'title': title,
+            'company': _named(posting.get('hiringOrganization')),
+            'location': _location(posting),
+        }
+        level = infer_level(title, sections.get('key_qualifications', ''), months=_months(posting))
+        if level:
+            fields['level'] = level
+        return fields
+    return {}
+
+
+def _text(soup: BeautifulSoup, *selectors: str) -> str:
+    for selector in selectors:
+        if (node := soup.select_one(selector)) is not None:
+            if text := _clean(node.get_text(' ')):
+                return text
+    return ''
+
+
+def _html(soup: BeautifulSoup, *selectors: str) -> str:
+    return ''.join(str(node) for selector in selectors for node in soup.select(selector))
+
+
+def _lever(soup: BeautifulSoup) -> Dict[str, str]:
+    title = _text(soup, '.posting-headline h2', '.posting-headline h1')
+    page_title = _text(soup, 'title')
+    company = page_title.split(' - ')[0] if ' - ' in page_title else ''
+    # The overview, then one .section per heading (Responsibilities, Requirements, ...).
+    description = _html(soup, "[data-qa='job-description']", '.posting-page .section:not([data-qa])')
+    return {'title': title, 'company': company, 'location': _text(soup, '.posting-categories .location'),
+            '_description_html': description}
+
+
+def _greenhouse(soup: BeautifulSoup) -> Dict[str, str]:
+    company = _text(soup, '.company-name')
+    return {
+        'title': _text(soup, '.app-title', '.job__title h1'),
+        'company': re.sub(r"^at\s+", '', company, flags=re.IGNORECASE),
+        'location': _text(soup, '.location', '.job__location'),
+        '_description_html': _html(soup, '.job__description') or _html(soup, '#content'),
+    }
+
+
+def _linkedin(soup: BeautifulSoup) -> Dict[str, str]:
+    seniority = ''
+    for item in soup.select('.description__job-criteria-list li, .description__job-criteria-item'):
+        if 'seniority' in _text(item, 'h3').lower():
+            seniority = _text(item, 'span')
+    return {
+        'title': _text(soup, '.top-card-layout__title', '.topcard__title'),
+        'company': _text(soup, '.topcard__org-name-link', '.topcard__flavor'),
+        'location': _text(soup, '.topcard__flavor--bullet'),
+        '_description_html': _html(soup, '.show-more-less-html__markup') or _html(soup, '.description__text'),
+        '_seniority': seniority,
+    }
+
+
+def _workday(soup: BeautifulSoup) -> Dict[str, str]:
+    return {
+        'title': _text(soup, "[data-automation-id='jobPostingHeader']"),
+        'location': _text(soup, "[data-automation-id='locations'] dd", "[data-automation-id='locations']"),
+        '_description_html': _html(soup, "[data-automation-id='jobPostingDescription']"),
+    }
+
+
+@dataclass(frozen=True)
+class SiteAdapter:
+    name: str
+    hosts: Tuple[str, ...]
+    extract: Callable[[BeautifulSoup], Dict[str, str]]
+
+
+SITE_ADAPTERS = (
+    SiteAdapter('lever', ('lever.co',), _lever),
+    SiteAdapter('greenhouse', ('greenhouse.io',), _greenhouse),
+    SiteAdapter('linkedin', ('linkedin.com',), _linkedin),
+    SiteAdapter('workday', ('myworkdayjobs.com', 'workday.com'), _workday),
+)
+
+
+def adapter_for_url(url: str | None) -> SiteAdapter | None:
+    if not url:
+        return None
+    host = (urlsplit(url).hostname or '').lower()
+    for adapter in SITE_ADAPTERS:
+        if any(host == h or host.endswith('.' + h) for h in adapter.hosts):
+            return adapter
+    return None
+
+
+def from_site(html: str, adapter: SiteAdapter) -> Dict[str, str]:
+    """Fields read from the board's known DOM structure."""
+    raw = adapter.extract(BeautifulSoup(html, _SOUP_PARSER))
+    sections = split_sections(raw.pop('_description_html', ''))
+    seniority = raw.pop('_seniority', '')
+    fields = {**sections, **{k: v for k, v in raw.items() if v}}
+    level = infer_level(fields.get('title', ''), sections.get('key_qualifications', ''), seniority=seniority)
+    if level:
+        fields['level'] = level
+    return fields
+
+
+def extract_posting(html: str | None, url: str | None = None) -> Dict[str, Any] | None:
+    """
+    The JobListing fields a page states outright: its schema.org JobPosting
+    first, then the site adapter for the URL's board for whatever is still
+    missing. Returns {'fields': ..., 'sources': [...], 'version': ...} or None.
+    """
+    if not html:
+        return None
+    fields = {k: v for k, v in from_json_ld(html).items() if v}
+    sources = ['json-ld'] if fields else []
+    adapter = adapter_for_url(url)
+    if adapter is not None and any(not fields.get(f) for f in REQUIRED_FIELDS):
+        found = {k: v for k, v in from_site(html, adapter).items() if v and not fields.get(k)}
+        if found:
+            fields.update(found)
+            sources.append(adapter.name)
+    fields = {k: v for k, v in fields.items() if k in LISTING_FIELDS}
+    return {'fields': fields, 'sources': sources, 'version': EXTRACTOR_VERSION} if fields else None
+
+
+def is_current(posting: Dict[str, Any] | None) -> bool:
+    """True when the posting came from this version of the extractors."""
+    return bool(posting) and posting.get('version') == EXTRACTOR_VERSION
+
+
+def is_complete(posting: Dict[str, Any] | None) -> bool:
+    """True when the posting has every field the LLM would otherwise fill."""
+    fields = (posting or {}).get('fields', {})
+    return all(fields.get(f) for f in REQUIRED_FIELDS)
+
+
+def analyze_page(html: str | None, url: str | None = None) -> Tuple[str | None, Dict[str, Any] | None]:
+    """Page text and structured posting in one call, so a CPU pool needs one hop."""
+    if not html:
+        return None, None
+    return extract_text(html), extract_posting(html, url)
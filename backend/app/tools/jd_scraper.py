@@ -1,22 +1,74 @@
-import time
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+from typing import Tuple
 from loguru import logger
-from bs4.element import NavigableString
 from selenium import webdriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException
 # Import ChromeOptions to set headless mode
 from selenium.webdriver.chrome.options import Options
 
+from app.core.cache import SingleFlight, AsyncSingleFlight
+from app.core.cpu_pool import CPUPool
+from app.core.telemetry import span, traced
+from app.tools.browser_pool import BrowserPool
+from app.tools.html_text import extract_text
+from app.tools.http_client import FetchResult, PooledHTTPClient
+from app.tools.jd_extractors import analyze_page
+from app.tools.page_wait import load_and_wait
+from app.tools.scrape_cache import ScrapeCache, ScrapeEntry, canonicalize_url
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
 class Scraper:
-    def __init__(self) -> None:
-        self.__driver = self.__configure_headless()
+    def __init__(
+        self,
+        browser_pool: BrowserPool | None = None,
+        cache: ScrapeCache | None = None,
+        cpu_pool: CPUPool | None = None,
+        http_client: PooledHTTPClient | None = None,
+    ) -> None:
+        # Chrome is only launched when the HTTP fast path fails, and
+        # the browsers are leased from a pool shared by every scrape.
+        self.__browser_pool = browser_pool or BrowserPool(driver_factory=Scraper.configure_headless)
+        # Keep-alive connections shared by every fast-path fetch, sync and async.
+        self.__http = http_client or PooledHTTPClient(headers=REQUEST_HEADERS)
+        self.cache = cache or ScrapeCache()
+        self.__flight = SingleFlight()
+        self.__async_flight = AsyncSingleFlight()
+        # HTML extraction runs in worker processes when a pool is given.
+        self.__cpu_pool = cpu_pool or CPUPool(workers=0)
+
+    @property
+    def browser_pool(self) -> BrowserPool:
+        return self.__browser_pool
+
+    @property
+    def http(self) -> PooledHTTPClient:
+        return self.__http
+
+    def close(self) -> None:
+        self.__browser_pool.close()
+        self.__http.close()
+        self.cache.close()
+
+    def cache_report(self) -> dict:
+        return {**self.cache.report(), "coalesced": self.__flight.coalesced + self.__async_flight.coalesced}
 
-    def __configure_headless(self):
+    async def aclose(self) -> None:
+        await self.__http.aclose()
+
+    @staticmethod
+    def configure_headless():
         chrome_options = Options()
         chrome_options.add_argument("--headless=new") # Runs Chrome without a UI
         chrome_options.add_argument("--window-size=1920,1080") # Optional: Specify window size
+        # Return from get() at DOMContentLoaded; load_and_wait decides when the content is there.
+        chrome_options.page_load_strategy = 'eager'
+        # Images and fonts never carry job text.
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+        })
 
         # Initialize the driver with the new options
         logger.info("Initializing Selenium WebDriver...")
@@ -24,95 +76,178 @@ class Scraper:
         return driver
 
 
-    def scrape(self, url: str) -> str | None:
+    def scrape(self, url: str, bypass_cache: bool = False) -> str | None:
         """
         Attempts to scrape using the fast method first, then falls back to Selenium.
+        Results are cached per canonical URL, and concurrent scrapes of the same
+        URL share a single fetch.
         """
-        logger.info("--- Attempting fast scrape with 'requests' ---")
-        scrape_result = self._scrape_with_request(url)
-        
-        if not scrape_result or not scrape_result.strip():
-            logger.info("\n--- 'requests' failed or returned empty. Falling back to Headless Selenium ---")
-            scrape_result = self._scrape_with_selenium(url)
-            
-        return scrape_result
+        entry = self.scrape_entry(url, bypass_cache)
+        return entry.text if entry else None
+
+    @traced("scrape")
+    def scrape_entry(self, url: str, bypass_cache: bool = False) -> ScrapeEntry | None:
+        """Like scrape, but also returns the structured posting found on the page."""
+        key = canonicalize_url(url)
+        cached = None if bypass_cache else self.cache.get(key)
+        if cached and cached.is_fresh(self.cache.fresh_for):
+            return cached
+        return self.__flight.do(key, lambda: self.__scrape_and_store(url, key, cached))
+
+    def __scrape_and_store(self, url: str, key: str, cached: ScrapeEntry | None) -> ScrapeEntry | None:
+        logger.info("--- Attempting fast scrape with the pooled HTTP client ---")
+        entry = self._scrape_with_request(url, cached)
+
+        if not entry or not entry.text.strip():
+            logger.info("\n--- HTTP fetch failed or returned empty. Falling back to Headless Selenium ---")
+            entry = self._scrape_with_selenium(url)
+
+        if entry and entry is not cached:
+            self.cache.put(key, entry)
+        return entry
     
-    def _scrape_with_request(self, url : str) -> str | None:
+    async def ascrape(self, url: str, bypass_cache: bool = False) -> str | None:
+        """
+        Async counterpart of scrape: the fast path uses httpx without blocking
+        the event loop, and the Selenium fallback runs in a worker thread.
+        """
+        entry = await self.ascrape_entry(url, bypass_cache)
+        return entry.text if entry else None
+
+    @traced("scrape")
+    async def ascrape_entry(self, url: str, bypass_cache: bool = False) -> ScrapeEntry | None:
+        """Async counterpart of scrape_entry."""
+        key = canonicalize_url(url)
+        cached = None if bypass_cache else self.cache.get(key)
+        if cached and cached.is_fresh(self.cache.fresh_for):
+            return cached
+        return await self.__async_flight.do(key, lambda: self.__ascrape_and_store(url, key, cached))
+
+    async def __ascrape_and_store(self, url: str, key: str, cached: ScrapeEntry | None) -> ScrapeEntry | None:
+        logger.info("--- Attempting fast async scrape with 'httpx' ---")
+        entry = await self._ascrape_with_request(url, cached)
+
+        if not entry or not entry.text.strip():
+            logger.info("\n--- 'httpx' failed or returned empty. Falling back to Headless Selenium ---")
+            entry = await asyncio.to_thread(self._scrape_with_selenium, url)
+
+        if entry and entry is not cached:
+            self.cache.put(key, entry)
+        return entry
+
+    @traced("scrape.request")
+    async def _ascrape_with_request(self, url: str, cached: ScrapeEntry | None = None) -> ScrapeEntry | None:
+        try:
+            res = await self.__http.aget(url, headers=cached.validators() if cached else None)
+        except Exception as e:
+            logger.error(f"Error while scraping with httpx: {e}")
+            return self.__stale(cached)
+        if cached and res.status_code == 304:
+            return self.__not_modified(cached)
+        if cached and res.status_code >= 500:
+            return self.__stale(cached)
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            res = requests.get(url=url, headers=headers, timeout=10)
-            res.raise_for_status()
-            return Scraper._soup_and_extract(res.text)
+            Scraper._raise_for_status(res)
+            with span("scrape.extract"):
+                text, posting = await self.__cpu_pool.run(analyze_page, res.text, url)
+            return self.__fetched(Scraper._checked(text), posting, res.headers)
         except Exception as e:
-            logger.error(f"Error while scraping with requests: {e}")
+            logger.error(f"Error while scraping with httpx: {e}")
             return None
-          
-    def _scrape_with_selenium(self, url : str) -> str | None:
+
+    @traced("scrape.request")
+    def _scrape_with_request(self, url : str, cached: ScrapeEntry | None = None) -> ScrapeEntry | None:
+        try:
+            res = self.__http.get(url, headers=cached.validators() if cached else None)
+        except Exception as e:
+            logger.error(f"Error while scraping with httpx: {e}")
+            return self.__stale(cached)
+        if cached and res.status_code == 304:
+            return self.__not_modified(cached)
+        if cached and res.status_code >= 500:
+            return self.__stale(cached)
+        try:
+            Scraper._raise_for_status(res)
+            return self.__fetched(*self._extract(res.text, url), res.headers)
+        except Exception as e:
+            logger.error(f"Error while scraping with httpx: {e}")
+            return None
+
+    @staticmethod
+    def _raise_for_status(res: FetchResult) -> None:
+        if res.status_code >= 400:
+            raise RuntimeError(f"HTTP {res.status_code} for {res.url}")
+
+    def __not_modified(self, cached: ScrapeEntry) -> ScrapeEntry:
+        self.cache.counters["revalidations"] += 1
+        self.cache.counters["not_modified"] += 1
+        return cached.revalidated()
+
+    def __stale(self, cached: ScrapeEntry | None) -> ScrapeEntry | None:
         """
-        Uses headless Selenium with a generic waiting strategy.
+        The cached copy when revalidating it failed (network error or 5xx):
+        stale text beats a Selenium launch. It stays stale, so the next
+        request tries again.
         """
-        # Configure headless options ---
-        logger.info("Configuring headless Selenium with ChromeOptions...")
-        
+        if cached is None:
+            return None
+        self.cache.counters["revalidations"] += 1
+        self.cache.counters["stale_served"] += 1
+        logger.warning("Could not revalidate the cached page; serving the stale copy.")
+        return cached
 
+    def __fetched(self, text: str | None, posting: dict | None, headers) -> ScrapeEntry | None:
+        self.cache.counters["fetches"] += 1
+        if not text:
+            return None
+        return ScrapeEntry(text=text, etag=headers.get('ETag'), last_modified=headers.get('Last-Modified'), posting=posting)
+          
+    @traced("scrape.selenium")
+    def _scrape_with_selenium(self, url : str) -> ScrapeEntry | None:
+        """
+        Uses headless Selenium, returning as soon as the job description has
+        rendered (see page_wait) instead of after a fixed delay.
+        """
         html_content = None
         try:
-            self.__driver.get(url)
-            logger.info("Waiting for page to load in headless mode...")
-            WebDriverWait(self.__driver, 20).until(
-                lambda d: d.execute_script("return document.readyState") == 'complete'
-            )
-            time.sleep(2)
-            
-            logger.info("Content loaded successfully.")
-            html_content = self.__driver.page_source
-
-        except TimeoutException:
-            logger.warning("Timed out waiting for page to load.")
-            html_content = self.__driver.page_source
+            with self.__browser_pool.lease() as driver:
+                result = load_and_wait(driver, url)
+                logger.info(f"Page ready after {result.seconds:.2f}s ({result.reason}).")
+                html_content = driver.page_source
         except Exception as e:
             logger.error(f"An error occurred during Selenium scraping: {e}")
-        finally:
-            self.__driver.quit()
         
-        if html_content:
-            return Scraper._soup_and_extract(html_content)
-        return None
+        text, posting = self._extract(html_content, url)
+        return ScrapeEntry(text=text, posting=posting) if text else None
+
+    def _extract(self, html_content: str | None, url: str | None = None) -> Tuple[str | None, dict | None]:
+        """
+        Extracts the page text and any structured posting (JSON-LD or a known
+        board's markup), in the CPU pool when one is configured.
+        """
+        if not html_content:
+            return None, None
+        with span("scrape.extract"):
+            text, posting = self.__cpu_pool.call(analyze_page, html_content, url)
+        return Scraper._checked(text), posting
 
     @staticmethod
     def _soup_and_extract(html_content: str | None) -> str | None:
         if not html_content:
             return None
-            
-        soup = BeautifulSoup(html_content, 'html.parser')
-        body_tag = soup.find('body')
-
-        if body_tag:
-            full_text = Scraper.extract_text_recursively(body_tag)
-            final_text = ' '.join(full_text.split())
-            return final_text
-        
-        logger.warning("Warning: No <body> tag found in the HTML content.")
-        return None
+        return Scraper._checked(extract_text(html_content))
 
     @staticmethod
-    def extract_text_recursively(element):
-        if isinstance(element, NavigableString):
-            text = element.strip()
-            return text + ' ' if text else ''
-        if element.name in ['script', 'style', 'header', 'footer', 'nav']:
-            return ''
-        text_content = ''
-        for child in element.children:
-            text_content += Scraper.extract_text_recursively(child)
-        return text_content
+    def _checked(final_text: str | None) -> str | None:
+        if final_text is None:
+            logger.warning("Warning: No <body> tag found in the HTML content.")
+        return final_text
 
 
 if __name__ == '__main__':
     url = "https://www.linkedin.com/jobs/view/4278200847/?alternateChannel=search&eBP=CwEAAAGYgq8JD6GsDDh7vXI3HzbNam1QyF-JEI-4ECD26N8pGD13VEzd1lz1gAZrzQZxdWs9NSDOIM6RFD1GkpPK47m9biT-pHFUbvX78EsL3-E3XMzSI81b7sKvn8bZ0-lVtNYQm4O_kacLZcK61gCynLvYxfiBDeJbQr0UoGucL_bTNFe0gfj4WPJmx5GyMJmTfyHmBqggexEHDENTUgHvbeqF7nFJFH6nosheFSyesDYdHmf2OyOQUt9UnlV3oayCqCeWAN_qewQvgh3yIKLpgbalRI8yYghURu_07SZ8j2ddcAOjUFlvIfyILFErC-0rvwAXRId54WkVFnGg17dGJprmoQyvzFkIYsEKM36QKT_SBZBgK1xAQKd3ew0NUTLxqNBpltz4zaTL1MRHWfnZuAe1EnY9tDACUpfNZttIz_5CZ1PPlxDBBI8x45T7crPGG7AHaxhflTiW5dLSrY4UnQQENohy3SshXW1iWw&refId=FJ1FlVuOiHi5vc1YAXoyjQ%3D%3D&trackingId=OrgjObJiq9sYZTLich8Ogw%3D%3D&lipi=urn%3Ali%3Apage%3Ad_flagship3_jobs_discovery_jymbii%3By%2FeEXZjZR%2BWZKtcQ%2Bnia4w%3D%3D"
     scraper = Scraper()
     data = scraper.scrape(url)
+    scraper.close()
     logger.info("\n--- FINAL SCRAPED DATA ---")
     logger.info(data)
\ No newline at end of file
@@ -1,12 +1,25 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from dotenv import load_dotenv
+from loguru import logger
+import copy
 import os
 
 
-from pydantic import BaseModel, Field
-from typing import Literal
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Dict, Literal
+
+from app.core.cache import TieredCache, content_hash
+from app.core.llm_providers import create_llm
+from app.core.prompts import escape_braces, format_instructions
+from app.core.telemetry import instrument_llm, span, traced
+from app.tools.jd_condenser import CONDENSER_VERSION, condense
+from app.tools.jd_extractors import STATED_FIELDS, is_complete, is_current
+
+JD_CONDENSE_ENABLED = os.getenv('JD_CONDENSE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# Use the JobPosting fields scraped pages state outright instead of asking the LLM for them.
+JD_EXTRACT_ENABLED = os.getenv('JD_EXTRACT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
 
 class JobListing(BaseModel):
     title: str = Field(..., description="The title of the job position.")
@@ -43,33 +56,145 @@ Respond only with the JSON object.
 """
 ""
 
+def normalize_jd(jd: str) -> str:
+    """Collapses whitespace so trivially different copies of a posting share a cache key."""
+    return ' '.join(jd.split())
+
+
 class JD2JSON():
-    def __init__(self, system_msg_str: str = SYSTEM_MESSAGE) -> None:
+    def __init__(
+        self,
+        system_msg_str: str = SYSTEM_MESSAGE,
+        cache: TieredCache | None = None,
+        condense_enabled: bool = JD_CONDENSE_ENABLED,
+        llm: BaseChatModel | None = None,
+        extract_enabled: bool = JD_EXTRACT_ENABLED,
+    ) -> None:
         load_dotenv()
-        self.__llm = ChatGoogleGenerativeAI(model='gemini-2.0-flash', google_api_key=os.getenv('GOOGLE_API_KEY'))
+        self.__llm = instrument_llm(llm or create_llm('gemini-2.0-flash'))
         self._system_message_str = system_msg_str
         self.__parser = JsonOutputParser(pydantic_object=JobListing)
-        self.__prompt_template: ChatPromptTemplate | None = None
-        self.__chain = None
+        # Compiled once; the JD is a template variable, so its braces need no escaping.
+        self.__chain = self._create_prompt(system_msg_str) | self.__llm | self.__parser
+        # Conversions are keyed by the JD text plus everything that shapes the
+        # output, so changing the prompt, schema or model invalidates old entries.
+        self.cache = cache or TieredCache.from_env('JD', maxsize=512, ttl=7 * 24 * 3600)
+        self.condense_enabled = condense_enabled
+        self.condense_totals = {"requests": 0, "tokens_in": 0, "tokens_out": 0}
+        self.extract_enabled = extract_enabled
+        # complete: no LLM call; partial: LLM output overlaid with page fields; none: LLM only.
+        self.extract_totals = {"requests": 0, "complete": 0, "partial": 0, "none": 0}
+        self.__cache_namespace = content_hash(
+            system_msg_str, JobListing.model_json_schema(), getattr(self.__llm, 'model', ''),
+            CONDENSER_VERSION if condense_enabled else None,
+        )
+
+    def cache_key(self, jd: str) -> str:
+        return content_hash(self.__cache_namespace, normalize_jd(jd))
+
+    def prepare(self, jd: str, source_url: str | None = None) -> str:
+        """
+        Strips page boilerplate from the JD before it is sent to the LLM and
+        records how many prompt tokens that saved.
+        """
+        if not self.condense_enabled:
+            return jd
+        with span("jd2json.condense"):
+            result = condense(jd, source_url)
+        self.condense_totals["requests"] += 1
+        self.condense_totals["tokens_in"] += result.original_tokens
+        self.condense_totals["tokens_out"] += result.condensed_tokens
+        logger.info(
+            f"Condensed JD {result.original_tokens} -> {result.condensed_tokens} tokens "
+            f"({result.reduction_ratio:.0%} saved, rules: {', '.join(result.rules) or 'none'})"
+        )
+        return result.text
+
+    def extract_report(self) -> Dict[str, Any]:
+        requests = self.extract_totals["requests"]
+        return {**self.extract_totals, "llm_skip_rate": self.extract_totals["complete"] / requests if requests else 0.0}
+
+    def __from_posting(self, posting: Dict[str, Any] | None) -> dict | None:
+        """The listing straight from the page's structured posting, when it has every field."""
+        self.extract_totals["requests"] += 1
+        if not self.extract_enabled or not is_current(posting) or not is_complete(posting):
+            return None
+        try:
+            listing = JobListing(**{"preferred_qualifications": "", **posting["fields"]}).model_dump()
+        except ValidationError as e:
+            logger.warning(f"Extracted posting is not a valid JobListing, asking the LLM: {e}")
+            return None
+        self.extract_totals["complete"] += 1
+        logger.info(f"JD extracted from {', '.join(posting.get('sources', []))}; skipping the LLM.")
+        return listing
+
+    def __merged(self, result: dict, posting: Dict[str, Any] | None) -> dict:
+        """Overlays the fields the page states outright (STATED_FIELDS) on the LLM's answer."""
+        fields = posting["fields"] if self.extract_enabled and is_current(posting) else {}
+        stated = {k: v for k, v in fields.items() if k in STATED_FIELDS}
+        if not stated or not isinstance(result, dict):
+            self.extract_totals["none"] += 1
+            return result
+        self.extract_totals["partial"] += 1
+        return {**result, **stated}
 
-    def _create_prompt(self, system_message: str, human_message: str) -> ChatPromptTemplate:
-        safe_format_instructions = self.__parser.get_format_instructions().replace("{", "{{").replace("}", "}}")
-        
+    def __cached(self, key: str) -> dict | None:
+        result = self.cache.get(key)
+        return copy.deepcopy(result) if result is not None else None
+
+    def __store(self, key: str, result: dict) -> None:
+        if result:
+            self.cache.set(key, copy.deepcopy(result))
+
+    def _create_prompt(self, system_message: str) -> ChatPromptTemplate:
+        """The conversion prompt; the JD is passed as {jd} at call time."""
         return ChatPromptTemplate.from_messages(
             [
-                ("system", system_message + "\n\n" + safe_format_instructions),
-                ("human", human_message)
+                ("system", escape_braces(system_message + "\n\n" + format_instructions(JobListing))),
+                ("human", "{jd}")
             ]
         )
 
+    @traced("jd2json.convert")
+    def convert(
+        self, jd: str, bypass_cache: bool = False, source_url: str | None = None, posting: Dict[str, Any] | None = None
+    ) -> JobListing:
+        """
+        posting is the structured data found on the scraped page (see
+        jd_extractors): when complete it is the answer, otherwise the fields
+        the page states verbatim take precedence over the LLM's.
+        """
+        if (listing := self.__from_posting(posting)) is not None:
+            return listing
+        return self.__merged(self.__convert(jd, bypass_cache, source_url), posting)
+
+    def __convert(self, jd: str, bypass_cache: bool, source_url: str | None) -> dict:
+        jd = self.prepare(jd, source_url)
+        key = self.cache_key(jd)
+        if not bypass_cache and (cached := self.__cached(key)) is not None:
+            return cached
+        with span("llm.jd2json"):
+            result = self.__chain.invoke({"jd": jd})
+        self.__store(key, result)
+        return result
 
-    def __generate_chain(self, llm: ChatGoogleGenerativeAI, prompt: ChatPromptTemplate):
-        return prompt | llm | self.__parser
+    @traced("jd2json.convert")
+    async def aconvert(
+        self, jd: str, bypass_cache: bool = False, source_url: str | None = None, posting: Dict[str, Any] | None = None
+    ) -> JobListing:
+        if (listing := self.__from_posting(posting)) is not None:
+            return listing
+        return self.__merged(await self.__aconvert(jd, bypass_cache, source_url), posting)
 
-    def convert(self, jd: str) -> JobListing:
-        self.__prompt_template = self._create_prompt(self._system_message_str, jd)
-        self.__chain = self.__generate_chain(self.__llm, self.__prompt_template)
-        return self.__chain.invoke({})
+    async def __aconvert(self, jd: str, bypass_cache: bool, source_url: str | None) -> dict:
+        jd = self.prepare(jd, source_url)
+        key = self.cache_key(jd)
+        if not bypass_cache and (cached := self.__cached(key)) is not None:
+            return cached
+        with span("llm.jd2json"):
+            result = await self.__chain.ainvoke({"jd": jd})
+        self.__store(key, result)
+        return result
     
 if __name__ == '__main__':
     jd_2_json = JD2JSON(SYSTEM_MESSAGE)
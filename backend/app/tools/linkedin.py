@@ -1,53 +1,252 @@
-from langchain_brightdata import BrightDataWebScraperAPI
+import asyncio
 from dotenv import load_dotenv
 import os
-from typing import Dict
+from threading import Lock, Thread
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from loguru import logger
+
+from app.core.cache import AsyncSingleFlight, SingleFlight
+from app.core.telemetry import traced
+from app.tools.brightdata import LINKEDIN_PERSON_DATASET, BrightDataClient
+from app.tools.profile_cache import ProfileCache, ProfileEntry, normalize_profile_url
 import json
 
 load_dotenv()
 
+# Profiles per dataset request when looking up several at once.
+LINKEDIN_BATCH_SIZE = int(os.getenv('LINKEDIN_BATCH_SIZE', '20'))
+
+
+def _record_url(record: Dict[str, Any]) -> str | None:
+    source = record.get('input')
+    if isinstance(source, dict) and source.get('url'):
+        return source['url']
+    return record.get('input_url') or record.get('url')
+
+
 class LinkedIn:
-    def __init__(self):
-        self.wrapper: BrightDataWebScraperAPI | None = self.__get_wrapper()
-        
-    
-    def __get_wrapper(self) -> BrightDataWebScraperAPI | None:
+    def __init__(
+        self,
+        client: BrightDataClient | None = None,
+        cache: ProfileCache | None = None,
+        dataset_id: str = LINKEDIN_PERSON_DATASET,
+    ):
+        self.client: BrightDataClient | None = client or self.__get_client()
+        self.dataset_id = dataset_id
+        # Recruiters at large companies are looked up by many users.
+        self.cache = cache or ProfileCache()
+        self.__flight = SingleFlight()
+        self.__async_flight = AsyncSingleFlight()
+        self.__lock = Lock()
+        self.__refreshing: set = set()
+        self.__background: set = set()
+
+    def __get_client(self) -> BrightDataClient | None:
         key = os.getenv('BRIGHT_DATA_API_KEY')
         if not key:
             return None
-        from pydantic import SecretStr
-        return BrightDataWebScraperAPI(bright_data_api_key=SecretStr(key))
-        
+        return BrightDataClient(api_key=key)
+
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+        self.cache.close()
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+
+    def _cached(self, key: str) -> Tuple[str, ProfileEntry | None]:
+        """'fresh', 'stale' (serve it, refresh in the background) or 'miss'."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return 'miss', None
+        if entry.is_fresh(self.cache.fresh_for, self.cache.negative_for):
+            self.cache.counters["negative_hits" if entry.negative else "fresh_hits"] += 1
+            return 'fresh', entry
+        if entry.negative:
+            return 'miss', None
+        self.cache.counters["stale_hits"] += 1
+        return 'stale', entry
+
+    @staticmethod
+    def _chunks(links: Sequence[str]) -> Iterable[List[str]]:
+        for i in range(0, len(links), LINKEDIN_BATCH_SIZE):
+            yield list(links[i:i + LINKEDIN_BATCH_SIZE])
+
+    def _store(self, links: List[str], records: List[Dict[str, Any]] | None) -> Dict[str, Dict | None]:
+        """
+        Matches the dataset records to the requested profiles and caches a
+        summary for each. records is None when the request itself failed.
+        A failure never replaces a (stale) profile that is already cached.
+        """
+        keys = [normalize_profile_url(link) for link in links]
+        found: Dict[str, Dict[str, Any]] = {}
+        for record in records or []:
+            url = _record_url(record)
+            if url and normalize_profile_url(url) in keys and not record.get('error'):
+                found[normalize_profile_url(url)] = record
+        if records and not found and len(records) == len(keys):
+            # Records without their input URL come back in request order.
+            found = {key: r for key, r in zip(keys, records) if not r.get('error')}
+
+        summaries = {}
+        for key in keys:
+            summary = self._compile_summary(found.get(key))
+            previous = self.cache.get(key) if not summary else None
+            if previous is not None and not previous.negative:
+                summaries[key] = previous.summary
+                continue
+            self.cache.put(key, ProfileEntry(summary=summary))
+            summaries[key] = summary
+        self.cache.counters["profiles_fetched"] += len(found)
+        return summaries
+
+    def _fetch(self, links: List[str]) -> Dict[str, Dict | None]:
+        summaries = {}
+        for chunk in self._chunks(links):
+            try:
+                self.cache.counters["api_requests"] += 1
+                records = self.client.scrape(self.dataset_id, chunk)
+            except Exception as e:
+                logger.error(f"Error while looking up {len(chunk)} LinkedIn profile(s): {e}")
+                self.cache.counters["failures"] += 1
+                records = None
+            summaries.update(self._store(chunk, records))
+        return summaries
+
+    async def _afetch(self, links: List[str]) -> Dict[str, Dict | None]:
+        summaries = {}
+        for chunk in self._chunks(links):
+            try:
+                self.cache.counters["api_requests"] += 1
+                records = await self.client.ascrape(self.dataset_id, chunk)
+            except Exception as e:
+                logger.error(f"Error while looking up {len(chunk)} LinkedIn profile(s): {e}")
+                self.cache.counters["failures"] += 1
+                records = None
+            summaries.update(self._store(chunk, records))
+        return summaries
+
+    def __claim_refresh(self, links: List[str]) -> List[str]:
+        """The links not already being refreshed, now marked as in progress."""
+        with self.__lock:
+            claimed = [link for link in links if normalize_profile_url(link) not in self.__refreshing]
+            self.__refreshing.update(normalize_profile_url(link) for link in claimed)
+        self.cache.counters["refreshes"] += len(claimed)
+        return claimed
+
+    def __release_refresh(self, links: List[str]) -> None:
+        with self.__lock:
+            self.__refreshing.difference_update(normalize_profile_url(link) for link in links)
+
+    def __refresh_in_background(self, links: List[str]) -> None:
+        links = self.__claim_refresh(links)
+        if not links:
+            return
+
+        def refresh():
+            try:
+                self._fetch(links)
+            finally:
+                self.__release_refresh(links)
+        Thread(target=refresh, name="linkedin-refresh", daemon=True).start()
+
+    def __arefresh_in_background(self, links: List[str]) -> None:
+        links = self.__claim_refresh(links)
+        if not links:
+            return
+
+        async def refresh():
+            try:
+                await self._afetch(links)
+            finally:
+                self.__release_refresh(links)
+        task = asyncio.ensure_future(refresh())
+        self.__background.add(task)
+        task.add_done_callback(self.__background.discard)
+
+    def _plan(self, profile_links: Iterable[str]) -> Tuple[Dict[str, Dict], Dict[str, List[str]], List[str], List[str]]:
+        """Splits links into cached summaries, links to fetch now and stale links to refresh."""
+        by_key: Dict[str, List[str]] = {}
+        for link in profile_links:
+            if link:
+                by_key.setdefault(normalize_profile_url(link), []).append(link)
+        summaries, misses, stale = {}, [], []
+        for key, links in by_key.items():
+            state, entry = self._cached(key)
+            if state == 'miss':
+                misses.append(links[0])
+                continue
+            if state == 'stale':
+                stale.append(links[0])
+            summaries.update({link: entry.summary or {} for link in links})
+        return summaries, by_key, misses, stale
+
+    @staticmethod
+    def _fill(summaries: Dict[str, Dict], by_key: Dict[str, List[str]], fetched: Dict[str, Dict | None]) -> Dict[str, Dict]:
+        for key, summary in fetched.items():
+            summaries.update({link: summary or {} for link in by_key.get(key, [])})
+        return summaries
+
+    @traced("linkedin.search")
     def search(self, profile_link : str):
         """Fetch the details of the linkedIN profile and extract important information for LLM"""
-        # with open('C:\\Machine Learning\\my-email-generator\\app\\result.json', 'r') as f:
-        #     linkedin_results = json.loads(f.read())
-        # f.close()
-        # summary = self._compile_summary(linkedin_results)
-        # return summary
-        if not self.wrapper or not profile_link:
-            print(f"Cant Search , Wrapper {self.wrapper}, profile_url : {profile_link}")
+        if not self.client or not profile_link:
+            print(f"Cant Search , Client {self.client}, profile_url : {profile_link}")
             return
-        args = {
-            "url": profile_link,
-            "dataset_type": "linkedin_person_profile",
-        }
-        try:
-            linkedin_results = self.wrapper.invoke(args)
-            # with open('result.json' , 'w') as f:
-            #     f.write(json.dumps(linkedin_results))
-            # f.close()
-            summary = self._compile_summary(linkedin_results)
-            return summary
-        except Exception as e:
-            print(f'Error Occuered while searching for linkedIN profile : {e}')
+        key = normalize_profile_url(profile_link)
+        state, entry = self._cached(key)
+        if state == 'stale':
+            self.__refresh_in_background([profile_link])
+        if state != 'miss':
+            return entry.summary or {}
+        return self.__flight.do(key, lambda: self._fetch([profile_link])[key]) or {}
+
+    @traced("linkedin.search")
+    async def asearch(self, profile_link : str):
+        """Async counterpart of search."""
+        if not self.client or not profile_link:
+            print(f"Cant Search , Client {self.client}, profile_url : {profile_link}")
+            return
+        key = normalize_profile_url(profile_link)
+        state, entry = self._cached(key)
+        if state == 'stale':
+            self.__arefresh_in_background([profile_link])
+        if state != 'miss':
+            return entry.summary or {}
+        return (await self.__async_flight.do(key, lambda: self._afetch([profile_link])))[key] or {}
+
+    @traced("linkedin.search_many")
+    def search_many(self, profile_links: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Summaries for several profiles keyed by the links as given. Cached
+        profiles are served from the cache and every miss is fetched in one
+        dataset request (per LINKEDIN_BATCH_SIZE profiles).
+        """
+        if not self.client:
+            return {}
+        summaries, by_key, misses, stale = self._plan(profile_links)
+        if stale:
+            self.__refresh_in_background(stale)
+        return self._fill(summaries, by_key, self._fetch(misses) if misses else {})
+
+    @traced("linkedin.search_many")
+    async def asearch_many(self, profile_links: Iterable[str]) -> Dict[str, Dict]:
+        """Async counterpart of search_many."""
+        if not self.client:
             return {}
+        summaries, by_key, misses, stale = self._plan(profile_links)
+        if stale:
+            self.__arefresh_in_background(stale)
+        return self._fill(summaries, by_key, await self._afetch(misses) if misses else {})
     
     def _compile_summary(self, summary: Dict):
         if not summary:
             return None
 
-        experiences = summary.get('experience', [])
+        experiences = summary.get('experience') or []
         current_experience = experiences[0] if experiences else {}
 
         final_summary = {
@@ -58,8 +257,8 @@ class LinkedIn:
             "current_company": current_experience.get('company_name'),
             "current_role": current_experience.get('position'),
             # Adding enhanced fields
-            "education": summary.get('education', []), # List of educational institutions
-            "recent_activity": summary.get('posts', [])[:2], # Get the 2 most recent posts
+            "education": summary.get('education') or [], # List of educational institutions
+            "recent_activity": (summary.get('posts') or [])[:2], # Get the 2 most recent posts
             "past_companies": [exp.get('company_name') for exp in experiences[1:]] # List of previous companies
         }
         
@@ -0,0 +1,170 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Tuple
+from urllib.parse import urlsplit
+
+from loguru import logger
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Overall budget for one Selenium scrape: page load plus waiting for content.
+SELENIUM_DEADLINE = float(os.getenv('SELENIUM_DEADLINE', '15'))
+SELENIUM_POLL_INTERVAL = float(os.getenv('SELENIUM_POLL_INTERVAL', '0.1'))
+# Without a matching container, the page counts as rendered once its body
+# text has stopped changing for this long (twice as long when it is shorter
+# than SELENIUM_MIN_TEXT, which is usually a "Loading..." shell).
+SELENIUM_STABLE_SECONDS = float(os.getenv('SELENIUM_STABLE_SECONDS', '0.5'))
+# A matched description container with this much text ends the wait at once;
+# a shorter one once the page has loaded or its text stops changing.
+SELENIUM_MIN_TEXT = int(os.getenv('SELENIUM_MIN_TEXT', '200'))
+
+# Sub-resources that never carry job text; blocked through CDP per tab.
+BLOCKED_URL_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+)
+
+
+@dataclass(frozen=True)
+class WaitRule:
+    name: str
+    hosts: Tuple[str, ...]
+    # CSS selectors of the job description container, most specific first.
+    selectors: Tuple[str, ...]
+
+
+WAIT_RULES = (
+    WaitRule(
+        name="linkedin",
+        hosts=("linkedin.com",),
+        selectors=(".show-more-less-html__markup", ".description__text", ".jobs-description__content"),
+    ),
+    WaitRule(
+        name="greenhouse",
+        hosts=("greenhouse.io",),
+        selectors=(".job__description", "#content", "#app_body .content"),
+    ),
+    WaitRule(
+        name="lever",
+        hosts=("lever.co",),
+        selectors=("[data-qa='job-description']", ".posting-page .section-wrapper", ".content .section"),
+    ),
+    WaitRule(
+        name="workday",
+        hosts=("myworkdayjobs.com", "workday.com"),
+        selectors=("[data-automation-id='jobPostingDescription']",),
+    ),
+)
+
+# One round trip per poll: the first matching container's text length, plus
+# the state needed for the stability fallback.
+_PROBE_SCRIPT = """
+const selectors = arguments[0];
+for (const selector of selectors) {
+    const el = document.querySelector(selector);
+    if (el) return {selector: selector, length: (el.innerText || '').length, ready: document.readyState};
+}
+return {selector: null, length: document.body ? (document.body.innerText || '').length : 0, ready: document.readyState};
+"""
+
+
+def wait_rule_for_url(url: str | None) -> WaitRule | None:
+    if not url:
+        return None
+    host = (urlsplit(url).hostname or "").lower()
+    for rule in WAIT_RULES:
+        if any(host == h or host.endswith("." + h) for h in rule.hosts):
+            return rule
+    return None
+
+
+@dataclass
+class WaitResult:
+    # 'selector', 'stable' or 'deadline'
+    reason: str
+    seconds: float
+    selector: str | None = None
+
+
+class ContentReady:
+    """
+    WebDriverWait condition that is met as soon as the site's description
+    container holds enough text, once a shorter container's page has loaded
+    or its text has stopped changing, or, without a container, once the page
+    is loaded and its body text has stopped changing for `stable_seconds`
+    (twice that for a body shorter than `min_text`).
+    """
+    def __init__(self, rule: WaitRule | None, min_text: int = SELENIUM_MIN_TEXT, stable_seconds: float = SELENIUM_STABLE_SECONDS) -> None:
+        self.selectors = list(rule.selectors) if rule else []
+        self.min_text = min_text
+        self.stable_seconds = stable_seconds
+        self.__last_length = -1
+        self.__stable_since = 0.0
+        self.matched: str | None = None
+
+    def __call__(self, driver: Any) -> str | bool:
+        probe = driver.execute_script(_PROBE_SCRIPT, self.selectors) or {}
+        length = probe.get("length", 0)
+        if probe.get("selector") and length >= self.min_text:
+            self.matched = probe["selector"]
+            return "selector"
+
+        now = time.monotonic()
+        if length != self.__last_length:
+            self.__last_length = length
+            self.__stable_since = now
+            return False
+        stable_for = now - self.__stable_since
+        loaded = probe.get("ready") == "complete"
+        # The posting itself is just short.
+        if probe.get("selector") and length and (loaded or stable_for >= self.stable_seconds):
+            self.matched = probe["selector"]
+            return "selector"
+        # A short body may be a "Loading..." shell, so it has to hold still for longer.
+        window = self.stable_seconds if length >= self.min_text else 2 * self.stable_seconds
+        if loaded and stable_for >= window:
+            return "stable"
+        return False
+
+
+def block_heavy_resources(driver: Any) -> None:
+    """Stops the current tab from downloading images, fonts and media (Chromium only)."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+    except (AttributeError, WebDriverException) as e:
+        logger.debug(f"Could not block heavy resources: {e}")
+
+
+def load_and_wait(
+    driver: Any,
+    url: str,
+    deadline: float = SELENIUM_DEADLINE,
+    poll_interval: float = SELENIUM_POLL_INTERVAL,
+    site_url: str | None = None,
+) -> WaitResult:
+    """
+    Opens the URL and returns as soon as the job description has rendered,
+    never spending more than `deadline` seconds on load and wait together.
+    On a deadline the caller still gets whatever the page shows by then.
+    site_url picks the wait rule when it differs from url (e.g. a mirror).
+    """
+    start = time.monotonic()
+    block_heavy_resources(driver)
+    try:
+        driver.set_page_load_timeout(deadline)
+        driver.get(url)
+    except TimeoutException:
+        logger.warning(f"Page load exceeded {deadline:.1f}s; using the partial page.")
+        return WaitResult("deadline", time.monotonic() - start)
+
+    condition = ContentReady(wait_rule_for_url(site_url or url))
+    remaining = max(0.0, deadline - (time.monotonic() - start))
+    try:
+        reason = WebDriverWait(driver, remaining, poll_frequency=poll_interval).until(condition)
+    except TimeoutException:
+        reason = "deadline"
+        logger.warning(f"Content did not settle within {deadline:.1f}s; using the partial page.")
+    return WaitResult(reason, time.monotonic() - start, condition.matched)
@@ -0,0 +1,80 @@
+import os
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+from app.core.cache import TieredCache
+from app.tools.scrape_cache import canonicalize_url
+
+# Profiles are served without a refetch for this long, then served stale
+# while one background lookup refreshes them.
+LINKEDIN_CACHE_FRESH_SECONDS = float(os.getenv('LINKEDIN_CACHE_FRESH_SECONDS', str(24 * 3600)))
+# Failed lookups and empty profiles are remembered for this long.
+LINKEDIN_NEGATIVE_TTL = float(os.getenv('LINKEDIN_NEGATIVE_TTL', '3600'))
+
+
+def normalize_profile_url(url: str) -> str:
+    """
+    One key per LinkedIn member: country subdomains (in.linkedin.com),
+    letter case, query strings, fragments and trailing slashes are dropped,
+    e.g. https://www.linkedin.com/in/jane-doe. Other URLs are canonicalised.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    segments = [s for s in parts.path.split('/') if s]
+    if (host == 'linkedin.com' or host.endswith('.linkedin.com')) and len(segments) >= 2 and segments[0].lower() == 'in':
+        return f"https://www.linkedin.com/in/{segments[1].lower()}"
+    return canonicalize_url(url)
+
+
+@dataclass
+class ProfileEntry:
+    # LinkedIn._compile_summary output; None for a failed lookup or empty profile.
+    summary: Dict[str, Any] | None
+    fetched_at: float = field(default_factory=time.time)
+
+    @property
+    def negative(self) -> bool:
+        return not self.summary
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, fresh_for: float, negative_for: float) -> bool:
+        return self.age() < (negative_for if self.negative else fresh_for)
+
+
+class ProfileCache:
+    """
+    Recruiter profile summaries keyed by normalised profile URL. Positive
+    entries are fresh for `fresh_for` seconds and then served stale (while
+    a refresh runs) until the underlying cache drops them; negative entries
+    are trusted for `negative_for` seconds and never served stale.
+    """
+    def __init__(
+        self,
+        cache: TieredCache | None = None,
+        fresh_for: float = LINKEDIN_CACHE_FRESH_SECONDS,
+        negative_for: float = LINKEDIN_NEGATIVE_TTL,
+    ) -> None:
+        self.cache = cache or TieredCache.from_env('LINKEDIN', maxsize=1024, ttl=7 * 24 * 3600)
+        self.fresh_for = fresh_for
+        self.negative_for = negative_for
+        self.counters = {
+            "fresh_hits": 0, "stale_hits": 0, "negative_hits": 0, "refreshes": 0,
+            "api_requests": 0, "profiles_fetched": 0, "failures": 0,
+        }
+
+    def get(self, key: str) -> ProfileEntry | None:
+        data = self.cache.get(key)
+        return ProfileEntry(**data) if data else None
+
+    def put(self, key: str, entry: ProfileEntry) -> None:
+        self.cache.set(key, asdict(entry), ttl=self.negative_for if entry.negative else None)
+
+    def report(self) -> Dict[str, Any]:
+        return {**self.cache.report(), **self.counters}
+
+    def close(self) -> None:
+        self.cache.close()
@@ -0,0 +1,44 @@
+import hashlib
+import os
+import time
+from typing import Any, Dict
+
+from app.core.cache import TieredCache
+
+# Longer extracted texts are not cached (they are almost certainly not a resume).
+RESUME_CACHE_MAX_CHARS = int(os.getenv('RESUME_CACHE_MAX_CHARS', '100000'))
+
+
+def resume_id_for(contents: bytes) -> str:
+    """The resume_id handed to clients: the SHA-256 of the uploaded PDF."""
+    return hashlib.sha256(contents).hexdigest()
+
+
+class ResumeCache:
+    """
+    Extracted resume text keyed by resume_id, so a resume uploaded once can
+    be referenced by id in later requests. Eviction is LRU + TTL through the
+    underlying TieredCache (RESUME_CACHE_SIZE / RESUME_CACHE_TTL / RESUME_CACHE_DB).
+    """
+    def __init__(self, cache: TieredCache | None = None, max_chars: int = RESUME_CACHE_MAX_CHARS) -> None:
+        self.cache = cache or TieredCache.from_env('RESUME', maxsize=256, ttl=30 * 24 * 3600)
+        self.max_chars = max_chars
+        self.counters = {"parses": 0, "too_large": 0}
+
+    def get(self, resume_id: str) -> str | None:
+        entry = self.cache.get(resume_id)
+        return entry['text'] if entry else None
+
+    def put(self, resume_id: str, text: str) -> None:
+        if not text:
+            return
+        if len(text) > self.max_chars:
+            self.counters["too_large"] += 1
+            return
+        self.cache.set(resume_id, {'text': text, 'parsed_at': time.time()})
+
+    def report(self) -> Dict[str, Any]:
+        return {**self.cache.report(), **self.counters}
+
+    def close(self) -> None:
+        self.cache.close()
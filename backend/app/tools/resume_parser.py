@@ -1,16 +1,37 @@
-from langchain_community.document_loaders import PyPDFLoader
+import io
+import os
+from typing import BinaryIO, Union
+
+from loguru import logger
+from pypdf import PdfReader
+
+# A path on disk, the PDF bytes, or an open binary file.
+ResumeSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+RESUME_MAX_BYTES = int(os.getenv('RESUME_MAX_BYTES', str(10 * 1024 * 1024)))
+
+
+def extract_pdf_text(source: ResumeSource) -> str:
+    """
+    The text of every page, extracted the same way as langchain's PyPDFLoader
+    and joined once. A module-level function so it can run in a worker process.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    reader = PdfReader(source)
+    return "".join(page.extract_text(extraction_mode="plain").strip() for page in reader.pages)
+
 
 class ResumeParser:
     def __init__(self):
         pass
-    
-    def parse(self, path: str)->str | None:
-        if not path:
-            print("No Path specifided cannot parse")
+
+    def parse(self, source: ResumeSource) -> str | None:
+        """
+        Extracts the text of a PDF resume. Bytes and file objects are read
+        in memory, so uploads never have to be written to disk.
+        """
+        if not source:
+            logger.warning("No resume given, cannot parse")
             return None
-        loader = PyPDFLoader(path)
-        pages = loader.load()
-        resume_content = ""
-        for page in pages:
-            resume_content += page.page_content
-        return resume_content
\ No newline at end of file
+        return extract_pdf_text(source)
@@ -0,0 +1,88 @@
+import os
+import time
+from dataclasses import dataclass, asdict, field, replace
+from typing import Any, Dict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.cache import TieredCache
+
+SCRAPE_CACHE_FRESH_SECONDS = float(os.getenv('SCRAPE_CACHE_FRESH_SECONDS', '600'))
+
+# Query parameters that only identify the visit, not the page. LinkedIn job
+# URLs carry most of these (trackingId, refId, eBP, lipi, ...).
+TRACKING_PARAMS = {
+    'trackingid', 'refid', 'ebp', 'lipi', 'trk', 'trkinfo', 'alternatechannel',
+    'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'gh_src',
+}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalises a job URL so visits to the same posting share one cache entry:
+    lower-cased scheme/host, no default port, fragment or tracking params,
+    sorted query and no trailing slash on the path.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith('utm_')
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+@dataclass
+class ScrapeEntry:
+    text: str
+    etag: str | None = None
+    last_modified: str | None = None
+    # JobListing fields the page states outright (see jd_extractors), if any.
+    posting: Dict[str, Any] | None = None
+    fetched_at: float = field(default_factory=time.time)
+
+    def is_fresh(self, window: float) -> bool:
+        return time.time() - self.fetched_at < window
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def revalidated(self) -> "ScrapeEntry":
+        return replace(self, fetched_at=time.time())
+
+
+class ScrapeCache:
+    """
+    Extracted page text keyed by canonical URL. Entries are served as-is for
+    `fresh_for` seconds and afterwards revalidated with a conditional GET
+    while they remain in the underlying cache; if that GET fails, the stale
+    entry is served.
+    """
+    def __init__(self, cache: TieredCache | None = None, fresh_for: float = SCRAPE_CACHE_FRESH_SECONDS) -> None:
+        self.cache = cache or TieredCache.from_env('SCRAPE', maxsize=256, ttl=24 * 3600)
+        self.fresh_for = fresh_for
+        self.counters = {"fetches": 0, "revalidations": 0, "not_modified": 0, "stale_served": 0}
+
+    def get(self, key: str) -> ScrapeEntry | None:
+        data = self.cache.get(key)
+        return ScrapeEntry(**data) if data else None
+
+    def put(self, key: str, entry: ScrapeEntry) -> None:
+        if entry.text:
+            self.cache.set(key, asdict(entry))
+
+    def report(self) -> Dict[str, Any]:
+        return {**self.cache.report(), **self.counters}
+
+    def close(self) -> None:
+        self.cache.close()
@@ -0,0 +1,33 @@
+import asyncio
+
+from loguru import logger
+
+from app.core.email_generator import EmailGenerator
+from app.core.generation_jobs import create_worker_pool
+from app.core.job_queue import JOB_WORKERS, JobQueue
+
+
+async def main(concurrency: int = JOB_WORKERS) -> None:
+    """
+    Runs generation workers without the API, against the same job database,
+    so API and generation processes can be scaled separately. Start the API
+    with JOB_WORKERS=0 to leave all jobs to these processes.
+    """
+    generator = EmailGenerator()
+    queue = JobQueue()
+    pool = create_worker_pool(queue, generator, concurrency=max(1, concurrency))
+    pool.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+        queue.close()
+        await generator.aclose()
+
+
+if __name__ == '__main__':
+    logger.info("Starting generation workers")
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,75 @@
+"""
+Throughput of the batch endpoint against N sequential single-job calls.
+
+Each job has its own JD text, so every job needs a JD conversion, a review
+and an email. A fake chat model with a per-character delay stands in for
+Gemini (about four characters per token at --tokens-per-second). The
+sequential mode converts the JD and calls acraft_email once per job, the
+way a client looping over /api/v2/generate-email would; the batch mode is a
+single POST to /api/v2/generate-batch.
+
+    cd backend && python -m benchmarks.bench_batch --jobs 20 --tokens-per-second 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_email_generator
+from app.core.email_generator import EmailGenerator
+from app.main import create_app
+from benchmarks import common
+
+
+def job_texts(jobs: int):
+    return [f"{common.SAMPLE_JD_TEXT}\nRequisition: {i}" for i in range(jobs)]
+
+
+async def sequential(generator: EmailGenerator, jds) -> None:
+    for jd in jds:
+        jd_json = await generator.jd2json.aconvert(jd)
+        await generator.acraft_email(common.SAMPLE_RESUME_TEXT, jd_json)
+
+
+def run(jobs: int, tokens_per_second: float) -> dict:
+    sleep = 1 / (tokens_per_second * 4)
+    jds = job_texts(jobs)
+
+    start = time.perf_counter()
+    asyncio.run(sequential(EmailGenerator(llm=common.email_llm(sleep=sleep)), jds))
+    sequential_s = time.perf_counter() - start
+
+    app = create_app()
+    with TestClient(app) as client:
+        generator = EmailGenerator(llm=common.email_llm(sleep=sleep))
+        app.dependency_overrides[get_email_generator] = lambda: generator
+        body = {"resume_text": common.SAMPLE_RESUME_TEXT, "items": [{"jd_text": jd} for jd in jds]}
+        start = time.perf_counter()
+        response = client.post("/api/v2/generate-batch", json=body)
+        batch_s = time.perf_counter() - start
+        payload = response.json()
+
+    return {
+        "jobs": jobs,
+        "sequential": {"seconds": sequential_s, "jobs_per_s": jobs / sequential_s},
+        "batch": {
+            "seconds": batch_s,
+            "jobs_per_s": jobs / batch_s,
+            "succeeded": payload["succeeded"],
+            "failed": payload["failed"],
+        },
+        "speedup": sequential_s / batch_s,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--tokens-per-second", type=float, default=400)
+    args = parser.parse_args()
+    print(json.dumps(run(args.jobs, args.tokens_per_second), indent=2))
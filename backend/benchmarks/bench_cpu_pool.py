@@ -0,0 +1,101 @@
+"""
+Throughput of the CPU-bound stages with threads versus the process pool.
+
+Runs a fixed number of concurrent tasks (distinct multi-page resume PDFs
+and large job pages) through CPUPool.run from one event loop, as the API
+does, and reports tasks per second and how late a 10 ms ticker on the same
+loop fires. Threads share the GIL, so their throughput stays flat; process
+workers should scale with the number of cores, up to os.cpu_count().
+
+A second run uses a small max_pending to show how many requests the
+admission check would have turned away with a 429.
+
+    cd backend && python -m benchmarks.bench_cpu_pool --workers 0 1 2 4 --tasks 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from app.core.cpu_pool import CPUPool, CPUPoolSaturated
+from app.tools.html_text import extract_text
+from app.tools.resume_parser import extract_pdf_text
+from benchmarks import fixtures
+
+
+def workload(kind: str, tasks: int, pdf_pages: int, page_bytes: int) -> list:
+    if kind == "pdf":
+        return [(extract_pdf_text, fixtures.resume_pdf(pdf_pages, seed=i)) for i in range(tasks)]
+    return [(extract_text, fixtures.synthetic_job_page(page_bytes, seed=i)) for i in range(tasks)]
+
+
+async def _ticker(stop: asyncio.Event, lags: list, interval: float = 0.01) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def _drive(pool: CPUPool, tasks: list, admit: bool) -> dict:
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    rejected = 0
+
+    async def one(fn, arg):
+        nonlocal rejected
+        if admit:
+            try:
+                pool.check_capacity()
+            except CPUPoolSaturated:
+                rejected += 1
+                return
+        await pool.run(fn, arg)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(fn, arg) for fn, arg in tasks))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    completed = len(tasks) - rejected
+    return {
+        "seconds": round(elapsed, 3),
+        "tasks_per_second": round(completed / elapsed, 2),
+        "loop_lag_max_ms": round(max(lags, default=0) * 1000, 1),
+        "rejected_429": rejected,
+    }
+
+
+def run(workers_list, kinds, tasks: int, pdf_pages: int, page_bytes: int, max_pending: int) -> dict:
+    results = {"cpu_count": os.cpu_count()}
+    for kind in kinds:
+        items = workload(kind, tasks, pdf_pages, page_bytes)
+        results[kind] = {}
+        for workers in workers_list:
+            pool = CPUPool(workers=workers, max_pending=tasks)
+            pool.warm()
+            try:
+                label = "threads" if workers == 0 else f"processes_{workers}"
+                results[kind][label] = asyncio.run(_drive(pool, items, admit=False))
+            finally:
+                pool.close()
+        # Admission: a burst larger than max_pending is partly turned away.
+        pool = CPUPool(workers=max(workers_list), max_pending=max_pending)
+        pool.warm()
+        try:
+            results[kind][f"admission_max_pending_{max_pending}"] = asyncio.run(_drive(pool, items, admit=True))
+        finally:
+            pool.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--kinds", nargs="+", choices=["pdf", "html"], default=["pdf", "html"])
+    parser.add_argument("--tasks", type=int, default=16)
+    parser.add_argument("--pdf-pages", type=int, default=10)
+    parser.add_argument("--page-bytes", type=int, default=2_000_000)
+    parser.add_argument("--max-pending", type=int, default=4)
+    args = parser.parse_args()
+    print(json.dumps(run(args.workers, args.kinds, args.tasks, args.pdf_pages, args.page_bytes, args.max_pending), indent=2))
@@ -0,0 +1,110 @@
+"""
+Throughput (MB/s) of HTML-to-text extraction over the fixture corpus.
+
+Compares the previous BeautifulSoup recursive extractor with the streaming
+html.parser backend and, when installed, the lxml backend, and checks that
+they produce the same text, on the corpus and on small edge-case pages
+(no <body>, a <body> only inside a comment, ...). It exits non-zero when
+an edge case differs.
+
+    cd backend && python -m benchmarks.bench_html_extract --repeat 5
+"""
+import argparse
+import json
+import sys
+import time
+
+from bs4 import BeautifulSoup
+from bs4.element import Comment, NavigableString
+
+from app.tools.html_text import extract_text, lxml_available
+from benchmarks import fixtures
+
+
+def legacy_extract(html_content: str) -> str | None:
+    """The recursive extractor Scraper used before app/tools/html_text.py."""
+    def extract_text_recursively(element):
+        if isinstance(element, NavigableString):
+            text = element.strip()
+            return text + ' ' if text else ''
+        if element.name in ['script', 'style', 'header', 'footer', 'nav']:
+            return ''
+        text_content = ''
+        for child in element.children:
+            text_content += extract_text_recursively(child)
+        return text_content
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+    body_tag = soup.find('body')
+    if not body_tag:
+        return None
+    # Comments were picked up as text by the old extractor; drop them so the
+    # outputs are comparable.
+    for comment in body_tag.find_all(string=lambda s: isinstance(s, Comment)):
+        comment.extract()
+    return ' '.join(extract_text_recursively(body_tag).split())
+
+
+EDGE_CASES = {
+    "no_body": "<html><p>hi</p></html>",
+    "fragment": "<p>hi</p>",
+    "head_only": "<html><head><title>t</title></head></html>",
+    "body_in_comment": "<html><!-- <body> --><p>hi</p></html>",
+    "implicit_html": "<body><p>hi <b>there</b></p></body>",
+    "uppercase_body": "<HTML><BODY CLASS='x'><P>hi</P><SCRIPT>var s = '<body>';</SCRIPT></BODY></HTML>",
+    "comment_before_body": "<!-- note --><html><body><nav>menu</nav><p>hi</p></body></html>",
+}
+
+
+def throughput(fn, pages, repeat: int) -> dict:
+    total_bytes = sum(len(p.encode("utf-8")) for p in pages.values())
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages.values():
+            fn(page)
+        best = min(best, time.perf_counter() - start)
+    return {"seconds": best, "mb_per_s": total_bytes / best / 1e6}
+
+
+def run(repeat: int) -> dict:
+    pages = fixtures.corpus()
+    extractors = {
+        "legacy_bs4_recursive": legacy_extract,
+        "stdlib_streaming": lambda html: extract_text(html, backend="stdlib"),
+    }
+    if lxml_available():
+        extractors["lxml_iterative"] = lambda html: extract_text(html, backend="lxml")
+
+    reference = {name: legacy_extract(page) for name, page in pages.items()}
+    results = {"corpus_bytes": sum(len(p.encode("utf-8")) for p in pages.values()), "extractors": {}}
+    for name, fn in extractors.items():
+        stats = throughput(fn, pages, repeat)
+        stats["mismatches"] = [page for page, html in pages.items() if fn(html) != reference[page]]
+        results["extractors"][name] = stats
+
+    deep = fixtures.deeply_nested_page()
+    for name, fn in extractors.items():
+        try:
+            fn(deep)
+            outcome = "ok"
+        except RecursionError:
+            outcome = "RecursionError"
+        results["extractors"][name]["deeply_nested"] = outcome
+
+    edge_reference = {case: legacy_extract(page) for case, page in EDGE_CASES.items()}
+    for name, fn in extractors.items():
+        results["extractors"][name]["edge_case_mismatches"] = {
+            case: fn(page) for case, page in EDGE_CASES.items() if fn(page) != edge_reference[case]
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    report = run(args.repeat)
+    print(json.dumps(report, indent=2))
+    if any(stats["edge_case_mismatches"] for stats in report["extractors"].values()):
+        sys.exit(1)
@@ -0,0 +1,127 @@
+"""
+Fast-path fetch latency: a fresh requests.get per URL (the old behaviour)
+versus the pooled keep-alive client in app/tools/http_client.py.
+
+The saved job pages are served from a local HTTP/1.1 server that delays
+every new connection by --connect-seconds, standing in for the TCP + TLS
+handshake to a remote board. Repeated fetches from one host then pay that
+cost once with the pool and on every request without it. The report also
+covers a page far larger than --max-bytes (time and peak memory, full read
+versus streamed and truncated) and a 503 that is retried.
+
+    cd backend && python -m benchmarks.bench_http_fetch --iterations 20 --connect-seconds 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import requests
+
+from app.tools.http_client import PooledHTTPClient
+from app.tools.jd_scraper import REQUEST_HEADERS
+from benchmarks import fixtures
+from benchmarks.common import summarize
+
+
+def _timed(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _peak_kb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def repeated_host(base_url: str, names, iterations: int) -> dict:
+    urls = [f"{base_url}/{name}" for name in names]
+
+    def fetch_all(get):
+        return lambda: [get(url) for url in urls]
+
+    client = PooledHTTPClient(headers=REQUEST_HEADERS)
+    results = {
+        "requests_per_call": summarize(_timed(fetch_all(lambda url: requests.get(url, headers=REQUEST_HEADERS, timeout=10)), iterations)),
+        "pooled": summarize(_timed(fetch_all(client.get), iterations)),
+    }
+
+    async def async_run():
+        async_client = PooledHTTPClient(headers=REQUEST_HEADERS)
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await asyncio.gather(*(async_client.aget(url) for url in urls))
+            samples.append(time.perf_counter() - start)
+        await async_client.aclose()
+        return samples
+
+    results["pooled_async_concurrent"] = summarize(asyncio.run(async_run()))
+    results["pooled_stats"] = client.stats()
+    client.close()
+    return {"pages_per_call": len(urls), **results}
+
+
+def large_page(base_url: str, name: str, max_bytes: int, iterations: int) -> dict:
+    url = f"{base_url}/{name}"
+    client = PooledHTTPClient(headers=REQUEST_HEADERS, max_bytes=max_bytes)
+    full = lambda: requests.get(url, headers=REQUEST_HEADERS, timeout=30).text
+    capped = lambda: client.get(url)
+    result = client.get(url)
+    report = {
+        "full_read": {**summarize(_timed(full, iterations)), "peak_alloc_kb": _peak_kb(full)},
+        "streamed_capped": {**summarize(_timed(capped, iterations)), "peak_alloc_kb": _peak_kb(capped)},
+        "truncated": result.truncated,
+        "bytes_kept": len(result.text.encode("utf-8")),
+    }
+    client.close()
+    return report
+
+
+def retried(base_url: str, name: str) -> dict:
+    client = PooledHTTPClient(headers=REQUEST_HEADERS)
+    start = time.perf_counter()
+    result = client.get(f"{base_url}/flaky/{name}")
+    elapsed = time.perf_counter() - start
+    client.close()
+    return {"status": result.status_code, "attempts": result.attempts, "ms": elapsed * 1000}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--connect-seconds", type=float, default=0.05)
+    parser.add_argument("--large-mb", type=float, default=20)
+    parser.add_argument("--max-bytes", type=int, default=2 * 1024 * 1024)
+    args = parser.parse_args()
+
+    pages_dir = tempfile.mkdtemp(prefix="bench-http-")
+    try:
+        pages = fixtures.saved_pages()
+        for name, html in pages.items():
+            with open(os.path.join(pages_dir, name), "w", encoding="utf-8") as f:
+                f.write(html)
+        with open(os.path.join(pages_dir, "large.html"), "w", encoding="utf-8") as f:
+            f.write(fixtures.synthetic_job_page(int(args.large_mb * 1024 * 1024)))
+
+        with fixtures.serve_directory(pages_dir, connect_seconds=args.connect_seconds) as base_url:
+            report = {
+                "connect_seconds": args.connect_seconds,
+                "repeated_host": repeated_host(base_url, sorted(pages), args.iterations),
+                "large_page": large_page(base_url, "large.html", args.max_bytes, max(1, args.iterations // 5)),
+                "retry_on_503": retried(base_url, sorted(pages)[0]),
+            }
+    finally:
+        shutil.rmtree(pages_dir, ignore_errors=True)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,87 @@
+"""
+Prompt-token reduction from condensing scraped job text before JD2JSON.
+
+For every saved fixture page this reports the estimated tokens before and
+after condensing, the rules that fired and the time condense() itself
+takes, then measures JD2JSON.convert latency with and without condensing
+against a fake LLM whose latency scales with prompt length. It exits
+non-zero if condensing removes any of the posting phrases in MUST_KEEP.
+
+    cd backend && python -m benchmarks.bench_jd_condense --iterations 10
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from app.core.cache import LRUCache, TieredCache
+from app.tools.html_text import extract_text
+from app.tools.jd_condenser import condense
+from app.tools.jd_to_json import JD2JSON
+from benchmarks import fixtures
+from benchmarks.common import SAMPLE_JD_JSON, PromptScaledFakeChatModel, summarize, time_calls
+from benchmarks.fixtures import PAGE_URLS
+
+# Posting prose that boilerplate rules must leave intact ("Sign In" used to
+# match inside "design initiatives").
+MUST_KEEP = {
+    "workday_job.html": (
+        "lead design in distributed systems", "drive API design initiatives",
+        "Sign off on service designs", "help them look for simpler designs",
+    ),
+}
+
+
+def reduction(pages) -> dict:
+    results = {}
+    for name, html in pages.items():
+        text = extract_text(html) or ""
+        url = PAGE_URLS.get(name)
+        start = time.perf_counter()
+        result = condense(text, url)
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "url": url,
+            "tokens_in": result.original_tokens,
+            "tokens_out": result.condensed_tokens,
+            "reduction": round(result.reduction_ratio, 3),
+            "rules": result.rules,
+            "condense_ms": elapsed * 1000,
+            "missing": [phrase for phrase in MUST_KEEP.get(name, ()) if phrase not in result.text],
+        }
+    return results
+
+
+def convert_latency(pages, iterations: int, seconds_per_1k_tokens: float) -> dict:
+    results = {}
+    for enabled in (False, True):
+        llm = PromptScaledFakeChatModel(
+            responses=[json.dumps(SAMPLE_JD_JSON)], base_latency=0.05, seconds_per_1k_tokens=seconds_per_1k_tokens
+        )
+        jd2json = JD2JSON(cache=TieredCache(LRUCache(), enabled=False), condense_enabled=enabled, llm=llm)
+        samples = []
+        for name, html in pages.items():
+            text = extract_text(html) or ""
+            samples += time_calls(
+                lambda: jd2json.convert(text, source_url=PAGE_URLS.get(name)), iterations, warmup=1
+            )
+        results["condensed" if enabled else "raw"] = {**summarize(samples), **jd2json.condense_totals}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seconds-per-1k-tokens", type=float, default=0.1)
+    args = parser.parse_args()
+    pages = fixtures.saved_pages()
+    reductions = reduction(pages)
+    print(json.dumps({
+        "reduction": reductions,
+        "convert_latency": convert_latency(pages, args.iterations, args.seconds_per_1k_tokens),
+    }, indent=2))
+    if any(r["missing"] for r in reductions.values()):
+        sys.exit(1)
@@ -0,0 +1,95 @@
+"""
+Structured JD extraction (schema.org JSON-LD and board adapters) in front of
+JD2JSON.
+
+For every saved fixture page, plus a copy with the JSON-LD removed (so the
+board adapter has to do the work) and a synthetic page from an unknown
+site, this reports which fields were extracted and from where, whether the
+LLM could be skipped and what the extraction costs. It then runs
+JD2JSON.convert over all of them with and without extraction against a
+fake LLM and reports the latency and the share of requests that skipped
+the LLM. It exits non-zero if any extracted field still contains markup
+(greenhouse_escaped_job.html embeds an entity-escaped description).
+
+    cd backend && python -m benchmarks.bench_jd_extract --iterations 10
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from app.core.cache import LRUCache, TieredCache
+from app.tools.html_text import extract_text
+from app.tools.jd_extractors import extract_posting, is_complete
+from app.tools.jd_to_json import JD2JSON
+from benchmarks import fixtures
+from benchmarks.common import SAMPLE_JD_JSON, PromptScaledFakeChatModel, summarize, time_calls
+from benchmarks.fixtures import PAGE_URLS
+
+_JSON_LD = re.compile(r"<script[^>]+application/ld\+json[^>]*>.*?</script>", re.DOTALL | re.IGNORECASE)
+
+
+def pages() -> dict:
+    """name -> (html, url) for the saved pages and their variants."""
+    result = {}
+    for name, html in fixtures.saved_pages().items():
+        url = PAGE_URLS.get(name)
+        result[name] = (html, url)
+        if _JSON_LD.search(html):
+            result[f"no-json-ld-{name}"] = (_JSON_LD.sub("", html), url)
+    result["unknown-site.html"] = (fixtures.synthetic_job_page(20_000), "https://careers.example.com/jobs/42")
+    return result
+
+
+def extraction(cases: dict, iterations: int) -> dict:
+    results = {}
+    for name, (html, url) in cases.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            posting = extract_posting(html, url)
+        elapsed = (time.perf_counter() - start) / iterations
+        fields = (posting or {}).get("fields", {})
+        results[name] = {
+            "sources": (posting or {}).get("sources", []),
+            "fields": sorted(fields),
+            "markup": sorted(k for k, v in fields.items() if re.search(r"</?[a-z][a-z0-9]*[\s>/]", v)),
+            "skips_llm": is_complete(posting),
+            "extract_ms": elapsed * 1000,
+        }
+    return results
+
+
+def convert_latency(cases: dict, iterations: int, seconds_per_1k_tokens: float) -> dict:
+    inputs = [(extract_text(html) or "", url, extract_posting(html, url)) for html, url in cases.values()]
+    results = {}
+    for enabled in (False, True):
+        llm = PromptScaledFakeChatModel(
+            responses=[json.dumps(SAMPLE_JD_JSON)], base_latency=0.05, seconds_per_1k_tokens=seconds_per_1k_tokens
+        )
+        jd2json = JD2JSON(cache=TieredCache(LRUCache(), enabled=False), llm=llm, extract_enabled=enabled)
+        samples = []
+        for text, url, posting in inputs:
+            samples += time_calls(
+                lambda: jd2json.convert(text, source_url=url, posting=posting), iterations, warmup=1
+            )
+        results["extracted" if enabled else "llm_only"] = {**summarize(samples), **jd2json.extract_report()}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seconds-per-1k-tokens", type=float, default=0.1)
+    args = parser.parse_args()
+    cases = pages()
+    extracted = extraction(cases, args.iterations)
+    print(json.dumps({
+        "extraction": extracted,
+        "convert_latency": convert_latency(cases, args.iterations, args.seconds_per_1k_tokens),
+    }, indent=2))
+    if any(r["markup"] for r in extracted.values()):
+        sys.exit(1)
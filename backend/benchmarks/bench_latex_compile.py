@@ -0,0 +1,123 @@
+"""
+Resume PDF throughput: two full pdflatex passes per resume in a fresh
+directory (the old ResumeGenerator.generate_resume) versus the compile
+service in app/core/latex_compiler.py.
+
+--resumes distinct resumes are rendered from the fake model's sample with
+different names. The rows are
+  legacy              two passes of the full source, one at a time;
+  single_pass         the service without a format file (one pass);
+  precompiled         the service with the preamble format, one worker;
+  precompiled_pool    the same with --workers compiles in parallel;
+  cached              the same resumes again (compile-result cache).
+For each row this reports renders/sec and per-resume latency. The format is
+built before the timed rows, and its build time is reported separately.
+
+Needs pdflatex (TeX Live or MiKTeX) with the packages the template uses.
+
+    cd backend && python -m benchmarks.bench_latex_compile --resumes 12 --workers 4
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.cache import LRUCache, TieredCache
+from app.core.fake_llm import SchemaFakeChatModel
+from app.core.latex_compiler import LatexCompiler
+from app.core.resume_generator import ResumeGenerator, fill_template
+from benchmarks import common
+from benchmarks.common import summarize
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "app", "core", "resume_template.tex")
+
+
+def legacy_compile(tex: str) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tex_path = os.path.join(tmpdir, "resume.tex")
+        with open(tex_path, "w", encoding="utf-8") as f:
+            f.write(tex)
+        for _ in range(2):
+            proc = subprocess.run(
+                ["pdflatex", "-interaction=nonstopmode", tex_path],
+                cwd=tmpdir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stdout[-2000:])
+
+
+def timed_batch(compile_one, sources, workers: int = 1) -> dict:
+    samples = []
+
+    def one(tex):
+        start = time.perf_counter()
+        compile_one(tex)
+        samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(one, sources))
+    elapsed = time.perf_counter() - start
+    return {"renders_per_s": round(len(sources) / elapsed, 2), "seconds": round(elapsed, 3), **summarize(samples)}
+
+
+def make_compiler(root: str, name: str, workers: int = 1, precompile: bool = True, cached: bool = False) -> LatexCompiler:
+    return LatexCompiler(
+        workers=workers,
+        output_dir=os.path.join(root, name, "out"),
+        format_dir=os.path.join(root, "formats"),
+        precompile=precompile,
+        cache=TieredCache(LRUCache(maxsize=1024), enabled=cached),
+    )
+
+
+def run(resumes: int, workers: int) -> dict:
+    generator = ResumeGenerator(TEMPLATE_PATH, llm=SchemaFakeChatModel())
+    base = generator.get_data(common.SAMPLE_RESUME_TEXT, common.SAMPLE_REVIEW)
+    template = generator.template
+    sources = [fill_template(template, base.model_copy(update={"name": f"Candidate {i}"})) for i in range(resumes)]
+
+    root = tempfile.mkdtemp(prefix="bench-latex-")
+    try:
+        warm = make_compiler(root, "warm")
+        start = time.perf_counter()
+        warm.warm(template)
+        format_seconds = time.perf_counter() - start
+
+        results = {"legacy": timed_batch(legacy_compile, sources)}
+        for name, compiler, pool in (
+            ("single_pass", make_compiler(root, "single_pass", precompile=False), 1),
+            ("precompiled", make_compiler(root, "precompiled"), 1),
+            ("precompiled_pool", make_compiler(root, "precompiled_pool", workers=workers), workers),
+        ):
+            batch = timed_batch(compiler.compile, sources, pool)
+            stats = compiler.stats()
+            results[name] = {**batch, "passes": stats["passes"], "format_fallbacks": stats["format_fallbacks"]}
+
+        cached = make_compiler(root, "cached", workers=workers, cached=True)
+        timed_batch(cached.compile, sources, workers)
+        results["cached"] = {**timed_batch(cached.compile, sources, workers), "cache_hits": cached.stats()["cache_hits"]}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return {
+        "resumes": resumes,
+        "workers": workers,
+        "format_build_seconds": round(format_seconds, 3),
+        "speedup_vs_legacy": round(results["precompiled_pool"]["renders_per_s"] / results["legacy"]["renders_per_s"], 2),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+    if not shutil.which("pdflatex"):
+        sys.exit("pdflatex is not installed; this benchmark needs a TeX distribution.")
+    print(json.dumps(run(args.resumes, args.workers), indent=2))
@@ -0,0 +1,160 @@
+"""
+LaTeX rendering of a resume: the old escape_latex (a str.replace pass per
+special character) and fill_template (a str.replace over the whole
+document per placeholder) versus the single-pass regex escaper and the
+pre-parsed LatexTemplate in app/core/resume_generator.py.
+
+First it checks, on --cases random inputs, that
+  - escape_latex matches a character-by-character reference,
+  - it matches the old escaper wherever the old one was right (text
+    without & % $ # _ { } ~ ^, whose inserted backslashes it escaped again),
+  - LatexTemplate.render matches the old replace loop for values that do
+    not themselves contain a <KEY> placeholder.
+Then it times escaping every field, filling the template, and both
+together for resumes of growing size (and one dense in special
+characters, where the regex callbacks cost more than the old C-level
+replaces). It exits non-zero on any mismatch.
+
+    cd backend && python -m benchmarks.bench_latex_render --cases 5000 --iterations 50
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from unittest import mock
+
+from app.core import resume_generator
+from app.core.models.resume import EducationItem, ExperienceItem, ProjectItem, Resume
+from app.core.resume_generator import PLACEHOLDERS, LatexTemplate, escape_latex, render_resume
+from benchmarks.common import summarize, time_calls
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "app", "core", "resume_template.tex")
+
+_REFERENCE = {
+    "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#", "_": r"\_", "{": r"\{", "}": r"\}",
+    "~": r"\textasciitilde{}", "^": r"\textasciicircum{}", "\\": r"\textbackslash{}", "–": "--", "—": "---",
+}
+_OLD_SAFE = "\\–—"
+_ALPHABET = "abcXYZ 019.,:;/-+*()[]<>|'\"\n\té€😀" + "".join(_REFERENCE)
+
+
+def legacy_escape_latex(text: str) -> str:
+    # What escape_latex did before.
+    if not text:
+        return ""
+    replacements = {
+        "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#", "_": r"\_", "{": r"\{", "}": r"\}",
+        "~": r"\textasciitilde{}", "^": r"\textasciicircum{}", "\\": r"\textbackslash{}", "–": r"--", "—": r"---",
+    }
+    for old, new in replacements.items():
+        if old == "\\" and new in text:
+            continue
+        text = text.replace(old, new)
+    return text
+
+
+def legacy_fill(tex_template: str, values: dict) -> str:
+    # What fill_template did with the rendered values before.
+    filled_tex = tex_template
+    for key, value in values.items():
+        filled_tex = filled_tex.replace(f"<{key}>", value or "")
+    return filled_tex
+
+
+def reference_escape(text: str) -> str:
+    return "".join(_REFERENCE.get(c, c) for c in text or "")
+
+
+def random_text(rng: random.Random, alphabet: str, max_len: int = 60) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+
+
+def check_equivalence(template: str, cases: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    old_safe = "".join(c for c in _ALPHABET if c not in _REFERENCE or c in _OLD_SAFE)
+    parsed = LatexTemplate(template)
+    mismatches = {"reference": [], "legacy_escape": [], "template": []}
+    for _ in range(cases):
+        text = random_text(rng, _ALPHABET)
+        if escape_latex(text) != reference_escape(text):
+            mismatches["reference"].append(text)
+        text = random_text(rng, old_safe)
+        # Backslashes next to an existing \textbackslash{} made the old escaper skip them all.
+        if r"\textbackslash{}" not in text and escape_latex(text) != legacy_escape_latex(text):
+            mismatches["legacy_escape"].append(text)
+        values = {key: random_text(rng, _ALPHABET, 200) for key in PLACEHOLDERS if rng.random() < 0.9}
+        if parsed.render(values) != legacy_fill(template, values):
+            mismatches["template"].append(values)
+    return {"cases": cases, "mismatches": {name: len(found) for name, found in mismatches.items()},
+            "examples": {name: found[:3] for name, found in mismatches.items() if found}}
+
+
+_PLAIN_WORDS = ["led", "the", "migration", "of", "billing", "to", "Kubernetes", "and", "cut", "deploys", "from", "hours", "in", "Python"]
+_SPECIAL_WORDS = ["by 40%", "for R&D", "C#", "AWS_S3", "{fast}", "~2x", "$5M", "x^2", "–"]
+
+
+def large_resume(rng: random.Random, jobs: int, bullets: int, special_rate: float) -> Resume:
+    """special_rate is the share of words holding a LaTeX special character."""
+    word = lambda: rng.choice(_SPECIAL_WORDS) if rng.random() < special_rate else rng.choice(_PLAIN_WORDS)
+    sentence = lambda: " ".join(word() for _ in range(16))
+    return Resume(
+        name="Jane Doe", phone="+1 555 0100", email="jane@example.com",
+        github="github.com/jane", linkedin="linkedin.com/in/jane", leetcode="leetcode.com/jane",
+        summary=sentence(), skills=[sentence() for _ in range(bullets)],
+        experience=[ExperienceItem(role=sentence(), company="Acme & Co", date="2020 – 2024",
+                                   bullets=[sentence() for _ in range(bullets)]) for _ in range(jobs)],
+        projects=[ProjectItem(title="Tool_X", subtitle=sentence(), date="2023",
+                              bullets=[sentence() for _ in range(bullets)]) for _ in range(jobs)],
+        education=[EducationItem(institution="State U", degree="B.Sc. CS", grade="9/10", date="2016 – 2020")],
+    )
+
+
+def benchmark(template: str, sizes, iterations: int) -> dict:
+    rng = random.Random(1)
+    parsed = LatexTemplate(template)
+    report = {}
+    for jobs, bullets, special_rate in sizes:
+        resume = large_resume(rng, jobs, bullets, special_rate)
+        fields = [resume.summary, *resume.skills] + [b for e in resume.experience for b in e.bullets] \
+            + [b for p in resume.projects for b in p.bullets]
+        with mock.patch.object(resume_generator, "escape_latex", legacy_escape_latex):
+            legacy_values = render_resume(resume)
+        values = render_resume(resume)
+
+        def legacy_end_to_end():
+            with mock.patch.object(resume_generator, "escape_latex", legacy_escape_latex):
+                return legacy_fill(template, render_resume(resume))
+
+        rows = {
+            "escape_legacy": lambda: [legacy_escape_latex(f) for f in fields],
+            "escape_single_pass": lambda: [escape_latex(f) for f in fields],
+            "fill_legacy": lambda: legacy_fill(template, legacy_values),
+            "fill_parsed": lambda: parsed.render(values),
+            "render_and_fill_legacy": legacy_end_to_end,
+            "render_and_fill": lambda: parsed.render(render_resume(resume)),
+        }
+        size = {name: summarize(time_calls(fn, iterations)) for name, fn in rows.items()}
+        size["fields"] = len(fields)
+        size["tex_kb"] = round(len(parsed.render(values).encode("utf-8")) / 1024, 1)
+        size["speedup"] = round(size["render_and_fill_legacy"]["p50_ms"] / size["render_and_fill"]["p50_ms"], 2)
+        report[f"{jobs}x{bullets}@{special_rate:.0%}"] = size
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        template = f.read()
+    equivalence = check_equivalence(template, args.cases)
+    report = {
+        "equivalence": equivalence,
+        # Real bullets hold a special character every few sentences; the last row is a stress case.
+        "timings": benchmark(template, [(3, 5, 0.02), (10, 50, 0.02), (40, 200, 0.02), (10, 50, 0.3)], args.iterations),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if any(equivalence["mismatches"].values()):
+        sys.exit(1)
@@ -0,0 +1,100 @@
+"""
+Recruiter lookups for a batch: one uncached BrightData request per item
+(the old behaviour) versus the profile cache and batched dataset requests
+in app/tools/linkedin.py.
+
+A local mock of the Dataset API (benchmarks/fixtures.serve_brightdata)
+answers each request after --api-latency seconds. The batch has --items
+entries drawn from --recruiters distinct people, written the different
+ways users paste LinkedIn URLs (country subdomains, trailing slashes,
+tracking parameters), plus one profile that does not exist. For each
+strategy this reports the wall time and the API requests made; the last
+rows show a warm batch and stale-while-revalidate.
+
+    cd backend && python -m benchmarks.bench_linkedin --items 50 --recruiters 8
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from app.core.cache import LRUCache, TieredCache
+from app.tools.brightdata import BrightDataClient
+from app.tools.linkedin import LinkedIn
+from app.tools.profile_cache import ProfileCache
+from benchmarks import fixtures
+
+_VARIANTS = (
+    "https://www.linkedin.com/in/{slug}/",
+    "https://in.linkedin.com/in/{slug}",
+    "https://www.linkedin.com/in/{slug}?trk=public_profile_browsemap",
+    "https://linkedin.com/in/{slug}/#experience",
+)
+
+
+def batch_urls(items: int, recruiters: int, seed: int = 0):
+    rng = random.Random(seed)
+    slugs = [f"recruiter-{i}" for i in range(recruiters)]
+    urls = [rng.choice(_VARIANTS).format(slug=rng.choice(slugs)) for _ in range(items - 1)]
+    return slugs, urls + ["https://www.linkedin.com/in/no-such-person"]
+
+
+def make_linkedin(base_url: str, cached: bool, fresh_for: float | None = None) -> LinkedIn:
+    cache = None if cached else TieredCache(LRUCache(), enabled=False)
+    profile_cache = ProfileCache(cache=cache) if fresh_for is None else ProfileCache(cache=cache, fresh_for=fresh_for)
+    return LinkedIn(client=BrightDataClient(api_key="benchmark", base_url=base_url, poll_interval=0.05), cache=profile_cache)
+
+
+async def run(items: int, recruiters: int, api_latency: float) -> dict:
+    slugs, urls = batch_urls(items, recruiters)
+    profiles = {f"https://www.linkedin.com/in/{slug}": fixtures.linkedin_profile(slug) for slug in slugs}
+    results = {}
+    with fixtures.serve_brightdata(profiles, latency=api_latency, snapshot_over=10) as (base_url, mock):
+        async def measure(name, linkedin, lookup):
+            before = dict(mock.counters)
+            start = time.perf_counter()
+            found = await lookup(linkedin)
+            results[name] = {
+                "seconds": round(time.perf_counter() - start, 3),
+                "api_requests": mock.counters["scrape_requests"] - before["scrape_requests"],
+                "profiles_requested": mock.counters["profiles_requested"] - before["profiles_requested"],
+                "profiles_found": sum(1 for summary in found if summary),
+            }
+
+        async def legacy(linkedin):
+            # What LinkedIn.asearch did before: one dataset request per item, nothing shared.
+            async def one(url):
+                try:
+                    return linkedin._compile_summary((await linkedin.client.ascrape(linkedin.dataset_id, [url]))[0])
+                except Exception:
+                    return {}
+            return await asyncio.gather(*(one(url) for url in urls))
+
+        per_item = lambda linkedin: asyncio.gather(*(linkedin.asearch(url) for url in urls))
+
+        async def batched(linkedin):
+            profiles = await linkedin.asearch_many(urls)
+            return [profiles.get(url) for url in urls]
+
+        await measure("per_item_uncached", make_linkedin(base_url, cached=False), legacy)
+        await measure("per_item_cached", make_linkedin(base_url, cached=True), per_item)
+        warm = make_linkedin(base_url, cached=True)
+        await measure("batched_cold", warm, batched)
+        await measure("batched_warm", warm, batched)
+
+        stale = make_linkedin(base_url, cached=True, fresh_for=0.0)
+        await measure("batched_prime", stale, batched)
+        await measure("batched_stale_while_revalidate", stale, batched)
+        await asyncio.sleep(api_latency + 0.5)
+        results["background_refresh"] = {**stale.cache.report(), "snapshot_polls": mock.counters["snapshot_polls"]}
+    return {"items": items, "distinct_recruiters": recruiters + 1, "api_latency": api_latency, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--recruiters", type=int, default=8)
+    parser.add_argument("--api-latency", type=float, default=0.5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.items, args.recruiters, args.api_latency)), indent=2, default=str))
@@ -0,0 +1,174 @@
+"""
+Per-call prompt overhead: the old craft_email, craft_referral, resume
+review, ResumeGenerator.get_data and JD2JSON.convert built their
+ChatPromptTemplate, serialised the response schema with
+get_format_instructions() and composed prompt | llm | parser on every
+request; now the prompts are compiled once per process and the chains
+once per instance.
+
+First it checks that each precompiled prompt sends the LLM exactly the
+messages the old one did, and that a JD containing braces (which the old
+JD2JSON parsed as template variables) now converts. Then, with a
+zero-latency fake model, it times
+  prepare   building the chain and its input (what runs before the LLM);
+  invoke    prepare plus running the chain end to end,
+old versus new, for each chain. It exits non-zero on any mismatch.
+
+    cd backend && python -m benchmarks.bench_prompts --iterations 300
+"""
+import argparse
+import json
+import sys
+
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from app.core import email_generator
+from app.core.cache import LRUCache, TieredCache
+from app.core.email_generator import EmailGenerator
+from app.core.fake_llm import SchemaFakeChatModel
+from app.core.models.email_models import EmailDraft, ReferralDraft, StructuredReview
+from app.core.models.resume import Resume
+from app.core.resume_generator import ResumeGenerator
+from app.tools.jd_to_json import SYSTEM_MESSAGE, JD2JSON, JobListing
+from benchmarks import common
+from benchmarks.common import summarize, time_calls
+
+BRACED_JD = common.SAMPLE_JD_TEXT + " Salary: {base} + {bonus}; config like {\"env\": \"prod\"} is a plus."
+
+
+# What the generators did before, on every call.
+def legacy_review(llm, resume_text, jd_json):
+    parser = JsonOutputParser(pydantic_object=StructuredReview)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", email_generator.REVIEW_SYSTEM_MESSAGE),
+        ("human", "{format_instructions}\n\nJob Description JSON:\n{jd_json}\n\nResume:\n{resume_text}"),
+    ])
+    input_data = {"jd_json": jd_json, "resume_text": resume_text, "format_instructions": parser.get_format_instructions()}
+    return prompt, prompt | llm | parser, input_data
+
+
+def _legacy_message(llm, system, schema, block, extra):
+    parser = JsonOutputParser(pydantic_object=schema)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system),
+        ("human", "{format_instructions}\n\nJob Description JSON:\n{jd_json}\n\nResume:\n{resume_text}\n\n{recruiter_block}"),
+    ])
+    input_data = {
+        "jd_json": common.SAMPLE_JD_JSON, "resume_text": common.SAMPLE_RESUME_TEXT, "recruiter_block": block,
+        "format_instructions": parser.get_format_instructions(), **extra,
+    }
+    return prompt, prompt | llm | parser, input_data
+
+
+def legacy_email(llm, recruiter_info):
+    return _legacy_message(llm, email_generator.EMAIL_SYSTEM_MESSAGE, EmailDraft, f"Recruiter Info:\n{recruiter_info}", {})
+
+
+def legacy_referral(llm, recruiter_info):
+    return _legacy_message(llm, email_generator.REFERRAL_SYSTEM_MESSAGE, ReferralDraft,
+                           f"Contact Info (for referral):\n{recruiter_info}", {"display_message_type": "a LinkedIn message"})
+
+
+def legacy_resume(llm, resume_text, review):
+    parser = JsonOutputParser(pydantic_object=Resume)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system",
+         "You are an expert career assistant and resume builder. "
+         "Given the resume text and resume review JSON, "
+         "create a new refined resume structured in the required format. "
+         "IMPORTANT: Provide all text content as plain, raw strings without any LaTeX escaping. The system will handle all escaping."),
+        ("human", "{format_instructions}\n\nresume text : \n{resume_text}\n\nreview json : \n{review}"),
+    ])
+    input_data = {"resume_text": resume_text, "review": review, "format_instructions": parser.get_format_instructions()}
+    return prompt, prompt | llm | parser, input_data
+
+
+def legacy_jd(llm, jd):
+    parser = JsonOutputParser(pydantic_object=JobListing)
+    safe = parser.get_format_instructions().replace("{", "{{").replace("}", "}}")
+    prompt = ChatPromptTemplate.from_messages([("system", SYSTEM_MESSAGE + "\n\n" + safe), ("human", jd)])
+    return prompt, prompt | llm | parser, {}
+
+
+def invoke(prepared):
+    chain, input_data = prepared[-2:]
+    return chain.invoke(input_data)
+
+
+def build(llm) -> dict:
+    """name: (old prepare, new prepare, new end to end); a prepare returns (..., chain, input)."""
+    off = lambda: TieredCache(LRUCache(), enabled=False)
+    email = EmailGenerator(llm=llm, review_cache=off())
+    resume = ResumeGenerator(llm=llm)
+    jd2json = JD2JSON(llm=llm, cache=off(), condense_enabled=False, extract_enabled=False)
+    recruiter = "Sam Lee, Talent Partner at Acme"
+    jd_json, resume_text = common.SAMPLE_JD_JSON, common.SAMPLE_RESUME_TEXT
+    cases = {
+        "email": (lambda: legacy_email(llm, recruiter),
+                  lambda: email._prepare_email(resume_text, jd_json, recruiter)),
+        "referral": (lambda: legacy_referral(llm, recruiter),
+                     lambda: email._prepare_referral(resume_text, jd_json, recruiter)),
+        "review": (lambda: legacy_review(llm, resume_text, jd_json),
+                   lambda: email._prepare_review(resume_text, jd_json)),
+        "resume": (lambda: legacy_resume(llm, resume_text, common.SAMPLE_REVIEW),
+                   lambda: resume._prepare_data(resume_text, common.SAMPLE_REVIEW)),
+    }
+    cases = {name: (old, new, lambda new=new: invoke(new())) for name, (old, new) in cases.items()}
+    # JD2JSON's chain is private; the new per-call work is just the input dict.
+    cases["jd_json"] = (lambda: legacy_jd(llm, common.SAMPLE_JD_TEXT), lambda: {"jd": common.SAMPLE_JD_TEXT},
+                        lambda: jd2json.convert(common.SAMPLE_JD_TEXT, bypass_cache=True))
+    return cases, jd2json
+
+
+def check_equivalence(cases: dict, jd2json: JD2JSON, llm) -> dict:
+    mismatches = []
+    for name, (old, new, _) in cases.items():
+        prompt, _, old_input = old()
+        if name == "jd_json":
+            new_prompt, new_input = jd2json._create_prompt(SYSTEM_MESSAGE), new()
+        else:
+            chain, new_input = new()
+            new_prompt = chain.first
+        if prompt.format_messages(**old_input) != new_prompt.format_messages(**new_input):
+            mismatches.append(name)
+    try:
+        invoke(legacy_jd(llm, BRACED_JD))
+        legacy_braces = "ok"
+    except Exception as e:
+        legacy_braces = f"{type(e).__name__}: {e}"
+    try:
+        converted = sorted(jd2json.convert(BRACED_JD, bypass_cache=True))
+        braces = "ok" if converted == sorted(JobListing.model_fields) else f"unexpected fields {converted}"
+    except Exception as e:
+        braces = f"{type(e).__name__}: {e}"
+    if braces != "ok":
+        mismatches.append("braced_jd")
+    return {"mismatches": mismatches, "braced_jd_legacy": legacy_braces, "braced_jd": braces}
+
+
+def benchmark(cases: dict, iterations: int) -> dict:
+    report = {}
+    for name, (old, new, new_invoke) in cases.items():
+        rows = {
+            "prepare_legacy": summarize(time_calls(old, iterations)),
+            "prepare": summarize(time_calls(new, iterations)),
+            "invoke_legacy": summarize(time_calls(lambda: invoke(old()), iterations)),
+            "invoke": summarize(time_calls(new_invoke, iterations)),
+        }
+        rows["saved_per_call_ms"] = round(rows["invoke_legacy"]["p50_ms"] - rows["invoke"]["p50_ms"], 3)
+        report[name] = rows
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+    llm = SchemaFakeChatModel()
+    cases, jd2json = build(llm)
+    equivalence = check_equivalence(cases, jd2json, llm)
+    report = {"equivalence": equivalence, "timings": benchmark(cases, args.iterations)}
+    print(json.dumps(report, indent=2))
+    if equivalence["mismatches"]:
+        sys.exit(1)
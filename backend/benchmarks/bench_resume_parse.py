@@ -0,0 +1,93 @@
+"""
+Latency and memory of resume parsing on multi-page PDFs.
+
+Compares the previous path (write the upload to /tmp, load it with
+langchain's PyPDFLoader and concatenate page text with +=) with
+ResumeParser.parse on the in-memory bytes. Peak memory is reported as the
+tracemalloc peak of one parse and as the growth of the process's max RSS,
+measured in a fresh subprocess per mode and size.
+
+    cd backend && python -m benchmarks.bench_resume_parse --pages 2 10 50
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from app.tools.resume_parser import ResumeParser
+from benchmarks import common, fixtures
+
+
+def legacy_parse(contents: bytes, filename: str = "resume.pdf") -> str:
+    """The upload handling and parser used before the in-memory ResumeParser."""
+    from langchain_community.document_loaders import PyPDFLoader
+
+    temp_path = os.path.join(tempfile.gettempdir(), filename)
+    with open(temp_path, "wb") as f:
+        f.write(contents)
+    pages = PyPDFLoader(temp_path).load()
+    resume_content = ""
+    for page in pages:
+        resume_content += page.page_content
+    os.remove(temp_path)
+    return resume_content
+
+
+MODES = {
+    "legacy_tmpfile_pypdfloader": legacy_parse,
+    "in_memory": ResumeParser().parse,
+}
+
+
+def max_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(mode: str, pages: int) -> None:
+    """Prints the max RSS growth (KB) of one parse in this fresh process."""
+    from langchain_community.document_loaders import PyPDFLoader  # noqa: F401  (import cost is not measured)
+
+    contents = fixtures.resume_pdf(pages)
+    fn = MODES[mode]
+    before = max_rss_kb()
+    fn(contents)
+    print(max_rss_kb() - before)
+
+
+def run(page_counts, iterations: int) -> dict:
+    results = {}
+    for pages in page_counts:
+        contents = fixtures.resume_pdf(pages)
+        reference = legacy_parse(contents)
+        entry = {"pdf_bytes": len(contents)}
+        for mode, fn in MODES.items():
+            stats = common.summarize(common.time_calls(lambda: fn(contents), iterations, warmup=1))
+            tracemalloc.start()
+            fn(contents)
+            stats["tracemalloc_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_resume_parse", "--child", mode, str(pages)],
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            stats["max_rss_growth_kb"] = int(output[-1])
+            stats["same_text"] = fn(contents) == reference
+            entry[mode] = stats
+        results[f"{pages}_pages"] = entry
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 10, 50])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PAGES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+    else:
+        print(json.dumps(run(args.pages, args.iterations), indent=2))
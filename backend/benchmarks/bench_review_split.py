@@ -0,0 +1,51 @@
+"""
+Latency of message regeneration with the split message/review calls.
+
+A fake chat model generates at a chosen token rate (about four characters
+per token). For one resume/JD pair the benchmark crafts an email, then a
+LinkedIn referral and an email for another recruiter, and reports each
+call's latency with the review cache cold and warm. It also reports the
+single combined call the generator made before the split, modelled as one
+call producing the message and the review back to back.
+
+    cd backend && python -m benchmarks.bench_review_split --tokens-per-second 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from app.core.email_generator import EmailGenerator
+from benchmarks import common
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(tokens_per_second: float) -> dict:
+    sleep = 1 / (tokens_per_second * 4)
+    # The fake model charges `sleep` per character of the whole response.
+    combined_chars = len(common.email_response()) + len(common.review_response())
+    generator = EmailGenerator(llm=common.email_llm(sleep=sleep))
+    referral = EmailGenerator(llm=common.referral_llm(sleep=sleep), review_cache=generator.review_cache)
+    resume, jd = common.SAMPLE_RESUME_TEXT, common.SAMPLE_JD_TEXT
+    return {
+        "combined_single_call_ms": combined_chars * sleep * 1000,
+        "email_cold_ms": await timed(generator.acraft_email(resume, jd)),
+        "referral_same_pair_ms": await timed(referral.acraft_referral(resume, jd)),
+        "email_other_recruiter_ms": await timed(generator.acraft_email(resume, jd, recruiter_info="Alex, Engineering Manager")),
+        "review_cache": generator.cache_report()["review"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens-per-second", type=float, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.tokens_per_second)), indent=2))
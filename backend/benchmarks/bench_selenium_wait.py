@@ -0,0 +1,127 @@
+"""
+Selenium fallback latency: fixed readyState + 2 s sleep versus the
+content-aware wait in app/tools/page_wait.py.
+
+The saved job pages are served from a local HTTP server in two variants:
+'static' adds an image and a web font that take --slow-seconds to load (as
+trackers and hero images do on real boards), and 'rendered' inserts the
+posting from JavaScript after --render-delay, like a client-rendered board.
+For each page, variant and strategy this reports the time until the page
+source was taken, why the wait ended and how much job text it contained.
+
+Needs Chrome and a matching chromedriver (Selenium Manager can fetch one).
+
+    cd backend && python -m benchmarks.bench_selenium_wait --iterations 3
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+
+from app.tools.html_text import extract_text
+from app.tools.jd_scraper import Scraper
+from app.tools.page_wait import load_and_wait
+from benchmarks import fixtures
+from benchmarks.common import summarize
+from benchmarks.fixtures import PAGE_URLS
+
+_BODY = re.compile(r"<body[^>]*>(.*)</body>", re.DOTALL | re.IGNORECASE)
+
+
+def static_variant(html: str) -> str:
+    heavy = (
+        "<style>@font-face{font-family:Brand;src:url('/slow/brand.woff2')}body{font-family:Brand}</style>"
+        "<img src='/slow/hero.png' alt=''>"
+    )
+    return html.replace("</body>", heavy + "</body>", 1)
+
+
+def rendered_variant(html: str, delay: float) -> str:
+    match = _BODY.search(html)
+    if not match:
+        return html
+    body = (
+        "<div id='root'>Loading…</div>"
+        f"<template id='posting'>{match.group(1)}</template>"
+        "<script>setTimeout(function () {"
+        "document.getElementById('root').replaceWith(document.getElementById('posting').content.cloneNode(true));"
+        f"}}, {int(delay * 1000)});</script>"
+    )
+    return html[:match.start(1)] + body + html[match.end(1):]
+
+
+def legacy_driver():
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(options=options)
+
+
+def legacy_wait(driver, url: str, site_url: str) -> str:
+    """The previous behaviour: wait for readyState 'complete', then sleep 2 s."""
+    driver.get(url)
+    WebDriverWait(driver, 20).until(lambda d: d.execute_script("return document.readyState") == 'complete')
+    time.sleep(2)
+    return "fixed_sleep"
+
+
+def content_aware_wait(driver, url: str, site_url: str) -> str:
+    return load_and_wait(driver, url, site_url=site_url).reason
+
+
+STRATEGIES = {
+    "legacy": (legacy_driver, legacy_wait),
+    "content_aware": (Scraper.configure_headless, content_aware_wait),
+}
+
+
+def run(iterations: int, slow_seconds: float, render_delay: float) -> dict:
+    pages_dir = tempfile.mkdtemp(prefix="bench-selenium-")
+    variants = {}
+    for name, html in fixtures.saved_pages().items():
+        for variant, content in (("static", static_variant(html)), ("rendered", rendered_variant(html, render_delay))):
+            filename = f"{variant}-{name}"
+            with open(os.path.join(pages_dir, filename), "w", encoding="utf-8") as f:
+                f.write(content)
+            variants[filename] = PAGE_URLS.get(name)
+
+    results = {}
+    with fixtures.serve_directory(pages_dir, slow_seconds=slow_seconds) as base_url:
+        for strategy, (make_driver, wait) in STRATEGIES.items():
+            driver = make_driver()
+            try:
+                for filename, site_url in variants.items():
+                    samples, reasons, chars = [], set(), 0
+                    for _ in range(iterations):
+                        driver.get("about:blank")
+                        start = time.perf_counter()
+                        reasons.add(wait(driver, f"{base_url}/{filename}", site_url))
+                        source = driver.page_source
+                        samples.append(time.perf_counter() - start)
+                        chars = len(extract_text(source) or "")
+                    results.setdefault(filename, {})[strategy] = {
+                        **summarize(samples), "ended_by": sorted(reasons), "text_chars": chars,
+                    }
+            finally:
+                driver.quit()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--slow-seconds", type=float, default=1.5)
+    parser.add_argument("--render-delay", type=float, default=0.5)
+    args = parser.parse_args()
+    try:
+        report = run(args.iterations, args.slow_seconds, args.render_delay)
+    except Exception as e:
+        sys.exit(f"Could not run the Selenium benchmark (is Chrome installed?): {e}")
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,71 @@
+"""
+Time to first content for the streaming email/referral generation.
+
+A fake chat model streams the canned message and review one character at a
+time at a chosen token rate; the two calls run concurrently. For each
+generator method this reports when the first and the last message events
+arrive and when 'done' arrives, which is also when the non-streaming
+endpoint would have returned, plus the JSON bytes of the message events.
+It exits non-zero if applying the message deltas does not rebuild the
+message in 'done'.
+
+    cd backend && python -m benchmarks.bench_streaming --tokens-per-second 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from app.core.email_generator import EmailGenerator
+from benchmarks import common
+
+CASES = {
+    "email": ("astream_email", common.email_llm, "email"),
+    "referral": ("astream_referral", common.referral_llm, "referral_message"),
+}
+
+
+async def measure(method: str, llm_factory, section: str, tokens_per_second: float) -> dict:
+    # The fake model streams one character per chunk; about four characters per token.
+    generator = EmailGenerator(llm=llm_factory(sleep=1 / (tokens_per_second * 4)))
+    marks = {"message_bytes": 0}
+    rebuilt = {}
+    start = time.perf_counter()
+    async for event, data in getattr(generator, method)(common.SAMPLE_RESUME_TEXT, common.SAMPLE_JD_TEXT):
+        elapsed = time.perf_counter() - start
+        if event == section:
+            marks.setdefault("first_message_event", elapsed)
+            marks["message_complete"] = elapsed
+            marks["message_bytes"] += len(json.dumps(data))
+            for name, value in data.items():
+                rebuilt[name] = rebuilt.get(name, "") + value if isinstance(value, str) else value
+        elif event == "done":
+            marks["done"] = elapsed
+            marks["rebuilt"] = rebuilt == data[section]
+    return marks
+
+
+def run(iterations: int, tokens_per_second: float) -> dict:
+    results = {}
+    for case, (method, llm_factory, section) in CASES.items():
+        samples = [asyncio.run(measure(method, llm_factory, section, tokens_per_second)) for _ in range(iterations)]
+        timings = [name for name in samples[0] if name not in ("message_bytes", "rebuilt")]
+        results[case] = {name: common.summarize([s[name] for s in samples]) for name in timings}
+        results[case]["message_bytes"] = samples[-1]["message_bytes"]
+        results[case]["rebuilt"] = all(s["rebuilt"] for s in samples)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--tokens-per-second", type=float, default=200)
+    args = parser.parse_args()
+    results = run(args.iterations, args.tokens_per_second)
+    print(json.dumps(results, indent=2))
+    if not all(r["rebuilt"] for r in results.values()):
+        sys.exit(1)
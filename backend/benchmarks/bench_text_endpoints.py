@@ -0,0 +1,58 @@
+"""
+Latency of the text-only generation endpoints against a stubbed LLM.
+
+Compares the shared, lazily-initialised EmailGenerator with the previous
+behaviour of building a fresh generator (and its collaborators) per request.
+Chrome is excluded from the per-request mode so the benchmark runs anywhere.
+
+    cd backend && python -m benchmarks.bench_text_endpoints --iterations 200
+"""
+import argparse
+import json
+import os
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_email_generator
+from app.core.email_generator import EmailGenerator
+from app.main import create_app
+from benchmarks import common
+
+ENDPOINTS = {
+    "/api/v2/generate-email": common.email_llm,
+    "/api/v1/generate-referral": common.referral_llm,
+}
+
+
+def per_request_generator(llm_factory):
+    def factory() -> EmailGenerator:
+        generator = EmailGenerator(llm=llm_factory())
+        # Mirror the old eager constructor (minus the headless Chrome launch).
+        generator.jd2json, generator.linkedin, generator.resume_parser
+        return generator
+    return factory
+
+
+def run(iterations: int) -> dict:
+    form = {"resume_text": common.SAMPLE_RESUME_TEXT, "job_description": common.SAMPLE_JD_TEXT}
+    results = {}
+    app = create_app()
+    with TestClient(app) as client:
+        for path, llm_factory in ENDPOINTS.items():
+            shared = EmailGenerator(llm=llm_factory())
+            modes = {"shared": lambda: shared, "per_request": per_request_generator(llm_factory)}
+            for mode, factory in modes.items():
+                app.dependency_overrides[get_email_generator] = factory
+                samples = common.time_calls(lambda: client.post(path, data=form), iterations)
+                results[f"{path} [{mode}]"] = common.summarize(samples)
+            app.dependency_overrides.clear()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
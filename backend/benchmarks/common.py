@@ -0,0 +1,182 @@
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.language_models import SimpleChatModel
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+SAMPLE_REVIEW = {
+    "overall_summary": "Solid backend profile with relevant Python and FastAPI experience.",
+    "strengths": ["Python", "FastAPI", "Shipped production services"],
+    "areas_for_improvement": ["Quantify impact of recent projects"],
+    "keyword_analysis": {
+        "matched_keywords": ["Python", "FastAPI", "PostgreSQL"],
+        "missing_keywords": ["Kubernetes"],
+        "keyword_suggestions": {"Kubernetes": "Mention any container orchestration work."},
+        "match_percentage": 75.0,
+    },
+    "ats_score": 78,
+    "recommendations": ["Tailor the summary to the role."],
+}
+
+SAMPLE_EMAIL = {
+    "subject": "Application for Senior Python Developer",
+    "greeting": "Dear Hiring Manager,",
+    "body": "I am excited to apply for the Senior Python Developer role.\nI have built FastAPI services in production.",
+    "closing": "Best regards,",
+    "signature": "Jane Doe",
+}
+
+SAMPLE_LINKEDIN_MESSAGE = {
+    "greeting": "Hi Alex,",
+    "body": "I came across the Senior Python Developer role at InnovateTech and wanted to ask if you'd be open to referring me.",
+    "closing": "Thank you,",
+    "signature": "Jane Doe",
+}
+
+SAMPLE_RESUME_TEXT = (
+    "Jane Doe | jane@example.com\n"
+    "Summary: Backend engineer with 5 years of Python experience.\n"
+    "Experience: Built FastAPI services, PostgreSQL schemas and CI pipelines.\n"
+)
+
+SAMPLE_JD_TEXT = (
+    "Job Title: Senior Python Developer\nCompany: InnovateTech\nLocation: Remote\n"
+    "Responsibilities: Design and implement backend services.\n"
+    "Key Qualifications: Python, Django/FastAPI, PostgreSQL."
+)
+
+SAMPLE_JD_JSON = {
+    "title": "Senior Python Developer",
+    "level": "Senior",
+    "location": "Remote",
+    "description": "InnovateTech builds backend services.",
+    "key_qualifications": "Python, Django/FastAPI, PostgreSQL.",
+    "preferred_qualifications": "",
+    "responsibilities": "Design and implement backend services.",
+    "company": "InnovateTech",
+}
+
+
+class PromptScaledFakeChatModel(FakeListChatModel):
+    """
+    FakeListChatModel whose latency grows with the prompt: a fixed base plus
+    `seconds_per_1k_tokens` for every thousand (chars/4) prompt tokens, so
+    prompt-size savings show up as wall-clock time.
+    """
+    base_latency: float = 0.0
+    seconds_per_1k_tokens: float = 0.0
+
+    def _prompt_delay(self, messages: Any) -> float:
+        chars = sum(len(str(m.content)) for m in messages)
+        return self.base_latency + chars / 4 / 1000 * self.seconds_per_1k_tokens
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs) -> str:
+        time.sleep(self._prompt_delay(messages))
+        return super()._call(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+class RoutedFakeChatModel(SimpleChatModel):
+    """
+    Fake chat model that answers with the first response whose marker occurs
+    in the prompt, so concurrent calls for different chains (message and
+    review) get the right JSON regardless of order. Streams one character
+    per chunk, sleeping `sleep` seconds before each.
+    """
+    routes: List[Tuple[str, str]]
+    sleep: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed-fake-chat-model"
+
+    def _response(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        return next(response for marker, response in self.routes if marker in prompt)
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs) -> str:
+        response = self._response(messages)
+        if self.sleep is not None:
+            time.sleep(self.sleep * len(response))
+        return response
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        for c in self._response(messages):
+            if self.sleep is not None:
+                time.sleep(self.sleep)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=c))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        response = self._response(messages)
+        if self.sleep is not None:
+            await asyncio.sleep(self.sleep * len(response))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        for c in self._response(messages):
+            if self.sleep is not None:
+                await asyncio.sleep(self.sleep)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=c))
+
+
+def review_response() -> str:
+    return json.dumps(SAMPLE_REVIEW)
+
+
+def email_response() -> str:
+    return json.dumps({"email": SAMPLE_EMAIL})
+
+
+def referral_response() -> str:
+    return json.dumps({"referral_message": SAMPLE_LINKEDIN_MESSAGE})
+
+
+# Prompts for the review and JD conversion calls, told apart by their system messages.
+_SHARED_ROUTES = [
+    ("resume reviewer", json.dumps(SAMPLE_REVIEW)),
+    ("job description parser", json.dumps(SAMPLE_JD_JSON)),
+]
+
+
+def email_llm(sleep: float | None = None) -> RoutedFakeChatModel:
+    """Fake LLM answering the email, resume review and JD conversion calls."""
+    return RoutedFakeChatModel(routes=[*_SHARED_ROUTES, ("", email_response())], sleep=sleep)
+
+
+def referral_llm(sleep: float | None = None) -> RoutedFakeChatModel:
+    """Fake LLM answering the referral, resume review and JD conversion calls."""
+    return RoutedFakeChatModel(routes=[*_SHARED_ROUTES, ("", referral_response())], sleep=sleep)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def time_calls(fn: Callable[[], object], iterations: int, warmup: int = 3) -> List[float]:
+    """Runs fn repeatedly and returns the per-call durations in seconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
@@ -0,0 +1,325 @@
+"""
+Fixture job pages and resumes for the benchmarks.
+
+Saved pages live in benchmarks/fixtures/pages/*.html. On top of those,
+synthetic_job_page() builds pages of a chosen size that look like real job
+boards: navigation, scripts, a job description and long related-job lists.
+resume_pdf() builds text PDFs with any number of pages. serve_directory()
+and serve_brightdata() run local HTTP servers for the pages and for a mock
+of the Bright Data Dataset API.
+"""
+import contextlib
+import functools
+import glob
+import http.server
+import json
+import os
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Iterator, Tuple
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "pages")
+
+# Where each saved page was fetched from; the host picks the site rules.
+PAGE_URLS = {
+    "linkedin_guest_job.html": "https://www.linkedin.com/jobs/view/4278200847",
+    "greenhouse_job.html": "https://boards.greenhouse.io/example/jobs/123",
+    "greenhouse_escaped_job.html": "https://boards.greenhouse.io/example/jobs/456",
+    "lever_job.html": "https://jobs.lever.co/example/abc",
+    "workday_job.html": "https://contoso.wd5.myworkdayjobs.com/en-US/careers/job/Bengaluru/Staff-Software-Engineer_R-104233",
+}
+
+_WORDS = (
+    "python backend services api design scalable systems team collaborate deploy cloud "
+    "experience engineering data product customers build maintain review testing quality"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def synthetic_job_page(size_bytes: int, seed: int = 0, nesting: int = 6) -> str:
+    """A job page of roughly size_bytes with realistic boilerplate around the posting."""
+    rng = random.Random(seed)
+    head = (
+        "<!DOCTYPE html><html><head><title>Senior Python Developer</title>"
+        "<style>body{font-family:sans-serif}.job{margin:0}</style>"
+        "<script>window.__STATE__ = {\"jobId\": 42, \"flags\": [1, 2, 3]};</script></head><body>"
+        "<header><a href='/'>Jobs</a><nav><ul><li>Home</li><li>Jobs</li><li>Sign in</li></ul></nav></header>"
+    )
+    posting = [
+        "<main><section class='job'><h1>Senior Python Developer</h1>",
+        "<div class='company'>InnovateTech &middot; Remote</div>",
+        "<h2>Responsibilities</h2><ul>",
+        *(f"<li>{_sentence(rng)}</li>" for _ in range(8)),
+        "</ul><h2>Qualifications</h2><ul>",
+        *(f"<li>{_sentence(rng)}</li>" for _ in range(8)),
+        "</ul></section>",
+    ]
+    tail = "</main><footer><p>&copy; Jobs Inc</p><nav>About Privacy Terms</nav></footer></body></html>"
+
+    parts = [head, *posting, "<section class='similar-jobs'><h2>Similar jobs</h2><ul>"]
+    size = sum(len(p) for p in parts) + len(tail)
+    i = 0
+    while size < size_bytes:
+        open_tags = "".join("<div><span>" for _ in range(rng.randint(1, nesting)))
+        close_tags = "".join("</span></div>" for _ in range(open_tags.count("<div>")))
+        item = (
+            f"<li>{open_tags}<a href='/jobs/{i}'>Software Engineer {i}</a> "
+            f"Company {i % 50} Bengaluru, Karnataka, India {i % 7 + 1} days ago{close_tags}</li>"
+        )
+        if i % 25 == 0:
+            item += "<script>track('impression', %d);</script>" % i
+        parts.append(item)
+        size += len(item)
+        i += 1
+    parts.append("</ul></section>")
+    parts.append(tail)
+    return "".join(parts)
+
+
+def deeply_nested_page(depth: int = 5000) -> str:
+    """A page nested deeper than Python's default recursion limit."""
+    return "<html><body>" + "<div>" * depth + "deep text" + "</div>" * depth + "</body></html>"
+
+
+def saved_pages() -> Dict[str, str]:
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(PAGES_DIR, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def corpus(sizes=(20_000, 200_000, 2_000_000)) -> Dict[str, str]:
+    """Saved pages plus synthetic pages of the given sizes."""
+    pages = saved_pages()
+    for size in sizes:
+        pages[f"synthetic_{size // 1000}kb.html"] = synthetic_job_page(size, seed=size)
+    return pages
+
+
+def resume_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """A text-only PDF resume with the given number of pages (Helvetica, uncompressed)."""
+    rng = random.Random(seed)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(pages):
+        lines = [f"Experience {page + 1}.{i + 1}: {_sentence(rng, 10)}" for i in range(lines_per_page)]
+        text = "".join(f"({line}) Tj T* " for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 760 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = [b"%PDF-1.4\n"]
+    offsets = []
+    position = len(out[0])
+    for number, body in enumerate(objects, start=1):
+        chunk = b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        offsets.append(position)
+        out.append(chunk)
+        position += len(chunk)
+    xref = [b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)]
+    xref += [b"%010d 00000 n \n" % offset for offset in offsets]
+    out += xref
+    out.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, position))
+    return b"".join(out)
+
+
+class _FixtureHandler(http.server.SimpleHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests.
+    protocol_version = "HTTP/1.1"
+    slow_prefix = "/slow/"
+    slow_seconds = 0.0
+    flaky_prefix = "/flaky/"
+    connect_seconds = 0.0
+    failed_once: set = set()
+
+    def setup(self) -> None:
+        # Runs once per TCP connection: stands in for the TCP + TLS handshake
+        # round trips of a remote job board.
+        time.sleep(self.connect_seconds)
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle plus
+        # delayed ACKs add ~40 ms to every request on a kept-alive connection.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self) -> None:
+        if self.path.startswith(self.slow_prefix):
+            # Stands in for heavy images, fonts and trackers on real job boards.
+            time.sleep(self.slow_seconds)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith(self.flaky_prefix):
+            # The first request for each path is throttled, the retry is served.
+            if self.path not in self.failed_once:
+                self.failed_once.add(self.path)
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.path = "/" + self.path[len(self.flaky_prefix):]
+        super().do_GET()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _FixtureServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients that stop reading early (e.g. a size cap) reset the connection.
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+@contextlib.contextmanager
+def serve_directory(directory: str = PAGES_DIR, slow_seconds: float = 0.0, connect_seconds: float = 0.0) -> Iterator[str]:
+    """
+    Serves a directory over HTTP/1.1 on a free local port and yields the base
+    URL. Any path under /slow/ answers with an empty body after
+    `slow_seconds`; /flaky/<file> answers 503 the first time, then serves
+    <file>. Every new connection is delayed by `connect_seconds`.
+    """
+    handler = type("Handler", (_FixtureHandler,), {
+        "slow_seconds": slow_seconds, "connect_seconds": connect_seconds, "failed_once": set(),
+    })
+    server = _FixtureServer(("127.0.0.1", 0), functools.partial(handler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def linkedin_profile(name: str, seed: int = 0) -> Dict:
+    """A record shaped like Bright Data's linkedin_person_profile dataset."""
+    rng = random.Random(f"{name}-{seed}")
+    companies = ["InnovateTech", "Acme Robotics", "Northwind", "Globex", "Initech"]
+    rng.shuffle(companies)
+    return {
+        "name": name,
+        "position": f"Technical Recruiter at {companies[0]}",
+        "location": "Bengaluru, Karnataka, India",
+        "about": _sentence(rng, 30),
+        "experience": [{"company_name": c, "position": "Recruiter"} for c in companies[:3]],
+        "education": [{"title": "State University", "degree": "B.A."}],
+        "posts": [{"title": _sentence(rng, 8)} for _ in range(3)],
+    }
+
+
+class BrightDataMock:
+    """Request counters and the profiles served by serve_brightdata()."""
+    def __init__(self, profiles: Dict[str, Dict], latency: float, snapshot_over: int | None) -> None:
+        self.profiles = {self.member(url): record for url, record in profiles.items()}
+        self.latency = latency
+        self.snapshot_over = snapshot_over
+        self.snapshots: Dict[str, list] = {}
+        self.counters = {"scrape_requests": 0, "profiles_requested": 0, "snapshot_polls": 0}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def member(url: str) -> str:
+        """Like the real API, any form of a profile URL finds the member."""
+        match = re.search(r"/in/([^/?#]+)", url or "")
+        return match.group(1).lower() if match else (url or "")
+
+    def records(self, urls) -> list:
+        records = []
+        for url in urls:
+            profile = self.profiles.get(self.member(url))
+            if profile is None:
+                records.append({"error": "Profile not found", "error_code": "dead_page", "input": {"url": url}})
+            else:
+                records.append({**profile, "url": url, "input": {"url": url}})
+        return records
+
+
+class _BrightDataHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    mock: BrightDataMock
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        if not self.path.startswith("/datasets/v3/scrape"):
+            return self._send_json(404, {"error": "not found"})
+        inputs = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"[]")
+        urls = [i.get("url") for i in inputs]
+        mock = self.mock
+        with mock.lock:
+            mock.counters["scrape_requests"] += 1
+            mock.counters["profiles_requested"] += len(urls)
+        time.sleep(mock.latency)
+        records = mock.records(urls)
+        if mock.snapshot_over is not None and len(urls) > mock.snapshot_over:
+            snapshot_id = f"s_{len(mock.snapshots) + 1}"
+            mock.snapshots[snapshot_id] = records
+            return self._send_json(202, {"snapshot_id": snapshot_id})
+        self._send_json(200, records if len(records) != 1 else records[0])
+
+    def do_GET(self) -> None:
+        mock = self.mock
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if len(parts) == 4 and parts[2] == "progress" and parts[3] in mock.snapshots:
+            with mock.lock:
+                mock.counters["snapshot_polls"] += 1
+            return self._send_json(200, {"status": "ready", "snapshot_id": parts[3]})
+        if len(parts) == 4 and parts[2] == "snapshot" and parts[3] in mock.snapshots:
+            return self._send_json(200, mock.snapshots[parts[3]])
+        self._send_json(404, {"error": "not found"})
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@contextlib.contextmanager
+def serve_brightdata(
+    profiles: Dict[str, Dict], latency: float = 0.0, snapshot_over: int | None = None
+) -> Iterator[Tuple[str, BrightDataMock]]:
+    """
+    A local stand-in for the Bright Data Dataset API (scrape, progress and
+    snapshot endpoints) serving the given profiles by URL; unknown URLs get
+    error records. Each scrape request takes `latency` seconds, and batches
+    larger than `snapshot_over` are answered with a snapshot to poll.
+    Yields (base_url, mock).
+    """
+    mock = BrightDataMock(profiles, latency, snapshot_over)
+    handler = type("Handler", (_BrightDataHandler,), {"mock": mock})
+    server = _FixtureServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", mock
+    finally:
+        server.shutdown()
+        server.server_close()
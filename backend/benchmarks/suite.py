@@ -0,0 +1,281 @@
+"""
+End-to-end benchmark suite for the generation pipeline.
+
+Drives every stage on its own (HTML extraction, PDF parsing, JD conversion,
+email and referral crafting, LaTeX rendering and compiling) and every HTTP
+endpoint of create_app() through a TestClient, using the fixture pages and
+PDFs and the local fake LLM (LLM_PROVIDER=fake). Caches are disabled so
+each call does the full work.
+
+For each case it reports throughput, mean/p50/p95/p99 latency and the peak
+Python heap allocated by one call (tracemalloc), and writes everything, with
+the commit and machine it ran on, to a JSON file. --compare prints the
+change against an earlier result file and flags p95 regressions.
+
+    cd backend && python -m benchmarks.suite --iterations 20
+    cd backend && python -m benchmarks.suite --only endpoint. --compare benchmarks/results/<earlier>.json
+"""
+import argparse
+import contextlib
+import datetime
+import functools
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+_TMP = tempfile.mkdtemp(prefix="bench-suite-")
+for _name, _value in {
+    "GOOGLE_API_KEY": "benchmark-placeholder",
+    "LLM_PROVIDER": "fake",
+    "JD_CACHE_ENABLED": "false",
+    "REVIEW_CACHE_ENABLED": "false",
+    "RESUME_CACHE_ENABLED": "false",
+    "SCRAPE_CACHE_ENABLED": "false",
+    "JOB_WORKERS": "0",
+    "JOB_QUEUE_DB": os.path.join(_TMP, "jobs.sqlite3"),
+    "JOB_SPOOL_DIR": os.path.join(_TMP, "job_inputs"),
+    "CPU_POOL_WORKERS": "0",
+    "LATEX_CACHE_ENABLED": "false",
+    "LATEX_OUTPUT_DIR": os.path.join(_TMP, "resumes"),
+    "LATEX_FORMAT_DIR": os.path.join(_TMP, "latex_formats"),
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_email_generator, get_resume_generator
+from app.core.email_generator import EmailGenerator
+from app.core.fake_llm import SchemaFakeChatModel
+from app.core.models.resume import Resume
+from app.core.resume_generator import ResumeGenerator, fill_template
+from app.main import create_app
+from app.tools.html_text import extract_text
+from app.tools.jd_to_json import JD2JSON
+from app.tools.resume_parser import extract_pdf_text
+from benchmarks import common, fixtures
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "app", "core", "resume_template.tex")
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int) -> Dict[str, float]:
+    samples = common.time_calls(fn, iterations, warmup=warmup)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        **common.summarize(samples),
+        "throughput_per_s": len(samples) / sum(samples),
+        "peak_alloc_kb": peak / 1024,
+    }
+
+
+def sample_resume() -> Resume:
+    llm = SchemaFakeChatModel()
+    resume_generator = ResumeGenerator(TEMPLATE_PATH, llm=llm)
+    return resume_generator.get_data(common.SAMPLE_RESUME_TEXT, common.SAMPLE_REVIEW)
+
+
+@contextlib.contextmanager
+def _in_directory(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def stage_cases(llm: SchemaFakeChatModel) -> Tuple[List[Case], Dict[str, str]]:
+    cases: List[Case] = []
+    skipped = {}
+    for name, html in fixtures.corpus(sizes=(20_000, 200_000, 2_000_000)).items():
+        cases.append((f"stage.html_extract[{name}]", functools.partial(extract_text, html)))
+    for pages in (1, 5):
+        pdf = fixtures.resume_pdf(pages)
+        cases.append((f"stage.pdf_parse[{pages}p]", functools.partial(extract_pdf_text, pdf)))
+
+    jd2json = JD2JSON(llm=llm)
+    page_text = extract_text(fixtures.saved_pages()["greenhouse_job.html"]) or ""
+    cases.append(("stage.jd_convert", lambda: jd2json.convert(page_text, source_url="https://boards.greenhouse.io/x/jobs/1")))
+
+    generator = EmailGenerator(llm=llm)
+    cases.append(("stage.email_craft", lambda: generator.craft_email(common.SAMPLE_RESUME_TEXT, common.SAMPLE_JD_TEXT)))
+    cases.append(("stage.referral_craft", lambda: generator.craft_referral(common.SAMPLE_RESUME_TEXT, common.SAMPLE_JD_TEXT)))
+
+    resume = sample_resume()
+    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        template = f.read()
+    cases.append(("stage.latex_render", functools.partial(fill_template, template, resume)))
+    if shutil.which("pdflatex"):
+        resume_generator = ResumeGenerator(TEMPLATE_PATH, llm=llm)
+        out_dir = tempfile.mkdtemp(dir=_TMP)
+
+        def compile_resume():
+            with _in_directory(out_dir):
+                return resume_generator.generate_resume(resume)
+        cases.append(("stage.latex_compile", compile_resume))
+    else:
+        skipped["stage.latex_compile"] = "pdflatex is not installed"
+    return cases, skipped
+
+
+def _expect_ok(response) -> None:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.url} returned {response.status_code}: {response.text[:200]}")
+
+
+def endpoint_cases(client: TestClient, base_url: str) -> Tuple[List[Case], Dict[str, str]]:
+    pdf = fixtures.resume_pdf(2)
+    upload = lambda: {"file": ("resume.pdf", pdf, "application/pdf")}
+    form = {"resume_text": common.SAMPLE_RESUME_TEXT, "job_description": common.SAMPLE_JD_TEXT}
+    batch = {
+        "resume_text": common.SAMPLE_RESUME_TEXT,
+        "items": [{"jd_text": f"{common.SAMPLE_JD_TEXT}\nRequisition {i}"} for i in range(5)],
+    }
+    requests = {
+        "GET /api/health": lambda: client.get("/api/health"),
+        "GET /api/health/cache": lambda: client.get("/api/health/cache"),
+        "POST /api/v1/resume": lambda: client.post("/api/v1/resume", files=upload()),
+        "POST /api/v1/jd-from-text": lambda: client.post("/api/v1/jd-from-text", json={"jd_text": common.SAMPLE_JD_TEXT}),
+        "POST /api/v1/jd-from-url": lambda: client.post("/api/v1/jd-from-url", json={"url": f"{base_url}/greenhouse_job.html"}),
+        "POST /api/v1/generate-email": lambda: client.post(
+            "/api/v1/generate-email", files=upload(), data={"jd_text": common.SAMPLE_JD_TEXT}
+        ),
+        "POST /api/v2/generate-email": lambda: client.post("/api/v2/generate-email", data=form),
+        "POST /api/v2/generate-email/stream": lambda: client.post("/api/v2/generate-email/stream", data=form),
+        "POST /api/v1/generate-referral": lambda: client.post("/api/v1/generate-referral", data=form),
+        "POST /api/v1/generate-referral/stream": lambda: client.post("/api/v1/generate-referral/stream", data=form),
+        "POST /api/v2/generate-batch[5]": lambda: client.post("/api/v2/generate-batch", json=batch),
+        "POST /api/v1/jobs/generate-email": lambda: client.post(
+            "/api/v1/jobs/generate-email", files=upload(), data={"jd_text": common.SAMPLE_JD_TEXT}
+        ),
+    }
+
+    def checked(send):
+        def call():
+            _expect_ok(send())
+        return call
+
+    skipped = {"endpoint.POST /api/v1/linkedin": "needs the BrightData API"}
+    if shutil.which("pdflatex"):
+        # The fake model returns the same resume every time, so after the first call this is a compile-cache hit.
+        resume_form = {"resume_text": common.SAMPLE_RESUME_TEXT, "review": json.dumps(common.SAMPLE_REVIEW)}
+        requests["POST /api/v1/generate-resume"] = lambda: client.post("/api/v1/generate-resume", data=resume_form)
+    else:
+        skipped["endpoint.POST /api/v1/generate-resume"] = "pdflatex is not installed"
+
+    cases = [(f"endpoint.{name}", checked(send)) for name, send in requests.items()]
+    return cases, skipped
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True)
+        return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(iterations: int, warmup: int, only: str | None, llm_latency: float, tokens_per_second: float) -> dict:
+    llm = SchemaFakeChatModel(latency=llm_latency, tokens_per_second=tokens_per_second)
+    results, skipped = {}, {}
+
+    def run_cases(cases: List[Case]) -> None:
+        for name, fn in cases:
+            if only and not name.startswith(only):
+                continue
+            print(f"  {name}", file=sys.stderr)
+            results[name] = measure(fn, iterations, warmup)
+
+    cases, skip = stage_cases(llm)
+    skipped.update(skip)
+    run_cases(cases)
+
+    endpoint_generator = EmailGenerator(llm=llm)
+    app = create_app()
+    app.dependency_overrides[get_email_generator] = lambda: endpoint_generator
+    resume_generator = ResumeGenerator(TEMPLATE_PATH, llm=llm)
+    app.dependency_overrides[get_resume_generator] = lambda: resume_generator
+    with TestClient(app) as client, fixtures.serve_directory() as base_url:
+        cases, skip = endpoint_cases(client, base_url)
+        skipped.update(skip)
+        run_cases(cases)
+    endpoint_generator.close()
+    resume_generator.close()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "iterations": iterations,
+            "llm": {"provider": "fake", "latency": llm_latency, "tokens_per_second": tokens_per_second},
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        },
+        "skipped": skipped,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> dict:
+    """Relative change per case; a p95 more than `threshold` slower counts as a regression."""
+    changes, regressions = {}, []
+    for name, now in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        delta = {
+            key: (now[key] - before[key]) / before[key]
+            for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_per_s", "peak_alloc_kb")
+            if before.get(key)
+        }
+        changes[name] = {key: f"{value:+.1%}" for key, value in delta.items()}
+        if delta.get("p95_ms", 0) > threshold:
+            regressions.append(name)
+    return {"baseline": baseline.get("meta", {}).get("commit"), "changes": changes, "regressions": regressions}
+
+
+def default_output(meta: dict) -> str:
+    stamp = meta["timestamp"].replace(":", "").replace("-", "")
+    return os.path.join(RESULTS_DIR, f"{stamp}-{meta['commit'] or 'nogit'}.json")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", help="Run only cases whose name starts with this prefix, e.g. 'stage.' or 'endpoint.'")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the fake LLM waits before answering.")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Fake LLM output rate; 0 is instant.")
+    parser.add_argument("--output", help="Where to write the JSON results (default: benchmarks/results/).")
+    parser.add_argument("--compare", help="An earlier result file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="p95 slowdown that counts as a regression.")
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.warmup, args.only, args.llm_latency, args.tokens_per_second)
+    output = args.output or default_output(report["meta"])
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            comparison = compare(report, json.load(f), args.threshold)
+        print(json.dumps(comparison, indent=2))
+        sys.exit(1 if comparison["regressions"] else 0)
+    print(json.dumps({name: {k: round(v, 2) for k, v in r.items()} for name, r in report["results"].items()}, indent=2))